@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import tempfile
+import yaml
+from code.model.log import Log
+from code.model.configuration import Configuration
+from code.benchmark.generator import StatementGenerator
+from code.benchmark.suite import BenchmarkSuite
+from code.benchmark.startup import STARTUP_BUDGET_SECONDS, run_startup_benchmark
+
+def write_configuration(path:str)->None:
+    configuration = {
+        "institutes": {
+            "paypal": {
+                "owner": {
+                    "id": "max@example.com",
+                    "name": "Max Mustermann",
+                }
+            }
+        }
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(configuration, f)
+
+def print_summary(results:dict)->None:
+    print(f"{'Stage':<10} {'Wall (s)':>10} {'CPU (s)':>10} {'Items':>8}")
+    for stage in results["stages"]:
+        print(f"{stage['stage']:<10} {stage['wall_seconds']:>10.3f} {stage['cpu_seconds']:>10.3f} {stage['items']:>8}")
+    print(f"{'total':<10} {results['total_wall_seconds']:>10.3f}")
+
+def print_startup_summary(results:dict)->None:
+    print(f"Startup median {results['median_seconds'] * 1000:.0f} ms (budget {results['budget_seconds'] * 1000:.0f} ms)")
+    if results["heavy_modules"]:
+        print(f"Heavy modules loaded: {', '.join(results['heavy_modules'])}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic bank statements and time every stage of the pipeline on them."
+    )
+    parser.add_argument("--work-dir", type=str, help="Directory for the generated statements and exports (default: temporary directory).")
+    parser.add_argument("--statements", type=int, default=3, help="Number of statements per institute.")
+    parser.add_argument("--transactions", type=int, default=100, help="Number of transactions per statement.")
+    parser.add_argument("--institutes", nargs="+", choices=StatementGenerator.INSTITUTES, default=StatementGenerator.INSTITUTES,
+                        help="Institutes to generate statements for.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the statement generator.")
+    parser.add_argument("--export-types", nargs="+", choices=["csv", "html", "json", "yaml", "qif"], default=["csv", "json"],
+                        help="Export formats used in the export stage.")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of benchmark runs on the generated statements.")
+    parser.add_argument("-o", "--output", type=str, help="Write the machine readable results to this JSON file.")
+    parser.add_argument("--startup", action="store_true", default=False,
+                        help="Time the cold start of main.py on a CSV only input instead of the pipeline stages.")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_SECONDS * 1000,
+                        help="Fail if the median cold start takes longer than this.")
+    parser.add_argument("-q", "--quiet", action="store_true", default=False, help="Only print the summary.")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="momo-benchmark-")
+    statements_dir = os.path.join(work_dir, "statements")
+    configuration_file = os.path.join(work_dir, "configuration.yml")
+    os.makedirs(work_dir, exist_ok=True)
+    write_configuration(configuration_file)
+
+    if args.startup:
+        results = run_startup_benchmark(work_dir, configuration_file, repeat=max(args.repeat, 5))
+        results["budget_seconds"] = args.startup_budget_ms / 1000
+        print_startup_summary(results)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        if results["median_seconds"] > results["budget_seconds"] or results["heavy_modules"]:
+            sys.exit(1)
+        return
+
+    generated = StatementGenerator(seed=args.seed).generate(statements_dir, args.statements, args.transactions, args.institutes)
+
+    configuration = Configuration(
+        configuration_file=configuration_file,
+        input_paths=[statements_dir],
+        output_base=os.path.join(work_dir, "output", "transactions"),
+        export_types=args.export_types,
+        create_dirs=True,
+        quiet=args.quiet,
+        debug=False,
+        validate=False,
+        print_cmd=False,
+        recursive=True
+        )
+    log = Log(configuration)
+
+    runs = []
+    for _ in range(args.repeat):
+        runs.append(BenchmarkSuite(log, configuration).run())
+
+    report = {
+        "work_dir": work_dir,
+        "statements": len(generated),
+        "generated_transactions": sum(count for _, _, count in generated),
+        "runs": runs,
+    }
+    for results in runs:
+        print_summary(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if log.error_count > 0:
+        sys.exit(log.error_count)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import csv
+import os
+import random
+from datetime import date, timedelta
+from .pdf_writer import SimplePDFWriter
+
+class StatementGenerator:
+    """
+    Generates synthetic bank statements in the layouts the extractors expect.
+
+    PDFs are written for ING, Barclays and Consorsbank, CSV exports for DKB and PayPal.
+    The generator is seeded, so the same arguments always produce the same files.
+    The (date, cents) bookings of the last written statement are kept in `bookings`.
+    """
+    INSTITUTES = ["ing", "barclays", "consorsbank", "dkb", "paypal"]
+
+    PARTNERS = [
+        "Stadtwerke Musterstadt", "REWE Markt GmbH", "Deutsche Bahn", "Amazon EU S.a.r.l.",
+        "Telekom Deutschland", "Allianz Versicherung", "Finanzamt Berlin", "Edeka Zentrale",
+        "Vodafone GmbH", "Spotify AB", "Netflix International", "Apotheke am Markt",
+        "Baeckerei Schmidt", "Mueller Drogerie", "Max Mustermann", "Erika Musterfrau",
+        "Hausverwaltung Nord", "IKEA Deutschland", "Lidl Vertriebs GmbH", "Shell Station",
+    ]
+    PURPOSES = [
+        "Abschlag Strom", "Miete", "Einkauf", "Monatsbeitrag", "Fahrkarte", "Erstattung",
+        "Gehalt", "Rechnung", "Beitrag", "Kartenzahlung", "Gutschrift", "Abo",
+    ]
+    MONTHS = [
+        "Januar", "Februar", "März", "April", "Mai", "Juni",
+        "Juli", "August", "September", "Oktober", "November", "Dezember",
+    ]
+    LINES_PER_PAGE = 58
+
+    def __init__(self, seed: int = 0, year: int = 2023):
+        self.random = random.Random(seed)
+        self.year = year
+        self.counter = 0
+        self.bookings = []
+
+    # -----------------------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------------------
+    def _nextId(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def _iban(self, bank_code: str) -> str:
+        return "DE" + f"{self.random.randint(10, 99)}" + bank_code + f"{self.random.randint(0, 10**10 - 1):010d}"
+
+    def _groupedIban(self, iban: str) -> str:
+        return " ".join(iban[i:i + 4] for i in range(0, len(iban), 4))
+
+    def _amountCents(self) -> int:
+        cents = self.random.randint(100, 250000)
+        return cents if self.random.random() < 0.3 else -cents
+
+    def _germanAmount(self, cents: int, sign_suffix: bool = False, thousands: bool = True) -> str:
+        euros, rest = divmod(abs(cents), 100)
+        euro_str = f"{euros:,}".replace(",", ".") if thousands else str(euros)
+        amount = f"{euro_str},{rest:02d}"
+        if sign_suffix:
+            return amount + ("-" if cents < 0 else "+")
+        return ("-" if cents < 0 else "") + amount
+
+    def _firstOfNextMonth(self, year: int, month: int) -> date:
+        return date(year + (month == 12), month % 12 + 1, 1)
+
+    def _dates(self, year: int, month: int, count: int) -> list:
+        first = date(year, month, 1)
+        days = (self._firstOfNextMonth(year, month) - first).days - 1
+        return sorted(first + timedelta(days=self.random.randint(0, days)) for _ in range(count))
+
+    def _paginate(self, writer: SimplePDFWriter, lines: list, header: list, size: float = 9.0) -> None:
+        """Writes lines top to bottom, starting a new page when the current one is full."""
+        line_height = size + 3
+        top = 40.0
+        writer.addPage()
+        for text in header:
+            writer.addText(50, top, text, size)
+            top += line_height
+        for text in lines:
+            if top > 40.0 + self.LINES_PER_PAGE * line_height:
+                writer.addPage()
+                top = 40.0
+            writer.addText(50, top, text, size)
+            top += line_height
+
+    # -----------------------------------------------------------------
+    # Statements
+    # -----------------------------------------------------------------
+    def writeIngPdf(self, path: str, transactions: int, year: int, month: int) -> int:
+        iban = self._iban("50010517")
+        opening = self.random.randint(0, 500000)
+        lines = []
+        total = 0
+        self.bookings = []
+        for booking_date in self._dates(year, month, transactions):
+            cents = self._amountCents()
+            total += cents
+            self.bookings.append((booking_date, cents))
+            partner = self.random.choice(self.PARTNERS)
+            purpose = f"{self.random.choice(self.PURPOSES)} {self._nextId()}"
+            date_str = booking_date.strftime("%d.%m.%Y")
+            if cents < 0 and self.random.random() < 0.3:
+                lines.append(f"{date_str} Lastschrift VISA {partner} {self._germanAmount(cents)}")
+                lines.append(f"{date_str} NR{self.random.randint(10**7, 10**8 - 1)}GooglePay {purpose}")
+            else:
+                booking_type = "Lastschrift" if cents < 0 else "Gutschrift"
+                lines.append(f"{date_str} {booking_type} {partner} {self._germanAmount(cents)}")
+                lines.append(f"{date_str} {purpose}")
+                if cents < 0 and self.random.random() < 0.5:
+                    lines.append(f"Mandat: M{self.random.randint(10**6, 10**7 - 1)}")
+                    lines.append(f"Referenz: R{self.random.randint(10**8, 10**9 - 1)}")
+        header = [
+            "ING-DiBa AG",
+            f"Girokonto Nummer {iban[-10:]}",
+            f"Kontoauszug {self.MONTHS[month - 1]} {year}",
+            f"Datum {self._firstOfNextMonth(year, month).strftime('%d.%m.%Y')}",
+            f"IBAN {self._groupedIban(iban)}",
+            "BIC INGDDEFFXXX",
+            f"Alter Saldo {self._germanAmount(opening)} Euro",
+            f"Neuer Saldo {self._germanAmount(opening + total)} Euro",
+            "Buchung Buchung / Verwendungszweck Betrag (EUR)",
+            "Valuta",
+        ]
+        writer = SimplePDFWriter()
+        self._paginate(writer, lines, header)
+        writer.write(path)
+        return transactions
+
+    def writeBarclaysPdf(self, path: str, transactions: int, year: int, month: int) -> int:
+        iban = self._iban("50010517")
+        opening = self.random.randint(0, 500000)
+        lines = []
+        total = 0
+        dates = self._dates(year, month, transactions)
+        self.bookings = []
+        for booking_date in dates:
+            cents = self._amountCents()
+            total += cents
+            self.bookings.append((booking_date, cents))
+            valuta_date = booking_date + timedelta(days=self.random.randint(0, 3))
+            partner = self.random.choice(self.PARTNERS).upper()
+            card = f" {self.random.choice(['DE', 'PT', 'LU'])} Visa" if self.random.random() < 0.5 else ""
+            lines.append(
+                f"{booking_date.strftime('%d.%m.%Y')} {valuta_date.strftime('%d.%m.%Y')} "
+                f"{partner}{card} {self._germanAmount(cents, sign_suffix=True)}"
+            )
+            if cents < 0 and self.random.random() < 0.3:
+                lines.append(f"P{self.random.randint(10**6, 10**7 - 1)}")
+                lines.append(f"DE{self.random.randint(10, 99)}ZZZ{self.random.randint(10**10, 10**11 - 1)}")
+            if self.random.random() < 0.5:
+                lines.append(f"{self.random.choice(self.PURPOSES)} {self._nextId()}")
+        header = [
+            "Barclays Bank Ireland PLC",
+            "Kontoauszug",
+            f"IBAN: {self._groupedIban(iban)}",
+            "BIC: BARCDEHAXXX",
+            f"Abrechnungszeitraum {dates[0].replace(day=1).strftime('%d.%m.%Y')} - {dates[-1].strftime('%d.%m.%Y')}",
+            f"Alter Saldo {self._germanAmount(opening, sign_suffix=True)}",
+            f"Neuer Saldo {self._germanAmount(opening + total, sign_suffix=True)}",
+            "Buchungsdatum Valuta Beschreibung Betrag",
+        ]
+        writer = SimplePDFWriter()
+        self._paginate(writer, lines, header)
+        writer.write(path)
+        return transactions
+
+    def writeConsorsbankPdf(self, path: str, transactions: int, year: int, month: int) -> int:
+        """
+        Writes the words into the column boxes of ConsorbankDataFrame:
+        Text/Verwendungszweck, Datum, PNNr, Wert, Soll and Haben.
+        """
+        size = 8.0
+        line_height = 12.0
+        writer = SimplePDFWriter()
+        writer.addPage()
+        iban = self._iban("76030080")
+        dates = self._dates(year, month, transactions)
+        statement_date = dates[-1] + timedelta(days=1)
+        opening = self.random.randint(0, 500000)
+        top = 40.0
+
+        def row(text: str = "", datum: str = "", pnnr: str = "", wert: str = "", soll: str = "", haben: str = ""):
+            nonlocal top
+            if top > 780:
+                writer.addPage()
+                top = 40.0
+            for x, value in ((46.2, text), (233.1, datum), (272.75, pnnr), (311.55, wert), (433.45, soll), (521.6, haben)):
+                if value:
+                    writer.addText(x, top, value, size)
+            top += line_height
+
+        def balance_row(label_date: date, cents: int):
+            amount = self._germanAmount(cents, sign_suffix=True)
+            row(f"*** Kontostand zum {label_date.strftime('%d.%m.%Y')}",
+                soll=amount if cents < 0 else "", haben=amount if cents >= 0 else "")
+
+        row("Consorsbank")
+        row("Kontoinhaber MaxMustermann")
+        row(f"Datum {statement_date.strftime('%d.%m.%y')}")
+        row(f"IBAN {iban}")
+        row("Kontowährung EUR")
+        balance_row(dates[0] - timedelta(days=1), opening)
+
+        total = 0
+        self.bookings = []
+        for booking_date in dates:
+            cents = self._amountCents()
+            total += cents
+            self.bookings.append((booking_date, cents))
+            booking_type = "LASTSCHRIFT" if cents < 0 else "GUTSCHRIFT"
+            amount = self._germanAmount(cents, sign_suffix=True)
+            day = booking_date.strftime("%d.%m.")
+            row(booking_type, datum=day, pnnr=str(self.random.randint(100, 9999)), wert=day,
+                soll=amount if cents < 0 else "", haben=amount if cents >= 0 else "")
+            row(self.random.choice(self.PARTNERS)[:24])
+            row("Sparkasse Musterstadt")
+            row(f"{self.random.choice(self.PURPOSES)} {self._nextId()}")
+        balance_row(statement_date, opening + total)
+        writer.write(path)
+        return transactions
+
+    def writeDkbCsv(self, path: str, transactions: int, year: int, month: int) -> int:
+        iban = self._iban("12030000")
+        dates = self._dates(year, month, transactions)
+        self.bookings = []
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter=";", quoting=csv.QUOTE_ALL)
+            writer.writerow(["Girokonto", iban])
+            writer.writerow(["Zeitraum:", f"{dates[0].strftime('%d.%m.%Y')} - {dates[-1].strftime('%d.%m.%Y')}"])
+            writer.writerow(["Kontostand vom " + dates[-1].strftime("%d.%m.%Y") + ":", "1.234,56 €"])
+            writer.writerow([])
+            writer.writerow([
+                "Buchungsdatum", "Wertstellung", "Status", "Zahlungspflichtige*r", "Zahlungsempfänger*in",
+                "Verwendungszweck", "Umsatztyp", "IBAN", "Betrag (€)", "Gläubiger-ID", "Mandatsreferenz", "Kundenreferenz",
+            ])
+            for booking_date in dates:
+                cents = self._amountCents()
+                self.bookings.append((booking_date, cents))
+                partner = self.random.choice(self.PARTNERS)
+                date_str = booking_date.strftime("%d.%m.%y")
+                payer, payee = ("Max Mustermann", partner) if cents < 0 else (partner, "Max Mustermann")
+                writer.writerow([
+                    date_str, date_str, "Gebucht", payer, payee,
+                    f"{self.random.choice(self.PURPOSES)} {self._nextId()}",
+                    "Ausgang" if cents < 0 else "Eingang", self._iban("10010010"),
+                    self._germanAmount(cents), "", "", "",
+                ])
+        return transactions
+
+    def writePaypalCsv(self, path: str, transactions: int, year: int, month: int) -> int:
+        self.bookings = []
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f, delimiter=",", quoting=csv.QUOTE_ALL)
+            writer.writerow([
+                "Datum", "Uhrzeit", "Zeitzone", "Name", "Typ", "Status", "Währung", "Brutto", "Gebühr", "Netto",
+                "Absender E-Mail-Adresse", "Empfänger E-Mail-Adresse", "Transaktionscode",
+                "Zugehöriger Transaktionscode", "Beschreibung", "Rechnungsnummer", "Name der Bank",
+            ])
+            for booking_date in self._dates(year, month, transactions):
+                cents = self._amountCents()
+                self.bookings.append((booking_date, cents))
+                partner = self.random.choice(self.PARTNERS)
+                amount = self._germanAmount(cents, thousands=False)
+                writer.writerow([
+                    booking_date.strftime("%d.%m.%Y"),
+                    f"{self.random.randint(0, 23):02d}:{self.random.randint(0, 59):02d}:{self.random.randint(0, 59):02d}",
+                    "Europe/Berlin", partner, "Zahlung", "Abgeschlossen", "EUR", amount, "0,00", amount,
+                    f"{partner.split()[0].lower()}@example.com", "max@example.com",
+                    f"{self._nextId():017d}", "", self.random.choice(self.PURPOSES),
+                    f"INV-{self._nextId()}" if self.random.random() < 0.3 else "", "",
+                ])
+        return transactions
+
+    def generate(self, directory: str, statements: int, transactions: int, institutes: list = None) -> list:
+        """
+        Writes `statements` files with `transactions` bookings each for every institute.
+        Returns a list of (path, institute, transactions) tuples.
+        """
+        writers = {
+            "ing": (self.writeIngPdf, "pdf"),
+            "barclays": (self.writeBarclaysPdf, "pdf"),
+            "consorsbank": (self.writeConsorsbankPdf, "pdf"),
+            "dkb": (self.writeDkbCsv, "csv"),
+            "paypal": (self.writePaypalCsv, "csv"),
+        }
+        generated = []
+        for institute in institutes or self.INSTITUTES:
+            write, extension = writers[institute]
+            institute_directory = os.path.join(directory, institute)
+            os.makedirs(institute_directory, exist_ok=True)
+            for index in range(statements):
+                year, month = self.year + index // 12, index % 12 + 1
+                name = f"{year}-{month:02d}"
+                if extension == "pdf":
+                    path = os.path.join(institute_directory, f"Kontoauszug_{name}.{institute}.pdf")
+                else:
+                    path = os.path.join(institute_directory, f"Umsaetze_{name}.{institute}.csv")
+                generated.append((path, institute, write(path, transactions, year, month)))
+        return generated
@@ -0,0 +1,69 @@
+class SimplePDFWriter:
+    """
+    Minimal PDF writer without third party dependencies.
+
+    It only supports positioned single line text in the standard Helvetica font,
+    which is all the synthetic statements need. Coordinates are given like
+    pdfplumber reports them: x from the left and top from the upper page edge.
+    """
+    def __init__(self, width: float = 595.0, height: float = 842.0):
+        self.width = width
+        self.height = height
+        self.pages = []
+
+    def addPage(self) -> None:
+        self.pages.append([])
+
+    def addText(self, x: float, top: float, text: str, size: float = 9.0) -> None:
+        if not self.pages:
+            self.addPage()
+        self.pages[-1].append((x, top, text, size))
+
+    def _escape(self, text: str) -> bytes:
+        encoded = text.encode("cp1252", errors="replace")
+        return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    def _getContentStream(self, items: list) -> bytes:
+        commands = []
+        for x, top, text, size in items:
+            # PDF places the baseline; pdfplumber measures the top of the glyph box
+            y = self.height - top - size
+            commands.append(
+                b"BT /F1 %.2f Tf %.2f %.2f Td (" % (size, x, y) + self._escape(text) + b") Tj ET"
+            )
+        return b"\n".join(commands)
+
+    def write(self, path: str) -> None:
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            None,  # Pages object, filled in once the page ids are known
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        ]
+        page_ids = []
+        for items in self.pages or [[]]:
+            content = self._getContentStream(items)
+            objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+            content_id = len(objects)
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+                b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+                % (self.width, self.height, content_id)
+            )
+            page_ids.append(len(objects))
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+        objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref_offset = len(output)
+        output += b"xref\n0 %d\n" % (len(objects) + 1)
+        output += b"0000000000 65535 f \n"
+        for offset in offsets:
+            output += b"%010d 00000 n \n" % offset
+        output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+        with open(path, "wb") as f:
+            f.write(output)
@@ -0,0 +1,69 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Cold start budget of a CSV only run of main.py. bulk.py spawns one process
+# per input, so every millisecond here is paid many times.
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Modules which are only needed by single stages and must not be loaded
+# by runs which do not use these stages.
+HEAVY_MODULES = ["pdfminer", "pdfplumber", "pandas", "numpy", "jinja2", "pytz"]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MAIN_SCRIPT = os.path.join(ROOT_DIR, "main.py")
+
+LOADED_MODULES_SCRIPT = """
+import runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+heavy = {heavy!r}
+print(",".join(sorted({{name.split(".")[0] for name in sys.modules}} & set(heavy))))
+"""
+
+def measure_startup(arguments:list, repeat:int=5)->list:
+    """
+    Runs main.py with the given arguments in fresh interpreters
+    and returns the wall time of every run in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN_SCRIPT] + arguments, cwd=ROOT_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def loaded_heavy_modules(arguments:list)->list:
+    """
+    Runs main.py with the given arguments in a fresh interpreter
+    and returns the heavy modules which have been imported by the run.
+    """
+    script = LOADED_MODULES_SCRIPT.format(heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", script, MAIN_SCRIPT] + arguments, cwd=ROOT_DIR, check=True,
+                            capture_output=True, text=True)
+    output = result.stdout.strip().splitlines()
+    return [name for name in output[-1].split(",") if name] if output else []
+
+def run_startup_benchmark(work_dir:str, configuration_file:str, repeat:int=5, transactions:int=50)->dict:
+    """
+    Times the cold start of main.py on a single generated DKB CSV.
+    """
+    from code.benchmark.generator import StatementGenerator
+    input_file = os.path.join(work_dir, "startup", "Umsaetze_2023-01.dkb.csv")
+    os.makedirs(os.path.dirname(input_file), exist_ok=True)
+    StatementGenerator(seed=0).writeDkbCsv(input_file, transactions, 2023, 1)
+    arguments = [input_file, os.path.join(work_dir, "startup", "output", "transactions"),
+                 "--export-types", "csv", "--create-dirs", "-q", "-c", configuration_file]
+    timings = measure_startup(arguments, repeat)
+    return {
+        "timings_seconds": timings,
+        "median_seconds": statistics.median(timings),
+        "budget_seconds": STARTUP_BUDGET_SECONDS,
+        "heavy_modules": loaded_heavy_modules(arguments),
+    }
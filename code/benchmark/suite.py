@@ -0,0 +1,86 @@
+import os
+import platform
+import sys
+import time
+from code.model.log import Log
+from code.model.configuration import Configuration
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.factories.extractor import ExtractorFactory
+from code.processor.load import LoadProcessor
+from code.processor.filter import FilterProcessor
+from code.processor.validator import ValidatorProcessor
+from code.processor.exporter import ExportProcessor
+
+class BenchmarkSuite:
+    """
+    Times each stage of the pipeline on its own:
+    discover, detect, extract, sort, filter, validate and export.
+
+    The stages are run sequentially, so the per file numbers of detect and
+    extract add up to the stage totals.
+    """
+    STAGES = ["discover", "detect", "extract", "sort", "filter", "validate", "export"]
+
+    def __init__(self, log:Log, configuration:Configuration):
+        self.log = log
+        self.configuration = configuration
+
+    def _timed(self, function):
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        result = function()
+        return result, time.perf_counter() - start_wall, time.process_time() - start_cpu
+
+    def _stage(self, results:dict, stage:str, function, count_function):
+        result, wall, cpu = self._timed(function)
+        results["stages"].append({
+            "stage": stage,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "items": count_function(result),
+        })
+        return result
+
+    def run(self)->dict:
+        results = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stages": [],
+            "files": [],
+        }
+        start = time.perf_counter()
+
+        files = self._stage(results, "discover", LoadProcessor(self.log, self.configuration).discover, len)
+
+        factory = ExtractorFactory(self.log, self.configuration)
+        def detect():
+            extractors = []
+            for file_path in files:
+                extractor, wall, _ = self._timed(lambda: factory.create_extractor(file_path))
+                results["files"].append({"file": file_path, "detect_seconds": wall, "extractor": extractor.__class__.__name__ if extractor else None})
+                extractors.append(extractor)
+            return extractors
+        extractors = self._stage(results, "detect", detect, lambda extractors: len([e for e in extractors if e]))
+
+        def extract():
+            transactions = []
+            for file_result, extractor in zip(results["files"], extractors):
+                if not extractor:
+                    continue
+                with extractor:
+                    file_transactions, wall, _ = self._timed(extractor.extract_transactions)
+                file_result["extract_seconds"] = wall
+                file_result["transactions"] = len(file_transactions)
+                transactions.extend(file_transactions)
+            return TransactionsWrapper(self.log, transactions)
+        transactions_wrapper = self._stage(results, "extract", extract, lambda wrapper: len(wrapper.getAll()))
+
+        count = lambda wrapper: len(wrapper.getAll())
+        self._stage(results, "sort", lambda: transactions_wrapper.sortByDate() or transactions_wrapper, count)
+        transactions_wrapper = self._stage(results, "filter", FilterProcessor(self.log, self.configuration, transactions_wrapper).process, count)
+        transactions_wrapper = self._stage(results, "validate", ValidatorProcessor(self.log, self.configuration, transactions_wrapper).process, count)
+        self._stage(results, "export", ExportProcessor(self.log, self.configuration, transactions_wrapper).process, count)
+
+        results["total_wall_seconds"] = time.perf_counter() - start
+        return results
@@ -1,51 +1,164 @@
 import os
-from pdfminer.high_level import extract_text, extract_pages
-from pdfminer.layout import LTTextContainer, LTChar
 from code.model.log import Log
-import pdfplumber
-import pandas
+import concurrent.futures
+import multiprocessing
 import sys
+import time
 import traceback
 
+def extract_page_range(pdf_path:str, start:int, end:int, kind:str)->list:
+    """
+    Worker of the page parallel extraction. Opens the PDF on its own and
+    returns the text ("text") or the words ("words") of the pages start to end.
+    """
+    import pdfplumber
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:end]:
+            results.append((page.extract_text() or "") if kind == "text" else page.extract_words())
+            page.close()
+    return results
+
 class PDFConverter:
-    def __init__(self, log: Log, pdf_path: str):
+    """
+    Lazy access to the text and layout of a PDF file.
+    pdfplumber, pdfminer and pandas are imported on first use, because
+    importing them costs more than parsing a typical CSV export.
+
+    Documents with at least PARALLEL_MIN_PAGES pages are split into page
+    ranges, which are extracted by up to page_workers processes. The results
+    are concatenated in page order, so the extractors parse them as before.
+
+    Pages are processed one at a time and release their layout caches as
+    soon as their text or words are taken, so only the extracted strings of
+    the document are kept. The document is closed by close(), or by leaving
+    the converter as a context manager.
+    """
+    PARALLEL_MIN_PAGES = 32
+
+    def __init__(self, log: Log, pdf_path: str, page_workers:int=1):
         self.pdf_path = pdf_path
         self.log = log
+        self.page_workers = page_workers
         self.pdf = None
         self.full_text = None
         self.pages = None
+        self.pages_text = None
+        self.pages_words = None
+        self.first_page_text = None
+        self.header_text = None
         self.pages_data_frame=None
+        self.text_extraction_seconds = 0.0 # Time spent in the PDF libraries extracting text
     
-    def __del__(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self)->None:
+        """Closes the document. Extracted texts stay available."""
         if self.pdf:
-            self.pdf.close()  
-            
+            self.pdf.close()
+        self.pdf = None
+        self.pages = None
+
     def getLazyPdf(self): 
         if self.pdf:
             return self.pdf
+        import pdfplumber
         self.pdf = pdfplumber.open(self.pdf_path)
         return self.pdf 
 
     def getLazyFullText(self)->str:
         if not self.full_text:
-            self.full_text = ""
-            pages = self.getLazyPages()
-            if pages:
-                for page in pages:
-                    page_text = page.extract_text() or ""
-                    self.full_text += page_text + "\n"
+            pages_text = self.getLazyPagesText()
+            if pages_text:
+                self.full_text = "".join(page_text + "\n" for page_text in pages_text)
             else:
                 return None
         return self.full_text
 
+    def getPageRanges(self)->[tuple]:
+        """
+        Returns the (start, end) page ranges for the parallel extraction,
+        or an empty list if the document is extracted in this process.
+        """
+        page_count = len(self.getLazyPages())
+        workers = min(self.page_workers or 1, page_count)
+        if workers <= 1 or page_count < self.PARALLEL_MIN_PAGES:
+            return []
+        chunk_size = -(-page_count // workers)
+        return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+    def _extractPages(self, kind:str, extract)->list:
+        start = time.perf_counter()
+        try:
+            page_ranges = self.getPageRanges()
+            if not page_ranges:
+                return [extract(page) for page in self.iterPages()]
+            self.log.debug(f"Extracting {kind} of '{self.pdf_path}' in {len(page_ranges)} page ranges.")
+            results = []
+            # Spawned workers, because the extractors run in threads and forking those is unsafe
+            with concurrent.futures.ProcessPoolExecutor(max_workers=len(page_ranges), mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(extract_page_range, self.pdf_path, range_start, range_end, kind)
+                           for range_start, range_end in page_ranges]
+                for future in futures:
+                    results.extend(future.result())
+            return results
+        finally:
+            self.text_extraction_seconds += time.perf_counter() - start
+
+    def getLazyPagesText(self)->[str]:
+        """Returns the text of every page. Each page is only extracted once."""
+        if self.pages_text is None:
+            self.pages_text = self._extractPages("text", lambda page: page.extract_text() or "")
+        return self.pages_text
+
+    def getHeaderText(self)->str:
+        """
+        Returns the text of the first page as laid out by pdfplumber, without
+        extracting the other pages. Reuses the page text if it already exists.
+        """
+        if self.pages_text:
+            return self.pages_text[0]
+        if self.header_text is None:
+            start = time.perf_counter()
+            try:
+                pages = self.getLazyPages()
+                self.header_text = (pages[0].extract_text() or "") if pages else ""
+                if pages:
+                    pages[0].close()
+            finally:
+                self.text_extraction_seconds += time.perf_counter() - start
+        return self.header_text
+
+    def getLazyPagesWords(self)->[[dict]]:
+        """Returns the words with their positions of every page. Each page is only extracted once."""
+        if self.pages_words is None:
+            self.pages_words = self._extractPages("words", lambda page: page.extract_words())
+        return self.pages_words
+
     def getLazyPages(self)->[]:
         if self.pages:
             return self.pages
         self.pages = self.getLazyPdf().pages or []
         return self.pages
 
+    def iterPages(self):
+        """
+        Yields the pages one at a time. The caches of a page are flushed
+        when the next page is requested, so at most one page layout is held.
+        """
+        for page in self.getLazyPages():
+            try:
+                yield page
+            finally:
+                page.close()
+
     
     def getPageDataFrame(self,page):
+        import pandas
         table = page.extract_table()
         dataframe = pandas.DataFrame(table[1:], columns=table[0])
         return dataframe
@@ -54,12 +167,13 @@ class PDFConverter:
         if self.pages_data_frame:
             return self.pages_data_frame
         self.pages_data_frame = []  # Initialisierung außerhalb der Schleife
-        for page in self.getLazyPages():
+        for page in self.iterPages():
             self.pages_data_frame.append(self.getPageDataFrame(page))
         return self.pages_data_frame
         
     def getText(self) -> str:
         """Extrahiert den Text aus dem gesamten PDF oder einer begrenzten Anzahl von Seiten."""
+        from pdfminer.high_level import extract_text
         try:
             text = extract_text(self.pdf_path)
             self.log.debug(f"File '{self.pdf_path}' converts to:\n{text}")
@@ -69,10 +183,15 @@ class PDFConverter:
             return None
 
     def getFirstPage(self):
-        """Extracts the text from the first page."""
+        """Extracts the text from the first page. The text is only extracted once."""
+        if self.first_page_text is not None:
+            return self.first_page_text
         self.log.debug(f"Attempting to extract the first page from: {self.pdf_path}")
+        from pdfminer.high_level import extract_text
+        start = time.perf_counter()
         try:
-            return extract_text(self.pdf_path, maxpages=1)
+            self.first_page_text = extract_text(self.pdf_path, maxpages=1)
+            return self.first_page_text
         except ValueError as e:
             if "Non-Ascii85 digit found:" in str(e):
                 error_msg = (
@@ -90,10 +209,14 @@ class PDFConverter:
         except Exception as e:
             # Optional: handle other exceptions or re-raise
             raise
+        finally:
+            self.text_extraction_seconds += time.perf_counter() - start
 
 
     def getStructuredData(self, maxpages=0):
         """Extrahiert strukturierte Daten wie Text und Positionen der Textblöcke."""
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer, LTChar
         structured_data = []
 
         try:
@@ -1,29 +1,39 @@
 from code.model.log import Log
 from datetime import datetime, date  # Import both datetime and date
-import pytz  # Import pytz for timezone management (optional, if using time zones)
 from abc import ABC, abstractmethod
 from code.model.configuration import Configuration
 from code.model.transactions_wrapper import TransactionsWrapper
 
 class AbstractExporter(ABC):
-    def __init__(self, transactions_wrapper:TransactionsWrapper, configuration:Configuration, log:Log, output_file:str):
+    def __init__(self, transactions_wrapper:TransactionsWrapper, configuration:Configuration, log:Log, output_file:str, rows:[dict]=None):
         self.output_file = output_file
         self.log = log
         self.configuration = configuration
         self.transactions_wrapper = transactions_wrapper
-        self.transactions_wrapper.sortByDate()
+        # Flat rows are usually shared by the ExportProcessor, which also sorts the transactions once
+        self.rows = rows
+        self.failed = False
 
-    def get_data_as_dicts(self):
-        return [
-            t.__dict__ for t in self.transactions_wrapper.getAll()
-        ]
+    def logError(self, message:str)->None:
+        """Logs an error and marks the export as failed."""
+        self.failed = True
+        self.log.error(message)
+
+    def get_data_as_dicts(self)->[dict]:
+        if self.rows is None:
+            self.transactions_wrapper.sortByDate()
+            self.rows = [
+                t.getDictionary() for t in self.transactions_wrapper.getAll()
+            ]
+        return self.rows
     
     @abstractmethod
     def export(self)->None:
         pass
     
     def doTransactionsExist(self)->bool:
-        if self.transactions_wrapper.getAll():
+        # Given rows, like the summary tables, are exported on their own
+        if self.rows if self.rows is not None else self.transactions_wrapper.getAll():
             return True
         self.log.warning("No transactions found to save.")
         return False
@@ -1,4 +1,5 @@
 from .abstract import AbstractExporter
+from code.helper.money import format_cents
 
 class ConsoleExporter(AbstractExporter):
     """Prints the transactions on the console"""
@@ -6,4 +7,5 @@ class ConsoleExporter(AbstractExporter):
         if not self.doTransactionsExist():
             return
         for transaction in self.transactions_wrapper.getAll():
-            print(f"{transaction.date}\t{transaction.description}\t{transaction.value}\t{transaction.sender}\t{transaction.source}\t{transaction.bank}\t{transaction.id}")
\ No newline at end of file
+            sender = transaction.getSender()
+            print(f"{transaction.date}\t{transaction.description}\t{format_cents(transaction.value)}\t{sender and sender.getIdentity()}\t{transaction.source}\t{transaction.owner.institute}\t{transaction.id}")
@@ -9,14 +9,12 @@ class CsvExporter(AbstractExporter):
         try:
             with open(self.output_file, mode='w', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
+                rows = self.get_data_as_dicts()
                 # Get the header keys from the first transaction's dictionary
-                header = list(self.transactions_wrapper.getAll()[0].getDictionary().keys())
+                header = list(rows[0].keys())
                 writer.writerow(header)
                 # Write each transaction's values in the same order as the header
-                for transaction in self.transactions_wrapper.getAll():
-                    data = transaction.getDictionary()
-                    row = [data.get(key, "") for key in header]
-                    writer.writerow(row)
+                writer.writerows([data.get(key, "") for key in header] for data in rows)
             self.log.success(f"CSV file created: {self.output_file}")
         except Exception as e:
-            self.log.error(f"Error exporting CSV: {e}")
\ No newline at end of file
+            self.logError(f"Error exporting CSV: {e}")
\ No newline at end of file
@@ -1,9 +1,36 @@
 from .abstract import AbstractExporter
 from code.model.log import Log
-from jinja2 import Environment, FileSystemLoader
-from datetime import datetime
+from code.model.balance_timeline import to_day
+from code.helper.money import cents_to_float
+from datetime import date, datetime
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def get_template(name:str):
+    """Compiles the template once; partitioned exports render it many times."""
+    from jinja2 import Environment, FileSystemLoader
+    env = Environment(loader=FileSystemLoader(searchpath="./templates"))
+    return env.get_template(name)
 
 class HtmlExporter(AbstractExporter):
+    def get_balances(self)->[dict]:
+        """Returns the balance of every exported owner account at its last exported day, read from the timeline."""
+        timeline = self.configuration.timeline
+        if not timeline or not timeline.accounts:
+            return []
+        last_days = {}
+        for transaction in self.transactions_wrapper.getAll():
+            if transaction.owner.id in timeline.accounts and transaction.date:
+                last_days[transaction.owner.id] = max(last_days.get(transaction.owner.id, 0), to_day(transaction.date))
+        balances = []
+        for account_id, day in sorted(last_days.items()):
+            account = timeline.accounts[account_id]
+            balance = account.getBalance(day)
+            if balance is not None:
+                balances.append({"institute": account.institute, "account": account_id,
+                                 "date": date.fromordinal(day).isoformat(), "balance": cents_to_float(balance)})
+        return balances
+
     def export(self)->None:
         if not self.doTransactionsExist():
             return
@@ -30,12 +57,11 @@ class HtmlExporter(AbstractExporter):
             "source": "bi bi-file-earmark-text me-1"
         }
 
-        env = Environment(loader=FileSystemLoader(searchpath="./templates"))
-        template = env.get_template("transactions_template.html.j2")
-        rendered_html = template.render(filter_info=filter_info, transactions=self.transactions_wrapper.getAll(),icon_map=icon_map)
+        template = get_template("transactions_template.html.j2")
+        rendered_html = template.render(filter_info=filter_info, rows=self.get_data_as_dicts(),icon_map=icon_map,balances=self.get_balances())
         try:
             with open(self.output_file, "w", encoding="utf-8") as f:
                 f.write(rendered_html)
             self.log.success(f"HTML file created: {self.output_file}")
         except Exception as e:
-            self.log.error(f"Error exporting HTML: {e}")
\ No newline at end of file
+            self.logError(f"Error exporting HTML: {e}")
\ No newline at end of file
@@ -12,4 +12,4 @@ class JsonExporter(AbstractExporter):
                 json.dump(data, f, indent=2, ensure_ascii=False)
             self.log.success(f"JSON file created: {self.output_file}")
         except Exception as e:
-            self.log.error(f"Error exporting JSON: {e}")
+            self.logError(f"Error exporting JSON: {e}")
@@ -0,0 +1,82 @@
+from .abstract import AbstractExporter
+from code.mapper.qif_mapper import qif_header_lines, qif_transaction_lines, write_qif_lines
+from decimal import Decimal
+from code.helper.money import cents_to_decimal
+
+class QifExporter(AbstractExporter):
+    """
+    Exports transactions to a QIF file for GnuCash.
+
+    The splits are built straight from the Transaction objects, one bank register
+    per owner account. The account names are taken from the configuration file;
+    if an institute has several owner accounts, their ids are appended to its
+    account name, e.g. Assets:Bank:ING:DE89500105179687062585:
+
+      qif:
+        income_account: Income:Uncategorized
+        expense_account: Expenses:Uncategorized
+        categories:
+          Groceries: Expenses:Groceries
+          Salary: Income:Salary
+      institutes:
+        ing:
+          qif_account: Assets:Bank:ING
+
+    Transactions with a category of the "categories" mapping are booked on
+    its account instead of the income or expense account.
+    """
+    DEFAULT_INCOME_ACCOUNT = "Income:Uncategorized"
+    DEFAULT_EXPENSE_ACCOUNT = "Expenses:Uncategorized"
+
+    def _getQifConfiguration(self)->dict:
+        return (self.configuration.configuration_file_data or {}).get("qif") or {}
+
+    def getBankAccountName(self, institute:str)->str:
+        institutes = (self.configuration.configuration_file_data or {}).get("institutes") or {}
+        institute_data = institutes.get((institute or "").lower()) or {}
+        return institute_data.get("qif_account") or f"Assets:Bank:{institute or 'Unknown'}"
+
+    def export(self)->None:
+        if not self.doTransactionsExist():
+            return
+        qif_configuration = self._getQifConfiguration()
+        income_account_name = qif_configuration.get("income_account", self.DEFAULT_INCOME_ACCOUNT)
+        expense_account_name = qif_configuration.get("expense_account", self.DEFAULT_EXPENSE_ACCOUNT)
+        category_accounts = qif_configuration.get("categories") or {}
+
+        # Group the (already date sorted) transactions by their owner account
+        transactions_by_owner = {}
+        for transaction in self.transactions_wrapper.getAll():
+            owner = (transaction.owner.institute, transaction.owner.id)
+            transactions_by_owner.setdefault(owner, []).append(transaction)
+        owners_by_account = {}
+        for institute, owner_id in transactions_by_owner:
+            owners_by_account.setdefault(self.getBankAccountName(institute), []).append(owner_id)
+        transactions_by_account = {}
+        for (institute, owner_id), transactions in transactions_by_owner.items():
+            account_name = self.getBankAccountName(institute)
+            if len(owners_by_account[account_name]) > 1:
+                account_name += f":{owner_id or 'Unknown'}"
+            transactions_by_account[account_name] = transactions
+
+        try:
+            with open(self.output_file, "w", encoding="utf-8") as f:
+                for account_name, transactions in transactions_by_account.items():
+                    write_qif_lines(f, qif_header_lines(account_name))
+                    for transaction in transactions:
+                        amount = cents_to_decimal(transaction.value)
+                        category_account_name = category_accounts.get(transaction.category)
+                        write_qif_lines(f, qif_transaction_lines(
+                            qif_date=transaction.date.strftime("%m/%d/%Y"),
+                            bruto=amount,
+                            netto=amount,
+                            vatAmt=Decimal("0.00"),
+                            payee=transaction.partner.name or transaction.partner.id or "",
+                            memo=(transaction.description or "").strip(),
+                            fitid=transaction.id,
+                            income_account_name=category_account_name or income_account_name,
+                            expense_account_name=category_account_name or expense_account_name
+                        ))
+            self.log.success(f"QIF file created: {self.output_file}")
+        except Exception as e:
+            self.logError(f"Error exporting QIF: {e}")
@@ -7,7 +7,7 @@ class YamlExporter(AbstractExporter):
         if not self.doTransactionsExist():
             return
         if yaml is None:
-            self.log.error("PyYAML is not installed. Cannot export to YAML.")
+            self.logError("PyYAML is not installed. Cannot export to YAML.")
             return
         data = self.get_data_as_dicts()
         try:
@@ -15,4 +15,4 @@ class YamlExporter(AbstractExporter):
                 yaml.dump(data, f, allow_unicode=True)
             self.log.success(f"YAML file created: {self.output_file}")
         except Exception as e:
-            self.log.error(f"Error exporting YAML: {e}")
\ No newline at end of file
+            self.logError(f"Error exporting YAML: {e}")
\ No newline at end of file
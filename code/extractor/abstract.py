@@ -1,14 +1,61 @@
 from code.model.transaction import Transaction
 from code.model.log import Log
 from code.model.configuration import Configuration
+from code.model.statement_header import StatementHeader
+from code.model.reconciliation import Reconciliation
 from abc import ABC, abstractmethod
 
 class AbstractExtractor(ABC):
+    INSTITUTE = None # Institute passed to the header parser
+
     def __init__(self, source:str, log:Log, configuration:Configuration):
         self.source         = source
         self.transactions   = []
         self.log            = log
         self.configuration  = configuration
+        self.statement_header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self)->None:
+        """Releases the resources held for the source file."""
+        pass
+
+    def getHeaderText(self)->str:
+        """Returns the beginning of the statement which contains its header."""
+        return ""
+
+    def getStatementHeader(self)->StatementHeader:
+        """
+        Returns the metadata of the statement header. It is parsed once from
+        the first page and kept in the catalog until the file changes.
+        """
+        if self.statement_header is None:
+            from code.extractor.header import StatementHeaderParser
+            catalog = self.configuration.catalog if self.configuration else None
+            facts = catalog.lookup(self.source) if catalog else {}
+            if "header" in facts:
+                self.statement_header = StatementHeader.fromDictionary(facts["header"])
+            else:
+                self.statement_header = StatementHeaderParser().parse(self.getHeaderText(), self.INSTITUTE)
+                if catalog:
+                    catalog.update(self.source, header=self.statement_header.getDictionary())
+        return self.statement_header
+
+    def getBalances(self)->tuple:
+        """Returns the (opening, closing) balance in cents printed on the statement, each may be None."""
+        header = self.getStatementHeader()
+        return header.opening_balance, header.closing_balance
+
+    def reconcile(self, transactions:[Transaction])->Reconciliation:
+        """Checks the extracted transactions against the balances printed on the statement."""
+        opening_balance, closing_balance = self.getBalances()
+        total = sum(transaction.value for transaction in transactions)
+        return Reconciliation(self.source, opening_balance, closing_balance, total, len(transactions))
     
     def appendTransaction(self, transaction:Transaction):
         transaction.setTransactionId()
@@ -16,4 +63,4 @@ class AbstractExtractor(ABC):
             self.transactions.append(transaction)
             self.log.debug(f"Transaction {transaction} is valid and appended.")
         else:
-            self.log.warning(f"This transaction isn't valid:\n{transaction}")
\ No newline at end of file
+            self.log.warning(f"This transaction isn't valid:\n{transaction}")
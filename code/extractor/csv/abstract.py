@@ -1,4 +1,8 @@
 from code.extractor.abstract import AbstractExtractor
 
 class AbstractCSVExtractor(AbstractExtractor):
-    pass
\ No newline at end of file
+    HEADER_LINES = 10
+
+    def getHeaderText(self)->str:
+        with open(self.source, encoding="utf-8-sig", errors="replace") as f:
+            return "".join(f.readline() for _ in range(self.HEADER_LINES))
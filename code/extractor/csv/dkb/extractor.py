@@ -3,64 +3,113 @@ from code.model.transaction import Transaction
 from code.model.log import Log
 from ..abstract import AbstractCSVExtractor
 from code.model.account import Account, OwnerAccount
+from code.helper.money import parse_german_amount
 
 class DkbCSVExtractor(AbstractCSVExtractor):
+    INSTITUTE = "dkb"
+
+    def __init__(self, source:str, log:Log, configuration):
+        super().__init__(source, log, configuration)
+        self.valid_owners = set() # Owner accounts which passed the validation
+
     def parse_amount(self, amount_str):
-        # Clean up the amount string: remove whitespace, quotes, and non-breaking spaces.
-        amount_str = amount_str.strip().replace('"', '').replace("\u00A0", "").replace(" ", "")
-        sign = 1
-        if amount_str.endswith('+'):
-            amount_str = amount_str[:-1].strip()
-        elif amount_str.endswith('-'):
-            amount_str = amount_str[:-1].strip()
-            sign = -1
+        """Returns the amount in cents."""
+        # Clean up the amount string: remove quotes, the rest is handled by the money helper.
+        amount_str = amount_str.strip().replace('"', '')
         try:
-            # Remove thousand separators and convert the decimal comma to a dot.
-            return sign * float(amount_str.replace(".", "").replace(",", "."))
+            return parse_german_amount(amount_str)
         except ValueError as e:
             self.log.error(f"Failed to convert amount '{amount_str}' in file {self.source}: {e}")
 
-    def extract_transactions(self):
+    def _readHeader(self, reader)->tuple:
+        """
+        Reads the rows up to the column header.
+        Returns the Giro IBAN of the first row and the column names, or None if there is no header.
+        """
+        first_row = next(reader, None)
+        if not first_row:
+            return None
+        iban = first_row[1].strip().replace('"', '') if len(first_row) > 1 else ""
+        # Find the header row starting from the second row (skip the first row with the Giro IBAN).
+        for row in reader:
+            if row and row[0].strip().lower() == "buchungsdatum":
+                return iban, [h.strip().replace('"', '') for h in row]
+        return None
+
+    def iter_transactions(self):
+        """
+        Yields the transactions while reading the file, so the rows are never
+        held in memory at once. Column positions, the owner accounts and the
+        parsed dates are determined once per file.
+        """
         # Open the CSV file with UTF-8 encoding and a semicolon delimiter.
         with open(self.source, newline='', encoding='utf-8') as f:
             reader = csv.reader(f, delimiter=';')
-            rows = list(reader)
-        # Find the header row starting from the second row (skip the first row with the Giro IBAN).
-        header_row_index = next(
-            (i for i, row in enumerate(rows[1:], start=1) if row and row[0].strip().lower() == "buchungsdatum"),
-            None
-        )
-        if header_row_index is None:
-            self.log.error(f"No valid header row found in {self.source}.")
-            return []
+            header = self._readHeader(reader)
+            if header is None:
+                self.log.error(f"No valid header row found in {self.source}.")
+                return
+            iban, headers = header
+            positions = {name: index for index, name in enumerate(headers)}
+            # Missing columns point to the empty cell appended to every row
+            (date_index, amount_index, payer_index, payee_index, partner_iban_index, purpose_index,
+             customer_reference_index, mandate_reference_index, creditor_index) = [
+                positions.get(name, -1) for name in (
+                    "Buchungsdatum", "Betrag (€)", "Zahlungspflichtige*r", "Zahlungsempfänger*in", "IBAN",
+                    "Verwendungszweck", "Kundenreferenz", "Mandatsreferenz", "Gläubiger-ID")]
+            owners = {}
+            dates = {}
 
-        headers = [h.strip().replace('"', '') for h in rows[header_row_index]]
-        data_rows = rows[header_row_index + 1:]
+            for row in reader:
+                # Skip empty rows.
+                if not any(field.strip() for field in row):
+                    continue
+                if len(row) < len(headers):
+                    row = row + [""] * (len(headers) - len(row))
+                row.append("")
+                transaction = Transaction(self.log, self.source)
+                transaction.value = self.parse_amount(row[amount_index] if amount_index >= 0 else "0")
+                if transaction.value is None:
+                    # The amount error is already logged
+                    continue
+                if transaction.value > 0:
+                    owner_name = row[payee_index].strip()
+                    transaction.partner.name = row[payer_index].strip()
+                else:
+                    owner_name = row[payer_index].strip()
+                    transaction.partner.name = row[payee_index].strip()
+                # The owner account with the Giro IBAN is shared by all rows with the same name.
+                # It is validated once, when it is created.
+                if owner_name not in owners:
+                    owners[owner_name] = OwnerAccount(self.log, id=iban, name=owner_name, institute="DKB")
+                    if owners[owner_name].isValid():
+                        self.valid_owners.add(owners[owner_name])
+                transaction.owner = owners[owner_name]
+                transaction.partner.id = row[partner_iban_index].strip()
+                transaction.currency = "EUR"
+                transaction.description = row[purpose_index].strip()
+                transaction.invoice.customer_reference = row[customer_reference_index].strip()
+                transaction.invoice.mandate_reference = row[mandate_reference_index].strip()
+                transaction.invoice.creditor_id = row[creditor_index].strip()
+                date_str = row[date_index]
+                if dates.get(date_str) is None:
+                    transaction.setTransactionDate(date_str)
+                    dates[date_str] = transaction.date
+                else:
+                    transaction.date = dates[date_str]
+                yield transaction
 
-        for row in data_rows:
-            # Skip empty rows.
-            if not any(field.strip() for field in row):
-                continue
-            data = dict(zip(headers, row))
-            transaction = Transaction(self.log, self.source)
-            transaction.setValue(self.parse_amount(data.get("Betrag (€)", "0")))
-            # Set the owner account using the extracted Giro IBAN.
-            transaction.owner = OwnerAccount(
-                self.log, 
-                id=rows[0][1].strip().replace('"', ''), 
-                institute="DKB")
-            if transaction.value > 0:
-                transaction.owner.name = data.get("Zahlungsempfänger*in", "").strip()
-                transaction.partner.name = data.get("Zahlungspflichtige*r", "").strip()
+    def extract_transactions(self):
+        """
+        Collects the transactions of iter_transactions. The pipeline sorts and
+        exports all transactions together, so they are kept in memory; only
+        the raw rows of the file are not.
+        """
+        for transaction in self.iter_transactions():
+            # Complete rows of a valid owner only need their id, the rest takes the generic validation.
+            if transaction.owner in self.valid_owners and transaction.date and (transaction.partner.name or transaction.partner.id):
+                transaction.setTransactionId()
+                self.transactions.append(transaction)
             else:
-                transaction.owner.name = data.get("Zahlungspflichtige*r", "").strip()
-                transaction.partner.name = data.get("Zahlungsempfänger*in", "").strip()
-            transaction.partner.id = data.get("IBAN", "").strip()
-            transaction.currency = "EUR"
-            transaction.description = data.get("Verwendungszweck", "").strip()
-            transaction.invoice.customer_reference = data.get("Kundenreferenz", "").strip()
-            transaction.invoice.mandate_reference = data.get("Mandatsreferenz", "").strip()
-            transaction.invoice.creditor_id = data.get("Gläubiger-ID", "").strip()
-            transaction.setTransactionDate(data.get("Buchungsdatum", ""))
-            self.appendTransaction(transaction)
+                self.appendTransaction(transaction)
         return self.transactions
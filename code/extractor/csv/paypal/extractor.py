@@ -1,79 +1,124 @@
 import csv
 from datetime import datetime
-from zoneinfo import ZoneInfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from code.model.transaction import Transaction
 from code.model.log import Log
 from ..abstract import AbstractCSVExtractor
 from code.model.account import Account, OwnerAccount
+from code.helper.money import parse_german_amount, to_cents
 
 class PaypalCSVExtractor(AbstractCSVExtractor):
-    def getConfigurationElement(self,identifiers:[str]):
-        filtered = self.configuration.configuration_file_data
-        for element in identifiers:
-            self.log.debug(f"Getting element '{element}'.")
-            filtered = filtered.get(element)
-            self.log.debug(f"Filtered '{element}'.")
-        return filtered
-    
+    """
+    Extracts the transactions of a PayPal activity export.
+
+    Everything which is the same for all rows, like the owner account and the
+    column positions, is resolved once per file. The rows are read one by one,
+    and dates, times and amounts in the usual export format are parsed without
+    strptime, so exports with several hundred thousand rows stay fast.
+    """
+    INSTITUTE = "paypal"
+
+    # Columns read from the export
+    COLUMNS = [
+        "Datum", "Uhrzeit", "Zeitzone", "Name", "Währung", "Netto", "Absender E-Mail-Adresse",
+        "Transaktionscode", "Zugehöriger Transaktionscode", "Beschreibung", "Rechnungsnummer", "Name der Bank",
+    ]
+
+    def __init__(self, source:str, log:Log, configuration):
+        super().__init__(source, log, configuration)
+        self._zones = {}
+
+    def _getOwner(self)->OwnerAccount:
+        """Builds the owner account of all rows from the configuration."""
+        owner = (self.configuration.configuration_file_data.get("institutes") or {}).get("paypal", {}).get("owner") or {}
+        return OwnerAccount(self.log, id=owner.get("id"), name=owner.get("name"), institute="Paypal")
+
+    def _getZone(self, tz_string:str)->ZoneInfo:
+        if tz_string not in self._zones:
+            self._zones[tz_string] = ZoneInfo(tz_string)
+        return self._zones[tz_string]
+
+    def _getDatetime(self, date_str:str, time_str:str, tz_str:str)->datetime:
+        """Parses "31.12.2023", "23:59:59" and "Europe/Berlin", or returns None for other formats."""
+        try:
+            day, month, year = date_str.split(".")
+            hour, minute, second = time_str.split(":")
+            if len(year) != 4:
+                return None
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), tzinfo=self._getZone(tz_str))
+        except (ValueError, ZoneInfoNotFoundError):
+            return None
+
     def extract_transactions(self):
+        owner = self._getOwner()
+        # The owner is shared by all rows, so it is validated once
+        owner_is_valid = owner.isValid()
         with open(self.source, newline='', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f, delimiter=',')
-            headers = reader.fieldnames
+            reader = csv.reader(f, delimiter=',')
+            headers = [header.strip() for header in next(reader, [])]
+            positions = {header: index for index, header in enumerate(headers)}
+            # Missing columns point to the empty cell appended to every row
+            (date_index, time_index, tz_index, name_index, currency_index, net_index, sender_index,
+             code_index, related_index, description_index, invoice_index, bank_index) = [
+                positions.get(column, -1) for column in self.COLUMNS]
+
             for row in reader:
-                transaction = Transaction(self.log, self.source)
-                transaction.owner = OwnerAccount(self.log)
-                transaction.owner.id = self.getConfigurationElement(["institutes","paypal","owner","id"])
-                transaction.owner.name = self.getConfigurationElement(["institutes","paypal","owner","name"])
-                transaction.owner.institute = "Paypal"
+                if len(row) < len(headers):
+                    row = row + [""] * (len(headers) - len(row))
+                row.append("")
+                transaction = Transaction(self.log, self.source, owner=owner)
 
                 # -------------------------
                 # 1) Parse Date, Time, TZ
                 # -------------------------
-                # Extract strings for date, time, and time zone
-                date_str = row.get("Datum", "").strip()
-                time_str = row.get("Uhrzeit", "").strip()
-                tz_str   = row.get("Zeitzone", "").strip()
-                transaction.setTransactionDate(date_str)
-                transaction.addTime(time_str, tz_str)
+                date_str = row[date_index].strip()
+                time_str = row[time_index].strip()
+                tz_str   = row[tz_index].strip()
+                transaction.date = self._getDatetime(date_str, time_str, tz_str)
+                if transaction.date is None:
+                    # Other formats and invalid values take the generic path, which reports them
+                    transaction.setTransactionDate(date_str)
+                    transaction.addTime(time_str, tz_str)
 
                 # --------------------------------------
                 # 2) Parse Partner (Sender) Information
                 # --------------------------------------
-                transaction.partner.id          = row.get("Absender E-Mail-Adresse", "").strip()
-                transaction.partner.name        = row.get("Name", "").strip()
-                transaction.partner.institute   = row.get("Name der Bank", "").strip() or "Paypal"
-
+                transaction.partner.id          = row[sender_index].strip()
+                transaction.partner.name        = row[name_index].strip()
+                transaction.partner.institute   = row[bank_index].strip() or "Paypal"
 
                 # -------------------------------
                 # 3) Transaction Metadata
                 # -------------------------------
-                transaction.id                      = row.get("Transaktionscode", "").strip()
-                transaction.description             = row.get("Beschreibung", "").strip()
-                transaction.currency                = row.get("Währung", "").strip()
-                transaction.related_transaction_id  = row.get("Zugehöriger Transaktionscode", "").strip()
+                transaction.id                      = row[code_index].strip()
+                transaction.description             = row[description_index].strip()
+                transaction.currency                = row[currency_index].strip()
+                transaction.related_transaction_id  = row[related_index].strip()
 
-                # Convert 'Netto' to float
-                net_str = row.get("Netto", "").strip().replace(",", ".")
+                # Convert 'Netto' to cents
+                net_str = row[net_index].strip()
                 try:
-                    transaction.setValue(net_str)
+                    # German exports use a decimal comma, others a decimal point
+                    transaction.value = parse_german_amount(net_str) if "," in net_str else to_cents(net_str)
                 except ValueError:
                     self.log.error(f"Error parsing net amount '{net_str}' in {self.source}")
-                    transaction.setValue(0.0)
+                    transaction.value = 0
 
                 # Optional invoice number
                 # transaction.invoice is an Invoice object; store the "Rechnungsnummer" in its id
-                if "Rechnungsnummer" in row:
-                    transaction.invoice.id = row["Rechnungsnummer"].strip()
-                else:
-                    transaction.invoice.id = ""
+                transaction.invoice.id = row[invoice_index].strip()
 
                 # Set additional metadata
-                transaction.source             = self.source
                 transaction.finance_institute  = "PayPal"
 
                 # -------------------------
                 # 4) Append Transaction
                 # -------------------------
-                self.appendTransaction(transaction)
+                # The types are set above and the partner always has an institute, so only
+                # rows with missing fields or without a valid owner need the generic validation
+                if owner_is_valid and transaction.id and transaction.currency and transaction.date:
+                    self.transactions.append(transaction)
+                else:
+                    self.appendTransaction(transaction)
 
         return self.transactions
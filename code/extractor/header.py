@@ -0,0 +1,109 @@
+import re
+from datetime import date
+from code.helper.money import parse_german_amount
+from code.helper.period import GERMAN_MONTHS, month_period
+from code.model.statement_header import StatementHeader
+
+_AMOUNT = r"[+-]?\d{1,3}(?:\.\d{3})*,\d{2}(?:[+-](?!\d))?"
+_DAY = r"\d{2}\.\d{2}\.\d{4}"
+
+class StatementHeaderParser:
+    """
+    Reads the metadata of a statement from the first lines of its first page.
+
+    All fields are found in a single scan with one combined regex of named
+    groups; the first occurrence of every field wins. The layouts differ by
+    institute, but the labels don't collide, so one parser serves all of them:
+
+    - IBAN: "IBAN DE.." (ING, Consorsbank), "IBAN: DE.." (Barclays) or an
+      unlabelled IBAN like the DKB "Girokonto" cell
+    - holder and currency: "Kontoinhaber", "Kontowährung" (Consorsbank)
+    - period: a range like "01.01.2023 - 31.01.2023" (Barclays, DKB),
+      "Kontoauszug <Monat> <Jahr>" (ING) or, for Consorsbank, the year of
+      "Datum", which the Consorsbank extractor assigns to all bookings
+    - balances: "Alter Saldo" and "Neuer Saldo" (ING, Barclays), the first
+      and second "Kontostand zum" (Consorsbank) and "Kontostand vom" (DKB)
+    """
+    MAX_LINES = 20
+
+    pattern = re.compile("|".join([
+        r"IBAN\s*:?\s*(?P<iban>DE[0-9\s]{20,30})",
+        r"(?<![0-9A-Z])(?P<bare_iban>DE\d{2}[0-9A-Z]{18})(?![0-9A-Z])",
+        r"Kontoinhaber\s+(?P<holder>\S+)",
+        r"Kontow\S*hrung\s+(?P<currency>[A-Z]{3})",
+        rf"(?P<range_start>{_DAY})[ \t]*-[ \t]*(?P<range_end>{_DAY})",
+        r"Kontoauszug\s+(?P<month>(?i:" + "|".join(GERMAN_MONTHS) + r"))\s+(?P<month_year>\d{4})",
+        r"Datum\s+(?P<statement_date>\d{2}\.\d{2}\.\d{2}(?:\d{2})?)(?!\d)",
+        rf"Alter\s+Saldo\s+(?P<opening_balance>{_AMOUNT})",
+        rf"Neuer\s+Saldo\s+(?P<closing_balance>{_AMOUNT})",
+        rf"Kontostand\s+zum\s+{_DAY}\s+(?P<balance>{_AMOUNT})",
+        rf"Kontostand\s+vom\s+{_DAY}:?\"?;\"?(?P<balance_as_of>{_AMOUNT})",
+    ]))
+    camel_case_pattern = re.compile(r"([a-z])([A-Z])")
+
+    def parse(self, text:str, institute:str=None)->StatementHeader:
+        header = StatementHeader()
+        if not text:
+            return header
+        text = "\n".join(text.splitlines()[:self.MAX_LINES])
+        found = {}
+        balances = []
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == "iban":
+                iban = re.sub(r"\s+", "", match.group("iban"))
+                if len(iban) == 22:
+                    found.setdefault("iban", iban)
+            elif kind == "bare_iban":
+                found.setdefault("bare_iban", match.group("bare_iban"))
+            elif kind == "balance":
+                balances.append(self.parseAmount(match.group("balance")))
+            elif kind in ("range_end", "month_year"):
+                # The last group of a range or month closes the match
+                found.setdefault("period", match)
+            else:
+                found.setdefault(kind, match.group(kind))
+
+        header.iban = found.get("iban") or found.get("bare_iban")
+        if "holder" in found:
+            header.holder = self.camel_case_pattern.sub(r"\1 \2", found["holder"])
+        header.currency = found.get("currency")
+        if "statement_date" in found:
+            header.statement_date = self.parseDate(found["statement_date"])
+        self._setPeriod(header, found.get("period"), institute)
+        if "opening_balance" in found:
+            header.opening_balance = self.parseAmount(found["opening_balance"])
+        elif balances:
+            header.opening_balance = balances[0]
+        if "closing_balance" in found:
+            header.closing_balance = self.parseAmount(found["closing_balance"])
+        elif "balance_as_of" in found:
+            header.closing_balance = self.parseAmount(found["balance_as_of"])
+        elif len(balances) > 1:
+            header.closing_balance = balances[1]
+        return header
+
+    def _setPeriod(self, header:StatementHeader, match, institute:str)->None:
+        if match and match.group("range_end"):
+            start, end = self.parseDate(match.group("range_start")), self.parseDate(match.group("range_end"))
+            if start and end and start <= end:
+                header.period_start, header.period_end = start, end
+        elif match:
+            header.period_start, header.period_end = month_period(int(match.group("month_year")), GERMAN_MONTHS[match.group("month").lower()])
+        elif institute == "consorsbank" and header.statement_date:
+            year = header.statement_date.year
+            header.period_start, header.period_end = date(year, 1, 1), date(year, 12, 31)
+
+    @staticmethod
+    def parseDate(value:str)->date:
+        day, month, year = value.split(".")
+        if len(year) == 2:
+            year = "20" + year
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parseAmount(value:str)->int:
+        return parse_german_amount(value)
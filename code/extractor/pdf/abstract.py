@@ -6,4 +6,10 @@ from code.model.configuration import Configuration
 class AbstractPDFExtractor(AbstractExtractor):
     def __init__(self, source: str, log: Log, configuration:Configuration, pdf_converter:PDFConverter):
         super().__init__(source, log, configuration)
-        self.pdf_converter = pdf_converter
\ No newline at end of file
+        self.pdf_converter = pdf_converter
+
+    def getHeaderText(self)->str:
+        return self.pdf_converter.getHeaderText()
+
+    def close(self)->None:
+        self.pdf_converter.close()
@@ -9,23 +9,33 @@ class BarclaysAdditionalInfoParser:
     mandate_pattern = re.compile(r"^(P\d+)$")
     # Creditor identifier: beginnt typischerweise mit 'DE' gefolgt von Ziffern und Großbuchstaben
     creditor_pattern = re.compile(r"^(DE\d{2}[A-Z0-9]+)$")
+    text_pattern = re.compile(r"^(.*)$")
+
+    # Order in which the patterns are tried
+    patterns = [
+        ("mandate", mandate_pattern),
+        ("creditor", creditor_pattern),
+        ("text", text_pattern),
+    ]
     
     def parse(self, line: str) -> dict:
-        result = {}
         line = line.strip()
+        for kind, pattern in self.patterns:
+            match = pattern.match(line)
+            if match:
+                return self.parse_token(kind, match.groups(), line)
+        return self.parse_token("text", (line,), line)
+
+    def parse_token(self, kind: str, groups: tuple, line: str) -> dict:
+        """Builds the information of an already classified line."""
+        result = {}
         if not line:
             return result
-        
-        mandate_match = self.mandate_pattern.match(line)
-        if mandate_match:
-            result["mandate_reference"] = mandate_match.group(1)
-            return result
-        
-        creditor_match = self.creditor_pattern.match(line)
-        if creditor_match:
-            result["creditor_id"] = creditor_match.group(1)
-            return result
-        
-        # Falls die Zeile keinem bekannten Muster entspricht, als extra Beschreibung speichern
-        result["extra_description"] = line
+        if kind == "mandate":
+            result["mandate_reference"] = groups[0]
+        elif kind == "creditor":
+            result["creditor_id"] = groups[0]
+        else:
+            # Falls die Zeile keinem bekannten Muster entspricht, als extra Beschreibung speichern
+            result["extra_description"] = line
         return result
@@ -22,11 +22,15 @@ class BarclaysBookingLineParser:
         match = self.booking_line_pattern.match(line)
         if not match:
             return None
-        booking_date = match.group(1)
-        valuta_date = match.group(2)
-        description = match.group(3).strip()
-        card_country = match.group(4)  # Optional: falls vorhanden
-        amount_str = match.group(5).strip()
+        return self.parse_groups(match.groups())
+
+    def parse_groups(self, groups: tuple) -> dict:
+        """Builds the booking data from the groups of an already matched booking line."""
+        booking_date = groups[0]
+        valuta_date = groups[1]
+        description = groups[2].strip()
+        card_country = groups[3]  # Optional: falls vorhanden
+        amount_str = groups[4].strip()
         
         # Betrag wird weiter unten in einen float konvertiert – entferne Tausenderpunkte und ersetze Komma
         amount_str = amount_str.replace(".", "").replace(",", ".")
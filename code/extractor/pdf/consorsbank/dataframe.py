@@ -1,16 +1,17 @@
-import pdfplumber
 import pandas as pd
 from code.model.log import Log
+from code.converter.pdf import PDFConverter
 
 class ConsorbankDataFrame:
-    def __init__(self, pdf_path:str, log:Log):
+    def __init__(self, pdf_converter:PDFConverter, log:Log):
         """
-        Initializes the ConsorbankDataFrame class with the provided PDF path,
+        Initializes the ConsorbankDataFrame class with the provided PDF converter,
         minimum top threshold for filtering words, and margin for defining column ranges.
 
-        :param pdf_path: Path to the PDF file to be processed.
+        :param pdf_converter: Converter of the PDF file to be processed.
         """
-        self.pdf_path = pdf_path
+        self.pdf_converter = pdf_converter
+        self.pdf_path = pdf_converter.pdf_path
         self.log = log
         self.top_diference=6
         
@@ -33,41 +34,39 @@ class ConsorbankDataFrame:
         current_row = None
         last_top = None 
 
-        # Open the PDF file
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page in pdf.pages:
-                words = page.extract_words()
+        # Rows continue across page boundaries, so the words of all pages are processed in order
+        for words in self.pdf_converter.getLazyPagesWords():
 
-                for word in words:
-                    text = word["text"].strip()
-                    x_left = word["x0"]
-                    x_right = word["x1"]
-                    top = word["top"]
+            for word in words:
+                text = word["text"].strip()
+                x_left = word["x0"]
+                x_right = word["x1"]
+                top = word["top"]
 
-                    # If we detect a new row based on the `top` position difference
-                    if last_top is None or abs(last_top - top) > self.top_diference:  # Adjust the difference threshold as needed
-                        if current_row:
-                            rows.append(current_row)
-                        current_row = {col: "" for col in self.columns.keys()}
+                # If we detect a new row based on the `top` position difference
+                if last_top is None or abs(last_top - top) > self.top_diference:  # Adjust the difference threshold as needed
+                    if current_row:
+                        rows.append(current_row)
+                    current_row = {col: "" for col in self.columns.keys()}
 
-                    # Assign the word to the appropriate column based on its X-coordinate
-                    assigned = False
-                    for col_name, (col_min, col_max) in self.columns.items():
-                        if x_left >= col_min and x_right <= col_max:
-                            current_row[col_name] += text + " "
-                            assigned = True
-                            break
+                # Assign the word to the appropriate column based on its X-coordinate
+                assigned = False
+                for col_name, (col_min, col_max) in self.columns.items():
+                    if x_left >= col_min and x_right <= col_max:
+                        current_row[col_name] += text + " "
+                        assigned = True
+                        break
 
-                    # If the word doesn't fit into any column, we ignore it
-                    if not assigned:
-                        continue
+                # If the word doesn't fit into any column, we ignore it
+                if not assigned:
+                    continue
 
-                    # Store the current `top` position for the next row
-                    last_top = top
+                # Store the current `top` position for the next row
+                last_top = top
 
-            # After processing all pages, append the last row
-            if current_row:
-                rows.append(current_row)
+        # After processing all pages, append the last row
+        if current_row:
+            rows.append(current_row)
 
         # Convert the rows into a DataFrame
         df = pd.DataFrame(rows)
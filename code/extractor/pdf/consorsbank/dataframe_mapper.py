@@ -6,6 +6,7 @@ from code.model.log import Log
 from .text import TextExtractor
 from .date_parser import DateParser
 from .invoice import extract_and_remove_invoices
+from code.helper.money import parse_german_amount
 
 class ConsorsbankDataframeMapper:
     """
@@ -31,6 +32,7 @@ class ConsorsbankDataframeMapper:
         self.source = source
         self.textextractor = textextractor
         self.year = textextractor.getYear()
+        self.balances = [] # Amounts of the "*** Kontostand zum" rows in cents
 
     def map_transactions(self, df: pd.DataFrame) -> List[Transaction]:
         """
@@ -114,7 +116,7 @@ class ConsorsbankDataframeMapper:
             # Parse amount from debit/credit
             debit_str = str(first_row.get("Soll", "")).strip()
             credit_str = str(first_row.get("Haben", "")).strip()
-            transaction.value = self._parse_value(debit_str, credit_str) or 0.0
+            transaction.value = self._parse_value(debit_str, credit_str) or 0
 
             # Optionally set a fixed description or extract from row
             transaction.description = "Closing fee (ABSCHLUSS)"
@@ -127,7 +129,16 @@ class ConsorsbankDataframeMapper:
         # ---------------------------------------------------------
         # 2) Ignore lines that are not actual transactions
         # ---------------------------------------------------------
-        if "*** Kontostand zum" in text_val or "Consorsbank" in text_val:
+        if "*** Kontostand zum" in text_val:
+            # Balance rows aren't transactions, but are kept for the reconciliation
+            balance = self._parse_value(
+                str(first_row.get("Soll", "")).strip(),
+                str(first_row.get("Haben", "")).strip()
+            )
+            if balance is not None:
+                self.balances.append(balance)
+            return None
+        if "Consorsbank" in text_val:
             return None
 
         # ---------------------------------------------------------
@@ -163,7 +174,7 @@ class ConsorsbankDataframeMapper:
         transaction.value = self._parse_value(
             str(first_row.get("Soll", "")).strip(),
             str(first_row.get("Haben", "")).strip()
-        ) or 0.0
+        ) or 0
         
         invoices, cleaned_text = extract_and_remove_invoices(transaction.description)
         if invoices:
@@ -209,17 +220,16 @@ class ConsorsbankDataframeMapper:
             self.log.debug(f"Could not parse date from '{date_str}'")
             return date_str
 
-    def _parse_value(self, soll_str: str, haben_str: str) -> Optional[float]:
+    def _parse_value(self, soll_str: str, haben_str: str) -> Optional[int]:
+        """Returns the amount in cents."""
         if soll_str:
-            val_str = soll_str.replace('.', '').replace(',', '.').replace('-', '')
             try:
-                return -float(val_str)
+                return -abs(parse_german_amount(soll_str))
             except ValueError:
                 self.log.debug(f"Could not parse soll value from '{soll_str}'")
         elif haben_str:
-            val_str = haben_str.replace('.', '').replace(',', '.').replace('+', '')
             try:
-                return float(val_str)
+                return abs(parse_german_amount(haben_str))
             except ValueError:
                 self.log.debug(f"Could not parse haben value from '{haben_str}'")
         return None
@@ -11,17 +11,27 @@ from code.model.configuration import Configuration
 
 class ConsorsbankPDFExtractor(AbstractPDFExtractor):
     """Extrahiert Transaktionen aus einem Consorsbank-PDF."""
-    
+    INSTITUTE = "consorsbank"
+
     def __init__(self, source: str, log: Log, configuration:Configuration, pdf_converter:PDFConverter):
         super().__init__(source, log, configuration, pdf_converter)
         self.previous_balance = None
         self.transactions = None
-        textextractor = TextExtractor(self.log,self.pdf_converter.getLazyFullText())
-        dataframe = ConsorbankDataFrame(self.source,self.log)
-        dataframe_mapper = ConsorsbankDataframeMapper(self.log,self.source,textextractor)
-        self.transactions = dataframe_mapper.map_transactions(dataframe.extract_data())
+        self.balances = []
     
     def extract_transactions(self):
+        if self.transactions is None:
+            textextractor = TextExtractor(self.log, self.getStatementHeader(), self.pdf_converter.getLazyFullText)
+            dataframe = ConsorbankDataFrame(self.pdf_converter,self.log)
+            dataframe_mapper = ConsorsbankDataframeMapper(self.log,self.source,textextractor)
+            self.transactions = dataframe_mapper.map_transactions(dataframe.extract_data())
+            self.balances = dataframe_mapper.balances
         return self.transactions
 
+    def getBalances(self)->tuple:
+        # The closing balance is printed at the end of the last page, not in the header
+        if len(self.balances) >= 2:
+            return self.balances[0], self.balances[-1]
+        return super().getBalances()
+
 
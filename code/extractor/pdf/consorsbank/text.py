@@ -1,19 +1,43 @@
 from code.model.log import Log
+from code.model.statement_header import StatementHeader
 import re
 
 class TextExtractor:
-    def __init__(self, log: Log, text:str):
-        self.text = text
+    """
+    Reads the statement metadata from the parsed header. The full text is
+    only loaded, by calling text_loader, if the header lacks a field.
+    Results are memoized, because the mapper asks for them per transaction.
+    """
+    def __init__(self, log: Log, header:StatementHeader, text_loader):
+        self.header = header
+        self.text_loader = text_loader
+        self._text = None
+        self._results = {}
         self.log = log
 
-    def getIBAN(self)->str:
+    @property
+    def text(self)->str:
+        if self._text is None:
+            self._text = self.text_loader() or ""
+        return self._text
+
+    def _memoize(self, name:str, function):
+        if name not in self._results:
+            self._results[name] = function()
+        return self._results[name]
+
+    def _getIBAN(self)->str:
+        if self.header.iban:
+            return self.header.iban
         match_iban =  re.search(r"(DE[0-9A-Z]{20})", self.text)
         if match_iban:
             return match_iban.group(1)
             print("IBAN:", iban)
         self.log.error("No IBAN found.")
 
-    def getAccountHolder(self)->str:
+    def _getAccountHolder(self)->str:
+        if self.header.holder:
+            return self.header.holder
         # Extract the account holder (Kontoinhaber) and insert a space before uppercase letters
         #    We look for "Kontoinhaber " followed by one non-whitespace string.
         match_inhaber = re.search(r"Kontoinhaber\s+(\S+)", self.text)
@@ -31,12 +55,14 @@ class TextExtractor:
             return match_datum.group(1)
         self.log.error("No date found.")
         
-    def getYear(self) -> str:
+    def _getYear(self) -> str:
         """
         Extracts the year (in YYYY format) from a substring like "Datum 30.12.22".
         If the year is only two digits (e.g. '22'), it prepends '20' (=> '2022').
         Returns the four-digit year as a string, or logs an error if not found.
         """
+        if self.header.statement_date:
+            return str(self.header.statement_date.year)
         # This regex captures day, month, and year (either 2 or 4 digits).
         match_date = re.search(r"Datum\s+(\d{2})\.(\d{2})\.(\d{2,4})", self.text)
         if match_date:
@@ -48,8 +74,22 @@ class TextExtractor:
         self.log.warning("No valid date/year found.")
         return None
 
-    def getCurrency(self)->str:
+    def _getCurrency(self)->str:
+        if self.header.currency:
+            return self.header.currency
         match_currency = re.search(r"Kontow\S*hrung\s+([A-Z]{3})", self.text)
         if match_currency:
             return match_currency.group(1)
-        self.log.error("No currency found.")
\ No newline at end of file
+        self.log.error("No currency found.")
+
+    def getIBAN(self)->str:
+        return self._memoize("iban", self._getIBAN)
+
+    def getAccountHolder(self)->str:
+        return self._memoize("holder", self._getAccountHolder)
+
+    def getYear(self)->str:
+        return self._memoize("year", self._getYear)
+
+    def getCurrency(self)->str:
+        return self._memoize("currency", self._getCurrency)
@@ -15,11 +15,14 @@ class BookingLineParser:
         booking_match = self.booking_line_pattern.match(line)
         if not booking_match:
             return None
+        return self.parse_groups(booking_match.groups())
 
-        buchung_date_str = booking_match.group(1)
-        rest_of_line = booking_match.group(2).strip()
-        amount_str = booking_match.group(3).replace(".", "").replace(",", ".")
-        leftover_after_amount = booking_match.group(4) or ""
+    def parse_groups(self, groups: tuple) -> dict:
+        """Baut das Dict aus den Gruppen einer bereits erkannten Buchungszeile."""
+        buchung_date_str = groups[0]
+        rest_of_line = groups[1].strip()
+        amount_str = groups[2].replace(".", "").replace(",", ".")
+        leftover_after_amount = groups[3] or ""
 
         # Transaktionstyp erkennen (z.B. "Lastschrift" oder "Gutschrift")
         transaction_type = None
@@ -27,7 +30,7 @@ class BookingLineParser:
         if type_match:
             transaction_type = type_match.group(1).title()
             # Entferne den Typ aus dem Partnernamen
-            rest_of_line = re.sub(self.type_pattern, "", rest_of_line, count=1).strip()
+            rest_of_line = self.type_pattern.sub("", rest_of_line, count=1).strip()
 
         # "VISA" erkennen
         transaction_medium = None
@@ -1,6 +1,3 @@
-import re
-import pdfplumber
-import yaml
 from code.model.log import Log
 from .booking_line_parser import BookingLineParser
 from .valuta_line_parser import ValutaLineParser
@@ -8,6 +5,7 @@ from .additional_info_parser import AdditionalInfoParser
 from .transaction_builder import TransactionBuilder
 from .iban_parser import IBANParser
 from ..abstract import AbstractPDFExtractor
+from ..tokenizer import LineTokenizer, TransactionAssembler
 from code.converter.pdf import PDFConverter
 from code.model.configuration import Configuration
 
@@ -16,7 +14,12 @@ class IngPDFExtractor(AbstractPDFExtractor):
     Extraktor für ING Girokonto-Auszüge.
     Verantwortlich für das Aufteilen der PDF-Seiten in Zeilen und das Verwenden der
     kleineren Parser-Klassen sowie des TransactionBuilders zur Erstellung von Transaction-Objekten.
+    Jede Zeile wird genau einmal vom LineTokenizer klassifiziert. Der
+    TransactionAssembler hängt dabei auch Mandat, Referenz und ID, die auf die
+    Folgeseite umgebrochen sind, an die letzte Buchung der vorherigen Seite.
     """
+    INSTITUTE = "ing"
+
     def __init__(self, source: str, log: Log, configuration:Configuration, pdf_converter:PDFConverter):
         super().__init__(source, log, configuration, pdf_converter)
         self.transactions = []
@@ -24,57 +27,38 @@ class IngPDFExtractor(AbstractPDFExtractor):
         self.valuta_parser = ValutaLineParser()
         self.additional_parser = AdditionalInfoParser()
         self.iban_parser = IBANParser()
+        tokenizer = LineTokenizer(
+            [("booking", self.booking_parser.booking_line_pattern), ("valuta", self.valuta_parser.valuta_line_pattern)]
+            + self.additional_parser.patterns
+        )
+        self.assembler = TransactionAssembler(
+            tokenizer,
+            parse_booking=self.booking_parser.parse_groups,
+            parse_info=self.additional_parser.parse_token,
+            valuta_kind="valuta",
+            parse_valuta=self.valuta_parser.parse_groups,
+            stitched_kinds={"id", "mandate", "reference"},
+        )
 
     def extract_transactions(self):
         if not self.pdf_converter.getLazyPages():
             self.log.warning(f"No pages found in {self.source}")
             return []
         
-        # Gesamten PDF-Text lesen, um die IBAN zu finden
-        full_text = ""
-        for page in self.pdf_converter.getLazyPages():
-            page_text = page.extract_text() or ""
-            full_text += page_text + "\n"
-            
-        # IBAN extrahieren mithilfe des IBAN-Parsers
-        account_iban = self.iban_parser.extract(full_text)
+        # Seitentexte zuerst lesen, damit der Kopf die erste Seite wiederverwendet
+        pages_text = self.pdf_converter.getLazyPagesText()
+
+        # IBAN aus dem Kopf der ersten Seite, sonst aus dem gesamten PDF-Text
+        account_iban = self.getStatementHeader().iban
+        if account_iban is None:
+            account_iban = self.iban_parser.extract(self.pdf_converter.getLazyFullText())
         if account_iban is None:
             self.log.warning(f"IBAN konnte nicht korrekt extrahiert werden aus {self.source}")
             
         # Transaktionen seitenweise parsen
         builder = TransactionBuilder(self.log, self.source, account_iban)
-        for page in self.pdf_converter.getLazyPages():
-            lines = page.extract_text().splitlines()
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-                booking_data = self.booking_parser.parse(line)
-                if booking_data:
-                    valuta_data = None
-                    additional_infos = []
-                    j = i + 1
-                    
-                    # Prüfe, ob die nächste Zeile ein Valuta-Datum enthält
-                    if j < len(lines):
-                        next_line = lines[j].strip()
-                        temp_valuta = self.valuta_parser.parse(next_line)
-                        if temp_valuta:
-                            valuta_data = temp_valuta
-                            j += 1
-                            
-                    # Sammle zusätzliche Informationen
-                    while j < len(lines):
-                        sub_line = lines[j].strip()
-                        # Beende, wenn eine neue Buchungs- oder Valuta-Zeile beginnt
-                        if self.booking_parser.booking_line_pattern.match(sub_line) or \
-                           self.valuta_parser.valuta_line_pattern.match(sub_line):
-                            break
-                        additional_infos.append(self.additional_parser.parse(sub_line))
-                        j += 1
-                    transaction = builder.build_transaction(booking_data, valuta_data, additional_infos)
-                    if transaction:
-                        self.transactions.append(transaction)
-                    i = j
-                else:
-                    i += 1
+        for assembled in self.assembler.assemble(pages_text):
+            transaction = builder.build_transaction(assembled["booking"], assembled["valuta"], assembled["infos"])
+            if transaction:
+                self.transactions.append(transaction)
         return self.transactions
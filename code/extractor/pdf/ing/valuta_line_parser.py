@@ -8,8 +8,12 @@ class ValutaLineParser:
         """Parst eine Valutazeile und liefert ein Dict mit Valuta-Datum und eventuell vorhandenem Text."""
         match = self.valuta_line_pattern.match(line)
         if match:
-            return {
-                "valuta_date_str": match.group(1),
-                "leftover_text": match.group(2)  # Kann None sein
-            }
+            return self.parse_groups(match.groups())
         return None
+
+    def parse_groups(self, groups: tuple) -> dict:
+        """Baut das Dict aus den Gruppen einer bereits erkannten Valutazeile."""
+        return {
+            "valuta_date_str": groups[0],
+            "leftover_text": groups[1]  # Kann None sein
+        }
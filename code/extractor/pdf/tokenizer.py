@@ -0,0 +1,101 @@
+import re
+
+class LineTokenizer:
+    """
+    Classifies a statement line with a single match of one combined regex.
+
+    The patterns are joined into one alternation of named groups in the given
+    order, so the first kind whose pattern matches wins, exactly like testing
+    the patterns one after another. tokenize() returns the kind together with
+    the groups of the matching pattern, numbered as in the original pattern.
+    """
+    def __init__(self, patterns:[tuple]):
+        self.group_ranges = {}
+        alternatives = []
+        for kind, pattern in patterns:
+            alternatives.append(f"(?P<{kind}>{pattern.pattern})")
+        self.pattern = re.compile("|".join(alternatives))
+        for kind, pattern in patterns:
+            start = self.pattern.groupindex[kind]
+            self.group_ranges[kind] = (start, start + pattern.groups)
+
+    def tokenize(self, line:str)->tuple:
+        """Returns (kind, groups) or (None, None) if no pattern matches."""
+        match = self.pattern.match(line)
+        if not match:
+            return None, None
+        kind = match.lastgroup
+        start, end = self.group_ranges[kind]
+        return kind, match.groups()[start:end]
+
+class TransactionAssembler:
+    """
+    State machine which assembles the tokens of a statement into transactions.
+
+    A booking token opens a transaction. If valuta_kind is given, a token of
+    that kind directly after the booking is its valuta line; anywhere else it
+    ends the collection of information lines. All other tokens are collected
+    as information of the open transaction until the next booking or the end
+    of the page. If that transaction is still open at the end of its page,
+    the continuation lines of the next page belong to it: the run of tokens of
+    the stitched kinds directly above the first booking, below the page and
+    column headers. Any other line above the first booking ends such a run,
+    so header lines which happen to match a stitched kind are dropped.
+
+    The transactions are returned as dicts with the keys booking, valuta and
+    infos, which hold whatever the callbacks returned.
+    """
+    IDLE = "idle"
+    AFTER_BOOKING = "after_booking"
+    COLLECTING = "collecting"
+
+    def __init__(self, tokenizer:LineTokenizer, parse_booking, parse_info, booking_kind:str="booking", valuta_kind:str=None, parse_valuta=None, stitched_kinds:set=frozenset()):
+        self.tokenizer = tokenizer
+        self.parse_booking = parse_booking
+        self.parse_info = parse_info
+        self.booking_kind = booking_kind
+        self.valuta_kind = valuta_kind
+        self.parse_valuta = parse_valuta
+        self.stitched_kinds = stitched_kinds
+
+    def assemble(self, pages_text:[str])->[dict]:
+        assembled = []
+        current = None
+        state = self.IDLE
+        for page_text in pages_text:
+            # Only a transaction which ran to the end of its page is continued
+            continued = current if state != self.IDLE else None
+            continuation = []
+            state = self.IDLE
+            page_head = True
+            for line in page_text.splitlines():
+                line = line.strip()
+                kind, groups = self.tokenizer.tokenize(line)
+                if kind == self.booking_kind:
+                    if page_head and continued:
+                        continued["infos"].extend(continuation)
+                    page_head = False
+                    current = {"booking": self.parse_booking(groups), "valuta": None, "infos": []}
+                    assembled.append(current)
+                    state = self.AFTER_BOOKING
+                elif kind is not None and kind == self.valuta_kind:
+                    if state == self.AFTER_BOOKING:
+                        current["valuta"] = self.parse_valuta(groups)
+                        state = self.COLLECTING
+                    else:
+                        state = self.IDLE
+                        continuation = []
+                elif state != self.IDLE:
+                    info = self.parse_info(kind, groups, line)
+                    if info:
+                        current["infos"].append(info)
+                    state = self.COLLECTING
+                elif page_head and kind in self.stitched_kinds:
+                    info = self.parse_info(kind, groups, line)
+                    if info:
+                        continuation.append(info)
+                elif page_head:
+                    continuation = []
+            if page_head and continued:
+                continued["infos"].extend(continuation)
+        return assembled
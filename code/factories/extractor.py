@@ -1,14 +1,12 @@
 import os
 import importlib
-from pdfminer.high_level import extract_text
-from code.converter.pdf import PDFConverter
 from code.model.configuration import Configuration
 from code.model.log import Log
 
 class ExtractorFactory:
     """
     Factory class that decides which extractor to use for a given file
-    based on extension and textual patterns.
+    based on the path conventions and the first bytes of the file.
     """
     def __init__(self, log:Log, configuration:Configuration):
         self.log = log
@@ -34,52 +32,103 @@ class ExtractorFactory:
             'ing'
         ]
 
-    def create_extractor(self, file_path):
+        self.csv_bank_types = [name.lower() for _, name in self.csv_extractor_mappings]
+
+    def _readHead(self, file_path:str, size:int)->bytes:
+        with open(file_path, "rb") as f:
+            return f.read(size)
+
+    def getInstituteFromPath(self, file_path:str)->str:
+        """Returns the institute named by the <name>.<bank>.<pdf|csv> convention, without opening the file."""
+        filename_without_filetype, file_type = os.path.splitext(file_path)
+        bank_type = os.path.splitext(filename_without_filetype)[1].lower().replace('.', '')
+        if file_type.lower() == ".pdf" and bank_type in self.bank_types:
+            return bank_type
+        if file_type.lower() == ".csv" and bank_type in self.csv_bank_types:
+            return bank_type
+        return None
+
+    def _detectInstitute(self, file_path:str)->str:
         """
-        Chooses and instantiates the correct extractor based on the file extension
-        and file content. Returns an extractor instance or None if no match is found.
+        Decides the institute from the path conventions and the first bytes of the file.
+        PDFs are named <name>.<bank>.pdf; CSVs may be named <name>.<bank>.csv,
+        otherwise their head is matched against the known column names.
         """
         filename_without_filetype, file_type = os.path.splitext(file_path)
         file_type = file_type.lower()
+        bank_type = os.path.splitext(filename_without_filetype)[1].lower().replace('.', '')
 
-        # Handle CSV
-        if file_type == ".csv":
-            with open(file_path, encoding="utf-8") as f:
-                # Read first ~10 lines to detect patterns
-                lines = [f.readline() for _ in range(10)]
-            content = " ".join(lines)
+        if file_type == ".pdf":
+            if bank_type not in self.bank_types:
+                self.log.info(f"No matching PDF extractor found for bank type {bank_type} for file '{file_path}'.")
+                return None
+            if b"%PDF-" not in self._readHead(file_path, 1024):
+                self.log.warning(f"'{file_path}' is not a PDF file.")
+                return None
+            return bank_type
 
+        if file_type == ".csv":
+            if bank_type in self.csv_bank_types:
+                return bank_type
+            head = self._readHead(file_path, 4096)
+            if b"\0" in head:
+                self.log.warning(f"'{file_path}' is not a CSV file.")
+                return None
+            # Like the header rows, the conditions only look at the first lines
+            content = " ".join(head.decode("utf-8", errors="replace").splitlines()[:10])
             # Go through each CSV mapping
             for condition_func, name in self.csv_extractor_mappings:
                 if condition_func(content):
-                    return self._instantiate_extractor(name, file_type, file_path)
+                    return name.lower()
             self.log.info(f"No matching CSV extractor found for '{file_path}'.")
             return None
 
-        # Handle PDF
-        elif file_type == ".pdf":
-            bank_type=os.path.splitext(filename_without_filetype)[1].lower().replace('.','')
-            pdf_converter = PDFConverter(self.log, file_path);
-            
-            first_page_text = pdf_converter.getFirstPage()
-            if first_page_text:
-                lower_first_page_text = first_page_text.lower()
-            else:
-                return None
+        self.log.info(f"Unsupported file extension '{file_type}' for {file_path}.")
+        return None
 
-            if bank_type in self.bank_types:    
-                return self._instantiate_extractor(bank_type, file_type, file_path, pdf_converter)
-            self.log.info(f"No matching PDF extractor found for bank type {bank_type} for file '{file_path}'.")
+    def classify(self, file_path:str)->str:
+        """
+        Returns the institute whose extractor handles the file, or None.
+        The result is cached in the file catalog until the file changes.
+        """
+        catalog = self.configuration.catalog
+        if catalog:
+            facts = catalog.lookup(file_path)
+            if "institute" in facts:
+                return facts["institute"]
+        try:
+            institute = self._detectInstitute(file_path)
+        except OSError as e:
+            self.log.warning(f"Could not read '{file_path}': {e}")
             return None
+        if catalog:
+            catalog.update(file_path, institute=institute)
+        return institute
 
-        # Unsupported extension
-        else:
-            self.log.info(f"Unsupported file extension '{ext}' for {file_path}.")
+    def isSelected(self, institute:str)->bool:
+        selected_institutes = self.configuration.getSelectedInstitutes()
+        return not selected_institutes or institute in selected_institutes
+
+    def create_extractor(self, file_path, institute:str=None):
+        """
+        Chooses and instantiates the correct extractor based on the file extension
+        and the file head. Returns an extractor instance or None if no match is found.
+        The file is not parsed here; the extractors read it lazily.
+        """
+        institute = institute or self.classify(file_path)
+        if not institute:
             return None
+        if institute in self.bank_types:
+            # Imported here, so CSV-only runs never load the PDF libraries
+            from code.converter.pdf import PDFConverter
+            pdf_converter = PDFConverter(self.log, file_path, self.configuration.getPageWorkers())
+            return self._instantiate_extractor(institute, ".pdf", file_path, pdf_converter)
+        name = next(name for _, name in self.csv_extractor_mappings if name.lower() == institute)
+        return self._instantiate_extractor(name, ".csv", file_path)
 
     def _instantiate_extractor(self, name, file_type, file_path, pdf_converter=None):
-        module_name = f"code.extractor.{file_type.lower().replace(".", "")}.{name.lower()}.extractor"
-        class_name = f"{name.capitalize()}{file_type.upper().replace(".", "")}Extractor"
+        module_name = f"code.extractor.{file_type.lower().replace('.', '')}.{name.lower()}.extractor"
+        class_name = f"{name.capitalize()}{file_type.upper().replace('.', '')}Extractor"
         """
         Dynamically imports the extractor module and instantiates the extractor class.
         """
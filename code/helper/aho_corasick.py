@@ -0,0 +1,64 @@
+from collections import deque
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher. All patterns are compiled into one
+    automaton, so a text is scanned once, whatever the number of patterns.
+
+        automaton = AhoCorasick()
+        automaton.add("rewe", 1)
+        automaton.add("we", 2)
+        automaton.build()
+        automaton.search("rewe markt")  # {1, 2}
+    """
+    def __init__(self):
+        self.transitions = [{}]  # Outgoing characters per state, state 0 is the root
+        self.failures = [0]      # State of the longest proper suffix which is also a prefix
+        self.outputs = [()]      # Values of the patterns ending in a state
+        self.patterns = 0
+
+    def add(self, pattern:str, value)->None:
+        """Adds a pattern; search() returns the value when the pattern is found."""
+        if not pattern:
+            raise ValueError("Empty patterns match everywhere.")
+        state = 0
+        for character in pattern:
+            next_state = self.transitions[state].get(character)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.failures.append(0)
+                self.outputs.append(())
+                self.transitions[state][character] = next_state
+            state = next_state
+        self.outputs[state] += (value,)
+        self.patterns += 1
+
+    def build(self)->None:
+        """Computes the failure links; called once after all patterns are added."""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = self.failures[state]
+                while failure and character not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                failure = self.transitions[failure].get(character, 0)
+                self.failures[next_state] = failure
+                self.outputs[next_state] += self.outputs[failure]
+
+    def search(self, text:str)->set:
+        """Returns the values of all patterns which occur in the text."""
+        found = set()
+        transitions = self.transitions
+        failures = self.failures
+        outputs = self.outputs
+        state = 0
+        for character in text:
+            while state and character not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(character, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
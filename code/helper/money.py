@@ -0,0 +1,63 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Amounts are stored as integer cents (minor units), so they add up exactly.
+# Decimals are only produced at the output edge.
+
+CENTS_PER_UNIT = 100
+
+def to_cents(amount)->int:
+    """
+    Converts an amount in currency units to cents. Accepts ints, floats,
+    Decimals and strings with a dot as decimal separator like "-1234.56".
+    Raises ValueError if the amount isn't a number.
+    """
+    if isinstance(amount, bool):
+        raise ValueError(f"Invalid amount {amount!r}")
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    if isinstance(amount, float):
+        # repr is the shortest string which reads back as the same float
+        amount = repr(amount)
+    try:
+        amount = Decimal(amount.strip()) if isinstance(amount, str) else Decimal(amount)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Invalid amount {amount!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount {amount!r}")
+    return int((amount * CENTS_PER_UNIT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def parse_german_amount(text:str)->int:
+    """
+    Converts a German formatted amount like "1.234,56", "-1.234,56",
+    "1.234,56-" or "1.234,56 €" to cents with integer arithmetic only.
+    Raises ValueError if the text isn't such an amount.
+    """
+    digits = text.strip().replace("€", "").replace("\u00A0", "").replace(" ", "")
+    sign = 1
+    if digits.endswith("-"):
+        sign, digits = -1, digits[:-1]
+    elif digits.endswith("+"):
+        digits = digits[:-1]
+    if digits.startswith("-"):
+        sign, digits = -sign, digits[1:]
+    elif digits.startswith("+"):
+        digits = digits[1:]
+    whole, _, fraction = digits.replace(".", "").partition(",")
+    if not (whole or fraction) or len(fraction) > 2 or not (whole + fraction).isdigit():
+        raise ValueError(f"Invalid amount {text!r}")
+    return sign * (int(whole or "0") * CENTS_PER_UNIT + int(fraction.ljust(2, "0")))
+
+def cents_to_decimal(cents:int)->Decimal:
+    return Decimal(cents).scaleb(-2)
+
+def cents_to_float(cents:int)->float:
+    """Returns the amount in currency units, for serializers without decimals."""
+    if cents is None:
+        return None
+    return cents / CENTS_PER_UNIT
+
+def format_cents(cents:int)->str:
+    """Formats cents like -1234.56."""
+    sign = "-" if cents < 0 else ""
+    whole, fraction = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{whole}.{fraction:02d}"
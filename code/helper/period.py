@@ -0,0 +1,51 @@
+import calendar
+import os
+import re
+from datetime import date
+
+# Periods are (first day, last day) tuples of dates
+
+GERMAN_MONTHS = {
+    "januar": 1, "februar": 2, "märz": 3, "maerz": 3, "april": 4, "mai": 5, "juni": 6,
+    "juli": 7, "august": 8, "september": 9, "oktober": 10, "november": 11, "dezember": 12,
+}
+
+_filename_range_pattern = re.compile(r"(?<!\d)(\d{4})-(\d{2})-(\d{2})[_ -]+(\d{4})-(\d{2})-(\d{2})(?!\d)")
+
+def month_period(year:int, month:int)->tuple:
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+def _date(year, month, day)->date:
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+def period_from_filename(file_path:str)->tuple:
+    """
+    Reads the period from names with an explicit range like
+    statement_2023-01-01_2023-03-31.csv. Single dates and months are ignored,
+    because statements are often named after their creation date, e.g.
+    Kontoauszug_2024-01.ing.pdf holding the bookings of December.
+    """
+    name = os.path.basename(file_path)
+    match = _filename_range_pattern.search(name)
+    if match:
+        start, end = _date(*match.groups()[:3]), _date(*match.groups()[3:])
+        if start and end and start <= end:
+            return start, end
+    return None
+
+def period_from_header(text:str, bank_type:str=None)->tuple:
+    """Reads the period from the header of a statement, see StatementHeaderParser."""
+    from code.extractor.header import StatementHeaderParser
+    return StatementHeaderParser().parse(text, bank_type).getPeriod()
+
+def overlaps(period:tuple, from_date:date=None, to_date:date=None)->bool:
+    """Returns False only if the period lies completely outside of the range."""
+    start, end = period
+    if from_date and end < from_date:
+        return False
+    if to_date and start > to_date:
+        return False
+    return True
@@ -1,6 +1,7 @@
 # code/mapper/qif_mapper.py
 
 import csv
+import os
 import sys
 from decimal import Decimal
 from datetime import datetime
@@ -45,6 +46,141 @@ def parse_date_to_qif(date_str: str) -> str:
     raise ValueError(f"Could not parse date '{s}'")
 
 
+def qif_header_lines(bank_account_name: str) -> list:
+    """
+    Return the lines of the account header for a Bank register.
+    """
+    return [
+        "!Account",
+        f"N{bank_account_name}",
+        "TBank",
+        "^",            # end of account header
+        "",             # blank line before transactions
+        "!Type:Bank",
+    ]
+
+
+def qif_transaction_lines(
+    qif_date: str,
+    bruto: Decimal,
+    netto: Decimal,
+    vatAmt: Decimal,
+    payee: str,
+    memo: str,
+    fitid: str,
+    income_account_name: str,
+    expense_account_name: str,
+    vat_output_account_name: str = None,
+    vat_input_account_name: str = None
+) -> list:
+    """
+    Return the QIF lines of a single transaction including its splits.
+    See build_qif_from_csv for the splitting logic.
+    """
+    lines = []
+
+    # Determine whether this is an expense (brutto < 0) or income (brutto > 0)
+    is_expense = (bruto < 0)
+    tx_amount_str = f"{bruto:.2f}"
+
+    # Write top-level transaction header
+    lines.append(f"D{qif_date}")       # Date line
+    lines.append(f"T{tx_amount_str}")  # Amount line
+    if payee:
+        lines.append(f"P{payee}")      # Payee/Payer
+    if memo:
+        lines.append(f"M{memo}")       # Memo
+    if fitid:
+        lines.append(f"N{fitid}")      # Check/Number (using transaction ID)
+
+    # Determine splitting behavior based on presence of VAT accounts
+    if vat_output_account_name and vat_input_account_name:
+        # VAT accounts provided → create net + VAT splits
+        if is_expense:
+            # EXPENSE: bruto is negative
+            split1_amt = f"{abs(netto):.2f}"
+            split2_amt = f"{abs(vatAmt):.2f}"
+
+            lines.append(f"S{expense_account_name}")
+            lines.append(f"${split1_amt}")
+            lines.append(f"%Net (expense)")
+
+            lines.append(f"S{vat_input_account_name}")
+            lines.append(f"${split2_amt}")
+            lines.append(f"%VAT (input)")
+        else:
+            # INCOME: bruto is positive
+            split1_amt = f"{-abs(netto):.2f}"
+            split2_amt = f"{-abs(vatAmt):.2f}"
+
+            lines.append(f"S{income_account_name}")
+            lines.append(f"${split1_amt}")
+            lines.append(f"%Net (income)")
+
+            lines.append(f"S{vat_output_account_name}")
+            lines.append(f"${split2_amt}")
+            lines.append(f"%VAT (output)")
+    else:
+        # VAT accounts not provided → single split for full amount on income/expense account
+        if is_expense:
+            split_amt = f"{abs(bruto):.2f}"
+            lines.append(f"S{expense_account_name}")
+            lines.append(f"${split_amt}")
+            lines.append(f"%Net (expense, no VAT)")
+        else:
+            split_amt = f"{-abs(bruto):.2f}"
+            lines.append(f"S{income_account_name}")
+            lines.append(f"${split_amt}")
+            lines.append(f"%Net (income, no VAT)")
+
+    # Transaction terminator
+    lines.append("^")
+    return lines
+
+
+def parse_qif_row(row: dict) -> dict:
+    """
+    Parse a single CSV row into the values of a QIF transaction.
+    Raises an exception if the date or an amount can't be parsed.
+    """
+    fitid = row.get("id", "").strip()
+    qif_date = parse_date_to_qif(row.get("date", "").strip())
+    if "brutto value" in row:
+        bruto = parse_amount_german(row.get("brutto value", "").replace("€", "").strip())
+        netto = parse_amount_german(row.get("netto value", "").replace("€", "").strip())
+        vatAmt = parse_amount_german(row.get("Vat value", "").replace("€", "").strip())
+    else:
+        # CSV export of main.py: the value has a decimal point and no VAT
+        bruto = Decimal(row.get("value", "").strip() or "0").quantize(Decimal("0.01"))
+        netto = bruto
+        vatAmt = Decimal("0.00")
+
+    payee = row.get("partner_name", "").strip()
+    if not payee:
+        if bruto < 0:
+            payee = row.get("receiver", "").strip()
+        else:
+            payee = row.get("sender", "").strip()
+
+    return {
+        "qif_date": qif_date,
+        "bruto": bruto,
+        "netto": netto,
+        "vatAmt": vatAmt,
+        "payee": payee,
+        "memo": row.get("description", "").strip(),
+        "fitid": fitid,
+    }
+
+
+def write_qif_lines(f_out, lines: list) -> None:
+    """
+    Write the given lines to an open QIF file, each terminated by a newline.
+    """
+    f_out.write("\n".join(lines))
+    f_out.write("\n")
+
+
 def build_qif_from_csv(
     input_csv: str,
     output_qif: str,
@@ -58,10 +194,17 @@ def build_qif_from_csv(
     """
     Read a flat CSV and write a QIF file with splits.
 
+    Rows are streamed: each transaction is written as soon as it is parsed,
+    so neither the CSV nor the QIF is held in memory.
+
     Optionally filter by the 'category' column: only process rows where
     'category' equals filter_category.
 
-    Each CSV row must contain at least these columns:
+    The CSV export of main.py can be used directly; its "value" column
+    takes the place of the brutto value without VAT and its "category"
+    column is filled by the category rules of the configuration.
+
+    Otherwise each CSV row must contain at least these columns:
       - id
       - date
       - brutto value
@@ -87,114 +230,110 @@ def build_qif_from_csv(
           - If brutto < 0 (expense): single split on expense_account_name with amount = +abs(brutto)
       The sum of splits must match the top-level transaction amount.
     """
+    build_qifs_from_csv(
+        input_csv=input_csv,
+        targets=[{
+            "category": filter_category,
+            "output_qif": output_qif,
+            "bank_account_name": bank_account_name,
+            "income_account_name": income_account_name,
+            "expense_account_name": expense_account_name,
+            "vat_output_account_name": vat_output_account_name,
+            "vat_input_account_name": vat_input_account_name,
+        }]
+    )
+
+
+def build_qifs_from_csv(input_csv: str, targets: list):
+    """
+    Read a flat CSV once and route its rows into several QIF files.
+
+    Each target is a dictionary with the keys of build_qif_from_csv:
+      - category (None matches every row)
+      - output_qif
+      - bank_account_name
+      - income_account_name
+      - expense_account_name
+      - vat_output_account_name (optional)
+      - vat_input_account_name (optional)
+
+    A row is written to every target whose category matches the row's
+    'category' column. Targets without a category receive all rows.
+
+    Every QIF is written to "<output_qif>.tmp" and only replaces its target
+    once all rows are written, so an error leaves the previous files intact.
+    """
+    # 1) Index the targets by category, so each row is routed with one lookup
+    targets_by_category = {}
+    catch_all_targets = []
 
-    # 1) Read CSV rows into a list of dictionaries
     try:
-        with open(input_csv, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter=",")
-            rows = list(reader)
+        f_in = open(input_csv, newline="", encoding="utf-8")
     except Exception as e:
         print(f"[Error] Could not read CSV: {e}", file=sys.stderr)
         return
 
-    # 2) Prepare QIF lines
-    lines = []
-
-    # Write the account header for a Bank register
-    lines.append("!Account")
-    lines.append(f"N{bank_account_name}")
-    lines.append("TBank")
-    lines.append("^")            # end of account header
-    lines.append("")             # blank line before transactions
-    lines.append("!Type:Bank")
-
-    for row in rows:
-        # If a category filter is provided, skip rows that don't match exactly
-        if filter_category is not None:
-            kat = row.get("category", "").strip()
-            if kat != filter_category:
-                continue
-
-        try:
-            fitid = row.get("id", "").strip()
-            qif_date = parse_date_to_qif(row.get("date", "").strip())
-            bruto = parse_amount_german(row.get("brutto value", "").replace("€", "").strip())
-            netto = parse_amount_german(row.get("netto value", "").replace("€", "").strip())
-            vatAmt = parse_amount_german(row.get("Vat value", "").replace("€", "").strip())
-        except Exception as e:
-            print(f"[Warning] Skipping row due to parse error: {e}", file=sys.stderr)
-            continue
-
-        # Determine whether this is an expense (brutto < 0) or income (brutto > 0)
-        is_expense = (bruto < 0)
-        tx_amount_str = f"{bruto:.2f}"
-
-        payee = row.get("partner_name", "").strip()
-        if not payee:
-            if is_expense:
-                payee = row.get("receiver", "").strip()
-            else:
-                payee = row.get("sender", "").strip()
-
-        memo = row.get("description", "").strip()
-
-        # Write top-level transaction header
-        lines.append(f"D{qif_date}")       # Date line
-        lines.append(f"T{tx_amount_str}")  # Amount line
-        if payee:
-            lines.append(f"P{payee}")      # Payee/Payer
-        if memo:
-            lines.append(f"M{memo}")       # Memo
-        if fitid:
-            lines.append(f"N{fitid}")      # Check/Number (using transaction ID)
-
-        # Determine splitting behavior based on presence of VAT accounts
-        if vat_output_account_name and vat_input_account_name:
-            # VAT accounts provided → create net + VAT splits
-            if is_expense:
-                # EXPENSE: bruto is negative
-                split1_amt = f"{abs(netto):.2f}"
-                split2_amt = f"{abs(vatAmt):.2f}"
-
-                lines.append(f"S{expense_account_name}")
-                lines.append(f"${split1_amt}")
-                lines.append(f"%Net (expense)")
-
-                lines.append(f"S{vat_input_account_name}")
-                lines.append(f"${split2_amt}")
-                lines.append(f"%VAT (input)")
+    # 2) Open every temporary QIF and write its account header
+    outputs = []
+    try:
+        for target in targets:
+            f_out = open(target["output_qif"] + ".tmp", "w", encoding="utf-8")
+            outputs.append(f_out)
+            write_qif_lines(f_out, qif_header_lines(target["bank_account_name"]))
+            if target.get("category") is None:
+                catch_all_targets.append((target, f_out))
             else:
-                # INCOME: bruto is positive
-                split1_amt = f"{-abs(netto):.2f}"
-                split2_amt = f"{-abs(vatAmt):.2f}"
-
-                lines.append(f"S{income_account_name}")
-                lines.append(f"${split1_amt}")
-                lines.append(f"%Net (income)")
+                targets_by_category.setdefault(target["category"], []).append((target, f_out))
+    except Exception as e:
+        print(f"[Error] Could not write QIF: {e}", file=sys.stderr)
+        _discard_outputs(outputs)
+        f_in.close()
+        return
 
-                lines.append(f"S{vat_output_account_name}")
-                lines.append(f"${split2_amt}")
-                lines.append(f"%VAT (output)")
-        else:
-            # VAT accounts not provided → single split for full amount on income/expense account
-            if is_expense:
-                split_amt = f"{abs(bruto):.2f}"
-                lines.append(f"S{expense_account_name}")
-                lines.append(f"${split_amt}")
-                lines.append(f"%Net (expense, no VAT)")
-            else:
-                split_amt = f"{-abs(bruto):.2f}"
-                lines.append(f"S{income_account_name}")
-                lines.append(f"${split_amt}")
-                lines.append(f"%Net (income, no VAT)")
+    # 3) Stream the rows into the matching QIF files
+    try:
+        with f_in:
+            reader = csv.DictReader(f_in, delimiter=",")
+            for row in reader:
+                kat = row.get("category", "").strip()
+                matching_targets = catch_all_targets + targets_by_category.get(kat, [])
+                if not matching_targets:
+                    continue
 
-        # Transaction terminator
-        lines.append("^")
+                try:
+                    values = parse_qif_row(row)
+                except Exception as e:
+                    print(f"[Warning] Skipping row due to parse error: {e}", file=sys.stderr)
+                    continue
 
-    # 3) Write all lines to the QIF file
-    try:
-        with open(output_qif, "w", encoding="utf-8") as f_out:
-            f_out.write("\n".join(lines))
-        print(f"[QIFMapper] Created QIF file: {output_qif}")
+                for target, f_out in matching_targets:
+                    write_qif_lines(f_out, qif_transaction_lines(
+                        **values,
+                        income_account_name=target["income_account_name"],
+                        expense_account_name=target["expense_account_name"],
+                        vat_output_account_name=target.get("vat_output_account_name"),
+                        vat_input_account_name=target.get("vat_input_account_name")
+                    ))
+        for f_out in outputs:
+            f_out.close()
     except Exception as e:
         print(f"[Error] Could not write QIF: {e}", file=sys.stderr)
+        _discard_outputs(outputs)
+        return
+
+    # 4) Replace the targets only now that every QIF is complete
+    for target in targets:
+        os.replace(target["output_qif"] + ".tmp", target["output_qif"])
+        print(f"[QIFMapper] Created QIF file: {target['output_qif']}")
+
+
+def _discard_outputs(outputs: list) -> None:
+    """
+    Close and remove the temporary QIF files of a failed run.
+    """
+    for f_out in outputs:
+        f_out.close()
+        try:
+            os.remove(f_out.name)
+        except OSError:
+            pass
@@ -6,6 +6,7 @@ class Account:
         self.id = id                # ID of the account like IBAN
         self.name = name            # Owner of the Account like Max Mustermann
         self.institute = institute  # The institute the account belongs to  
+        self.original_name = None   # Spelling in the statement, if the name was normalized
 
     def isValid(self)->bool:
         if bool(self.id or self.name or self.institute):
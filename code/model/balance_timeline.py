@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from code.model.configuration import Configuration
+
+def to_day(value)->int:
+    """Returns the ordinal of a date, datetime or ISO date string."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+class AccountTimeline:
+    """
+    Balance history of one owner account.
+
+    The days with bookings are kept in ascending order together with the
+    sum of all bookings up to the end of each day, so the sum of any period
+    is the difference of two binary searches. Anchors are balances known
+    at the start of a day, like the opening balance of a statement; they
+    turn the sums into balances. All amounts are integer cents.
+
+    Every source file keeps its net bookings per day, so a file can be
+    removed again without rebuilding the account.
+    """
+    def __init__(self, account_id:str, institute:str=None):
+        self.account_id = account_id
+        self.institute  = institute
+        self.days       = []    # Ordinals of the days with bookings
+        self.sums       = []    # Sum of the bookings up to the end of the day
+        self.anchors    = []    # Sorted (day, balance at the start of the day, origin)
+        self.sources    = {}    # File -> {"stat": [mtime_ns, size], "bookings": number, "nets": [(day, cents)]}
+
+    def addBookings(self, bookings)->None:
+        """
+        Adds (day, cents) bookings. Bookings after the last known day are
+        appended, earlier ones recompute the sums from their first day on.
+        """
+        nets = {}
+        for day, value in bookings:
+            nets[day] = nets.get(day, 0) + value
+        if not nets:
+            return
+        new_days = sorted(nets)
+        start = len(self.days) if not self.days or new_days[0] > self.days[-1] else bisect_left(self.days, new_days[0])
+        total = self.sums[start - 1] if start else 0
+        for position in range(start, len(self.days)):
+            day = self.days[position]
+            nets[day] = nets.get(day, 0) + self.sums[position] - (self.sums[position - 1] if position else 0)
+        del self.days[start:]
+        del self.sums[start:]
+        for day in sorted(nets):
+            total += nets[day]
+            self.days.append(day)
+            self.sums.append(total)
+
+    def addSource(self, file_path:str, stat:list, bookings:list)->None:
+        """Adds the (day, cents) bookings of a file."""
+        nets = {}
+        for day, value in bookings:
+            nets[day] = nets.get(day, 0) + value
+        self.addBookings(nets.items())
+        self.sources[file_path] = {"stat": stat, "bookings": len(bookings), "nets": sorted(nets.items())}
+
+    def removeSource(self, file_path:str)->None:
+        """Removes the bookings and anchors of a file."""
+        source = self.sources.pop(file_path)
+        self.addBookings((day, -value) for day, value in source["nets"])
+        self.removeAnchors(file_path)
+        # Days only booked by the file are gone
+        days = {day for other in self.sources.values() for day, _ in other["nets"]}
+        kept = [(day, total) for day, total in zip(self.days, self.sums) if day in days]
+        self.days = [day for day, _ in kept]
+        self.sums = [total for _, total in kept]
+
+    def findSource(self, bookings:list)->str:
+        """Returns a file with exactly the given (day, cents) bookings, like a copy of the statement, or None."""
+        nets = {}
+        for day, value in bookings:
+            nets[day] = nets.get(day, 0) + value
+        nets = sorted(nets.items())
+        return next((file_path for file_path, source in self.sources.items()
+                     if source["bookings"] == len(bookings) and source["nets"] == nets), None)
+
+    def addAnchor(self, day:int, balance:int, origin:str)->None:
+        insort(self.anchors, (day, balance, origin))
+
+    def removeAnchors(self, origin:str)->None:
+        self.anchors = [anchor for anchor in self.anchors if anchor[2] != origin]
+
+    def _getSum(self, day:int)->int:
+        position = bisect_right(self.days, day)
+        return self.sums[position - 1] if position else 0
+
+    def getTotal(self, start_day:int, end_day:int)->int:
+        """Sum of the bookings from the start to the end of the given days."""
+        return self._getSum(end_day) - self._getSum(start_day - 1)
+
+    def getBalance(self, day:int)->int:
+        """
+        Balance at the end of the day, taken from the last anchor before it
+        (or the first one); None if the account has no anchor.
+        """
+        if not self.anchors:
+            return None
+        position = bisect_right(self.anchors, (day, float("inf")))
+        anchor_day, balance, _ = self.anchors[position - 1] if position else self.anchors[0]
+        return balance + self._getSum(day) - self._getSum(anchor_day - 1)
+
+    def getSeries(self, start_day:int=None, end_day:int=None)->[tuple]:
+        """Returns (day, balance) at the end of every day with bookings within the range."""
+        start = bisect_left(self.days, start_day) if start_day is not None else 0
+        end = bisect_right(self.days, end_day) if end_day is not None else len(self.days)
+        return [(day, self.getBalance(day)) for day in self.days[start:end]]
+
+    def getDictionary(self)->dict:
+        return {
+            "institute":    self.institute,
+            "days":         [date.fromordinal(day).isoformat() for day in self.days],
+            "sums":         self.sums,
+            "anchors":      [[date.fromordinal(day).isoformat(), balance, origin] for day, balance, origin in self.anchors],
+            "sources":      {file_path: {"stat": source["stat"], "bookings": source["bookings"],
+                                         "nets": [[date.fromordinal(day).isoformat(), value] for day, value in source["nets"]]}
+                             for file_path, source in self.sources.items()},
+        }
+
+    @classmethod
+    def fromDictionary(cls, account_id:str, data:dict)->"AccountTimeline":
+        timeline = cls(account_id, data.get("institute"))
+        timeline.days = [to_day(day) for day in data["days"]]
+        timeline.sums = data["sums"]
+        timeline.anchors = [(to_day(day), balance, origin) for day, balance, origin in data["anchors"]]
+        timeline.sources = {file_path: {"stat": source["stat"], "bookings": source["bookings"],
+                                        "nets": [(to_day(day), value) for day, value in source["nets"]]}
+                            for file_path, source in data["sources"].items()}
+        return timeline
+
+class BalanceTimeline:
+    """
+    Balance timelines of all owner accounts, persisted in the cache
+    directory, so later runs only add the bookings of new files.
+    """
+    FILE_NAME = "timeline.json"
+    VERSION = 2
+
+    def __init__(self, configuration:Configuration):
+        self.configuration = configuration
+        self.accounts = {}
+        self._lock = threading.Lock()
+        self.path = None
+        cache_dir = configuration.getCacheDir()
+        if cache_dir:
+            self.path = os.path.join(cache_dir, self.FILE_NAME)
+            self._load()
+
+    def _load(self)->None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.accounts = {account_id: AccountTimeline.fromDictionary(account_id, account)
+                             for account_id, account in data.get("accounts", {}).items()}
+
+    def getAccounts(self, institute:str=None)->[AccountTimeline]:
+        return [account for account in self.accounts.values()
+                if not institute or (account.institute or "").lower() == institute.lower()]
+
+    def holds(self, institute:str, transactions:list)->bool:
+        """
+        Returns True if the accounts of the institute consist of exactly the
+        files of the transactions, each with all of its bookings, so their
+        totals equal the sums of the transactions.
+        """
+        bookings = {}
+        for transaction in transactions:
+            if not transaction.owner.id or transaction.value is None:
+                return False
+            key = (transaction.owner.id, os.path.abspath(transaction.source))
+            bookings[key] = bookings.get(key, 0) + 1
+        return bool(bookings) and bookings == {(account.account_id, file_path): source["bookings"]
+                                               for account in self.getAccounts(institute)
+                                               for file_path, source in account.sources.items()}
+
+    def getTotal(self, institute:str, start, end)->int:
+        """Sum of the bookings of all accounts of the institute from the start to the end date."""
+        return sum(account.getTotal(to_day(start), to_day(end)) for account in self.getAccounts(institute))
+
+    def save(self)->None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": self.VERSION, "accounts": {account_id: account.getDictionary() for account_id, account in self.accounts.items()}}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary_path = self.path + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temporary_path, self.path)
@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+from code.model.configuration import Configuration
+
+class Catalog:
+    """
+    Facts about input files which are expensive to determine, such as the
+    statement period, persisted in the cache directory between runs.
+
+    Every entry remembers the size and modification time of its file and
+    is ignored as soon as the file changed.
+    """
+    FILE_NAME = "catalog.json"
+    VERSION = 2
+
+    def __init__(self, configuration:Configuration):
+        self.configuration = configuration
+        self.entries = {}
+        self._changed = False
+        self._lock = threading.Lock()
+        self.path = None
+        cache_dir = configuration.getCacheDir()
+        if cache_dir:
+            self.path = os.path.join(cache_dir, self.FILE_NAME)
+            self._load()
+
+    def _load(self)->None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.entries = data.get("files", {})
+
+    def _stat(self, file_path:str)->list:
+        stat = os.stat(file_path)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def lookup(self, file_path:str)->dict:
+        """Returns the facts of the unchanged file, or an empty dict."""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self.entries.get(key)
+        if not entry:
+            return {}
+        try:
+            if entry["stat"] != self._stat(file_path):
+                return {}
+        except OSError:
+            return {}
+        return entry["facts"]
+
+    def update(self, file_path:str, **facts)->None:
+        key = os.path.abspath(file_path)
+        try:
+            stat = self._stat(file_path)
+        except OSError:
+            return
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry or entry["stat"] != stat:
+                entry = {"stat": stat, "facts": {}}
+                self.entries[key] = entry
+            entry["facts"].update(facts)
+            self._changed = True
+
+    def save(self)->None:
+        if not self.path or not self._changed:
+            return
+        with self._lock:
+            data = {"version": self.VERSION, "files": self.entries}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary_path = self.path + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temporary_path, self.path)
+            self._changed = False
@@ -0,0 +1,101 @@
+import re
+from code.helper.aho_corasick import AhoCorasick
+from code.helper.money import to_cents
+from code.model.transaction import Transaction
+
+class CategoryRules:
+    """
+    Assigns categories to transactions by the rules of the configuration:
+
+      categories:
+        - category: Groceries
+          partner: [REWE, EDEKA]      # substrings of the partner name or id
+        - category: Rent
+          description: Miete          # substrings of the description
+          max: 0                      # amount range, inclusive
+        - category: Salary
+          regex: "^Gehalt \\d{2}/\\d{4}"  # regular expression on the description
+          min: 0
+          institute: ing
+
+    A rule matches if all of its conditions match; any of several substrings
+    is enough. Substrings and regular expressions ignore the case. The first
+    matching rule decides the category.
+
+    The substrings of all rules are compiled into one automaton per field, so
+    every text is scanned once. Only the rules found by the scans and the
+    rules without substrings are checked further.
+    """
+    def __init__(self, rules:[dict]):
+        self.rules = [self._compile(rule) for rule in rules or []]
+        self.partner_automaton = AhoCorasick()
+        self.description_automaton = AhoCorasick()
+        self.unconditional = [] # Rules without substrings, checked for every transaction
+        for index, rule in enumerate(self.rules):
+            for pattern in rule["partner"]:
+                self.partner_automaton.add(pattern, index)
+            for pattern in rule["description"]:
+                self.description_automaton.add(pattern, index)
+            if not rule["partner"] and not rule["description"]:
+                self.unconditional.append(index)
+        self.partner_automaton.build()
+        self.description_automaton.build()
+        # Partners and descriptions repeat, so the scans are memoized
+        self._partner_matches = {}
+        self._description_matches = {}
+
+    def _getList(self, rule:dict, key:str)->[str]:
+        value = rule.get(key)
+        if value is None:
+            return []
+        values = value if isinstance(value, list) else [value]
+        return [str(value).lower() for value in values if str(value)]
+
+    def _compile(self, rule:dict)->dict:
+        if not rule.get("category"):
+            raise ValueError(f"Category rule without category: {rule}")
+        return {
+            "category":     str(rule["category"]),
+            "partner":      self._getList(rule, "partner"),
+            "description":  self._getList(rule, "description"),
+            "regex":        re.compile(rule["regex"], re.IGNORECASE) if rule.get("regex") else None,
+            "min":          to_cents(rule["min"]) if rule.get("min") is not None else None,
+            "max":          to_cents(rule["max"]) if rule.get("max") is not None else None,
+            "institutes":   self._getList(rule, "institute"),
+        }
+
+    def isEmpty(self)->bool:
+        return not self.rules
+
+    def _scan(self, automaton:AhoCorasick, matches:dict, text:str)->set:
+        if not automaton.patterns:
+            return set()
+        found = matches.get(text)
+        if found is None:
+            found = matches[text] = automaton.search(text.lower())
+        return found
+
+    def categorize(self, transaction:Transaction)->str:
+        """Returns the category of the first matching rule, or None."""
+        partner_text = f"{transaction.partner.name or ''}\n{transaction.partner.original_name or ''}\n{transaction.partner.id or ''}"
+        description = transaction.description or ""
+        partner_matches = self._scan(self.partner_automaton, self._partner_matches, partner_text)
+        description_matches = self._scan(self.description_automaton, self._description_matches, description)
+        candidates = partner_matches | description_matches
+        candidates.update(self.unconditional)
+        for index in sorted(candidates):
+            rule = self.rules[index]
+            if rule["partner"] and index not in partner_matches:
+                continue
+            if rule["description"] and index not in description_matches:
+                continue
+            if rule["regex"] and not rule["regex"].search(description):
+                continue
+            if rule["min"] is not None and transaction.value < rule["min"]:
+                continue
+            if rule["max"] is not None and transaction.value > rule["max"]:
+                continue
+            if rule["institutes"] and (transaction.owner.institute or "").lower() not in rule["institutes"]:
+                continue
+            return rule["category"]
+        return None
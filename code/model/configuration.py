@@ -1,4 +1,5 @@
 from datetime import date, datetime, time
+import sys
 import yaml
 
 class Configuration:
@@ -17,6 +18,20 @@ class Configuration:
         recursive:bool,
         from_date:date=None,
         to_date:date=None,
+        profile:bool=False,
+        watch:bool=False,
+        watch_interval:float=5.0,
+        page_workers:int=None,
+        cache_dir:str=None,
+        use_cache:bool=True,
+        selected_institutes:[str]=None,
+        export_layout:str=None,
+        aggregations:[[str]]=None,
+        summary_only:bool=False,
+        match_transfers:bool=False,
+        transfer_window:int=3,
+        normalize_partners:bool=False,
+        index:bool=False,
         ):
         self.configuration_file = configuration_file
         self.configuration_file_data = {}
@@ -31,8 +46,26 @@ class Configuration:
         self.validate=validate
         self.print_cmd=print_cmd
         self.recursive=recursive
+        self.profile=profile
+        self.watch=watch
+        self.watch_interval=watch_interval
+        self.page_workers=page_workers
+        self.cache_dir=cache_dir
+        self.use_cache=use_cache
+        self.selected_institutes=selected_institutes
+        self.export_layout=export_layout
+        self.aggregations=aggregations
+        self.summary_only=summary_only
+        self.match_transfers=match_transfers
+        self.transfer_window=transfer_window
+        self.normalize_partners=normalize_partners
+        self.index=index
         self._loadConfigurationFile()
         self.log = None # Placeholder - Log sets itself 
+        self.profiler = None # Placeholder - Profiler sets itself
+        self.catalog = None # Placeholder - Catalog of the run
+        self.timeline = None # Placeholder - BalanceTimeline of the run
+        self.search_index = None # Placeholder - SearchIndex of the run
         
     
     def setFromDate(self,from_date:str)->None:
@@ -45,7 +78,10 @@ class Configuration:
         return datetime.strptime(date_string, "%Y-%m-%d").date()
  
     def _loadConfigurationFile(self)->None:   
-        # Load YAML config
+        # Load YAML config; without a file every value has its default
+        if not self.configuration_file:
+            self.configuration_file_data = {}
+            return
         try:
             with open(self.configuration_file, "r", encoding="utf-8") as f:
                 self.configuration_file_data = yaml.safe_load(f)
@@ -74,6 +110,10 @@ class Configuration:
     def shouldValidate(self)->bool:
         return self.validate
 
+    def shouldKeepTimeline(self)->bool:
+        """The balance timeline is only read by the validation and the balances of the HTML export."""
+        return bool(self.validate) or "html" in (self.export_types or [])
+
     def shouldPrintCmd(self)->bool:
         return self.print_cmd
     
@@ -88,4 +128,63 @@ class Configuration:
         return datetime.combine(self._to_date, time(23, 59, 59)).replace(tzinfo=None)
     
     def shouldRecursiveScan(self)->bool:
-        return self.recursive
\ No newline at end of file
+        return self.recursive
+
+    def shouldProfile(self)->bool:
+        return self.profile
+
+    def shouldWatch(self)->bool:
+        return self.watch
+
+    def getWatchInterval(self)->float:
+        return self.watch_interval
+
+    def getCacheDir(self)->str:
+        """Directory of persisted caches; None, so nothing is persisted, unless it is given."""
+        if not self.use_cache:
+            return None
+        return self.cache_dir
+
+    def getSelectedInstitutes(self)->[str]:
+        """Lowercase institutes to load; None loads all."""
+        if not self.selected_institutes:
+            return None
+        return [institute.lower() for institute in self.selected_institutes]
+
+    def getExportLayout(self)->str:
+        """"single" writes one file per export type, "institute-year" and "institute-month" one per partition."""
+        return self.export_layout or "single"
+
+    def shouldMatchTransfers(self)->bool:
+        return self.match_transfers
+
+    def getTransferWindow(self)->int:
+        """Days the two bookings of a transfer may lie apart."""
+        return self.transfer_window
+
+    def getPartnerAliases(self)->dict:
+        """Spellings of every canonical partner name under "partners" in the configuration file, see PartnerNames."""
+        aliases = (self.configuration_file_data or {}).get("partners") or {}
+        return {str(canonical): [str(spelling) for spelling in (spellings if isinstance(spellings, list) else [spellings]) if spelling]
+                for canonical, spellings in aliases.items()}
+
+    def shouldNormalizePartners(self)->bool:
+        return self.normalize_partners or bool(self.getPartnerAliases())
+
+    def shouldIndex(self)->bool:
+        return self.index
+
+    def getCategoryRules(self)->[dict]:
+        """Rules under "categories" in the configuration file, see CategoryRules."""
+        return (self.configuration_file_data or {}).get("categories") or []
+
+    def getAggregations(self)->[[str]]:
+        """Dimensions of every summary, e.g. [["month"], ["institute", "month"]]."""
+        return self.aggregations or []
+
+    def shouldOnlySummarize(self)->bool:
+        return self.summary_only
+
+    def getPageWorkers(self)->int:
+        """Processes per large PDF; defaults to 1, as the files are already loaded in parallel."""
+        return self.page_workers or 1
\ No newline at end of file
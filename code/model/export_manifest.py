@@ -0,0 +1,60 @@
+import json
+import os
+
+class ExportManifest:
+    """
+    Index of a partitioned export, written as manifest.json into the export
+    directory. Every partition lists its institute, period, the digest of its
+    rows and the files written for it, relative to the export directory.
+
+    The digests of the previous run decide which partitions are unchanged
+    and therefore not written again.
+    """
+    FILE_NAME = "manifest.json"
+    VERSION = 1
+
+    def __init__(self, directory:str, layout:str):
+        self.directory = directory
+        self.layout = layout
+        self.path = os.path.join(directory, self.FILE_NAME)
+        self.partitions = {}
+
+    @classmethod
+    def load(cls, directory:str)->"ExportManifest":
+        """Returns the manifest of the previous run, or None if there is none."""
+        try:
+            with open(os.path.join(directory, cls.FILE_NAME), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.VERSION:
+            return None
+        manifest = cls(directory, data.get("layout"))
+        manifest.partitions = {partition["key"]: partition for partition in data.get("partitions", [])}
+        return manifest
+
+    def getPartition(self, key:str)->dict:
+        return self.partitions.get(key) or {}
+
+    def setPartition(self, partition:dict)->None:
+        self.partitions[partition["key"]] = partition
+
+    def getFiles(self)->set:
+        """Returns the absolute paths of all files listed in the manifest."""
+        return {os.path.join(self.directory, file_name)
+                for partition in self.partitions.values()
+                for file_name in partition.get("files", {}).values()}
+
+    def getDictionary(self)->dict:
+        return {
+            "version":      self.VERSION,
+            "layout":       self.layout,
+            "partitions":   [self.partitions[key] for key in sorted(self.partitions)],
+        }
+
+    def save(self)->None:
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(self.getDictionary(), f, indent=2, ensure_ascii=False)
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import math
+import os
+import re
+import unicodedata
+from code.model.configuration import Configuration
+
+# Legal forms and parts of web addresses
+IGNORED_WORDS = {"gmbh", "mbh", "ag", "se", "kg", "kgaa", "ohg", "ug", "ev", "co", "cie", "et",
+                 "ltd", "limited", "inc", "llc", "plc", "sarl", "sa", "rl", "sca", "bv", "nv",
+                 "www", "com", "de", "net", "org", "eu"}
+TRANSLITERATIONS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+
+def get_tokens(name:str)->[str]:
+    """
+    Returns the words of a partner name which identify it: without case,
+    accents, legal forms, web address parts and numbers such as store or
+    terminal ids. CamelCase words are split, so "GooglePay" gives the same
+    words as "Google Pay", and abbreviations like "S.C.A." are joined.
+    """
+    name = re.sub(r"(?<=[a-z])(?=[A-Z][a-z])", " ", name or "").casefold().translate(TRANSLITERATIONS)
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(character for character in name if not unicodedata.combining(character))
+    name = re.sub(r"(?<![^\W_])([^\W_])\.", r"\1", name)
+    words = re.findall(r"[^\W_]+", name)
+    tokens = [word for word in words if word not in IGNORED_WORDS and not word.isdigit()]
+    return tokens or words
+
+def get_trigrams(key:str)->set:
+    padded = f"#{key}#"
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+class PartnerNames:
+    """
+    Resolves the spellings of a partner to one canonical name.
+
+    The alias table under "partners" in the configuration maps canonical
+    names to their spellings:
+
+      partners:
+        Google: [Google Pay, "GOOGLE *YouTube"]
+        REWE: REWE Markt GmbH
+
+    Spellings are merged if they have the same words (see get_tokens) or
+    are aliases of the same name; a name without match becomes a canonical
+    name itself. Similar names are never merged automatically, as "Hanna
+    Mueller" and "Anna Mueller" are different people. Known names with the
+    same number of words whose trigrams reach a Dice coefficient of
+    SIMILARITY are collected as suggestions for the alias table instead.
+    Their candidates come from a blocking index of the trigram postings,
+    so names are never compared pairwise.
+
+    Resolved names are memoized and persisted in the cache directory;
+    the memo is dropped when the alias table changes.
+    """
+    FILE_NAME = "partners.json"
+    VERSION = 2
+    SIMILARITY = 0.8
+
+    def __init__(self, configuration:Configuration):
+        self.configuration = configuration
+        self.aliases = configuration.getPartnerAliases()
+        self.digest = hashlib.sha256(json.dumps(self.aliases, sort_keys=True).encode()).hexdigest()
+        self.names = {}         # Memo of resolved names
+        self.canonicals = []    # (name, key, tokens, trigrams)
+        self.keys = {}          # Key of every canonical name and alias -> canonical name
+        self.postings = {}      # Trigram -> positions of the canonical names
+        self.suggestions = []   # (name, similar canonical name) found in this run
+        self._changed = False
+        for canonical, spellings in self.aliases.items():
+            self._addCanonical(canonical)
+            for spelling in spellings:
+                self.keys.setdefault("".join(get_tokens(spelling)), canonical)
+        self.path = None
+        cache_dir = configuration.getCacheDir()
+        if cache_dir:
+            self.path = os.path.join(cache_dir, self.FILE_NAME)
+            self._load()
+
+    def _load(self)->None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.VERSION or data.get("aliases") != self.digest:
+            return
+        self.names = data.get("names", {})
+        for canonical in self.names.values():
+            if "".join(get_tokens(canonical)) not in self.keys:
+                self._addCanonical(canonical)
+
+    def _addCanonical(self, name:str)->None:
+        tokens = get_tokens(name)
+        key = "".join(tokens)
+        if key in self.keys:
+            return
+        position = len(self.canonicals)
+        trigrams = get_trigrams(key)
+        self.canonicals.append((name, key, tokens, trigrams))
+        self.keys[key] = name
+        for trigram in trigrams:
+            self.postings.setdefault(trigram, []).append(position)
+
+    def _findSimilar(self, tokens:[str], key:str)->str:
+        """Returns the most similar known canonical name, or None."""
+        trigrams = get_trigrams(key)
+        # Only names sharing enough trigrams can reach the similarity
+        counts = {}
+        for trigram in trigrams:
+            for position in self.postings.get(trigram, []):
+                counts[position] = counts.get(position, 0) + 1
+        minimum = math.ceil(self.SIMILARITY * len(trigrams) / (2 - self.SIMILARITY))
+        best, best_score = None, self.SIMILARITY
+        for position in sorted(position for position, count in counts.items() if count >= minimum):
+            _, _, other_tokens, other_trigrams = self.canonicals[position]
+            if len(other_tokens) != len(tokens):
+                continue
+            score = 2 * len(trigrams & other_trigrams) / (len(trigrams) + len(other_trigrams))
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = position, score
+        return self.canonicals[best][0] if best is not None else None
+
+    def resolve(self, name:str)->str:
+        """Returns the canonical name of the spelling."""
+        if not name:
+            return name
+        canonical = self.names.get(name)
+        if canonical is None:
+            tokens = get_tokens(name)
+            key = "".join(tokens)
+            canonical = self.keys.get(key)
+            if canonical is None:
+                similar = self._findSimilar(tokens, key)
+                if similar:
+                    self.suggestions.append((name, similar))
+                canonical = " ".join(name.split())
+                self._addCanonical(canonical)
+            self.names[name] = canonical
+            self._changed = True
+        return canonical
+
+    def save(self)->None:
+        if not self.path or not self._changed:
+            return
+        data = {"version": self.VERSION, "aliases": self.digest, "names": self.names}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temporary_path, self.path)
+        self._changed = False
@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from code.model.configuration import Configuration
+
+class Profiler:
+    """
+    Collects wall time, CPU time and item counts per pipeline stage
+    and the timings of every extracted file.
+    """
+    def __init__(self, configuration:Configuration):
+        self.configuration = configuration
+        self.configuration.profiler = self
+        self.stages = []
+        self.files = []
+        self._lock = threading.Lock()
+
+    def isEnabled(self)->bool:
+        return self.configuration.shouldProfile()
+
+    @contextmanager
+    def stage(self, name:str):
+        """
+        Times the wrapped block. The yielded record can receive the item count:
+
+            with profiler.stage("load") as record:
+                record["items"] = len(transactions)
+        """
+        record = {"stage": name, "items": None}
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - start_wall
+            record["cpu_seconds"] = time.process_time() - start_cpu
+            with self._lock:
+                self.stages.append(record)
+
+    def addFile(self, file_path:str, extractor:str, detect_seconds:float, pdf_text_seconds:float, parse_seconds:float, cpu_seconds:float, transactions:int)->None:
+        with self._lock:
+            self.files.append({
+                "file": file_path,
+                "extractor": extractor,
+                "detect_seconds": detect_seconds,
+                "pdf_text_seconds": pdf_text_seconds,
+                "parse_seconds": parse_seconds,
+                "cpu_seconds": cpu_seconds,
+                "transactions": transactions,
+            })
+
+    def getReport(self)->dict:
+        return {
+            "stages": self.stages,
+            "files": sorted(self.files, key=lambda file: file["detect_seconds"] + file["pdf_text_seconds"] + file["parse_seconds"], reverse=True),
+        }
+
+    def printSummary(self, slowest_files:int=10)->None:
+        print(f"{'Stage':<12} {'Wall (s)':>10} {'CPU (s)':>10} {'Items':>8}")
+        for stage in self.stages:
+            items = "" if stage["items"] is None else stage["items"]
+            print(f"{stage['stage']:<12} {stage['wall_seconds']:>10.3f} {stage['cpu_seconds']:>10.3f} {items:>8}")
+        files = self.getReport()["files"][:slowest_files]
+        if files:
+            print()
+            print(f"{'Detect (s)':>10} {'PDF (s)':>10} {'Parse (s)':>10} {'Trans.':>8}  {'Extractor':<22} File")
+            for file in files:
+                print(f"{file['detect_seconds']:>10.3f} {file['pdf_text_seconds']:>10.3f} {file['parse_seconds']:>10.3f} "
+                      f"{file['transactions']:>8}  {str(file['extractor']):<22} {file['file']}")
+
+    def writeReport(self, path:str)->None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.getReport(), f, indent=2)
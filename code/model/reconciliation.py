@@ -0,0 +1,41 @@
+from code.helper.money import format_cents, cents_to_float
+
+class Reconciliation:
+    """
+    Result of checking one statement file against the balances it prints:
+    the opening balance plus the sum of the extracted bookings has to give
+    the closing balance. All amounts are integer cents.
+    """
+    def __init__(self, source:str, opening_balance:int=None, closing_balance:int=None, total:int=0, transactions:int=0):
+        self.source             = source            # File the balances were read from
+        self.opening_balance    = opening_balance   # Balance printed before the first booking
+        self.closing_balance    = closing_balance   # Balance printed after the last booking
+        self.total              = total             # Sum of the extracted bookings
+        self.transactions       = transactions      # Number of the extracted bookings
+
+    def isChecked(self)->bool:
+        """Returns False if the statement doesn't print both balances."""
+        return self.opening_balance is not None and self.closing_balance is not None
+
+    def getDifference(self)->int:
+        return self.opening_balance + self.total - self.closing_balance
+
+    def isBalanced(self)->bool:
+        return self.isChecked() and self.getDifference() == 0
+
+    def getDictionary(self)->dict:
+        return {
+            "source":           self.source,
+            "opening_balance":  cents_to_float(self.opening_balance),
+            "closing_balance":  cents_to_float(self.closing_balance),
+            "total":            cents_to_float(self.total),
+            "transactions":     self.transactions,
+            "balanced":         self.isBalanced() if self.isChecked() else None,
+        }
+
+    def __str__(self)->str:
+        if not self.isChecked():
+            return f"{self.source}: no opening and closing balance printed, {self.transactions} transactions not reconciled."
+        return (f"{self.source}: {format_cents(self.opening_balance)} + {format_cents(self.total)} "
+                f"({self.transactions} transactions) = {format_cents(self.opening_balance + self.total)}, "
+                f"closing balance {format_cents(self.closing_balance)}, difference {format_cents(self.getDifference())}.")
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+import sqlite3
+from code.model.configuration import Configuration
+
+class SearchIndex:
+    """
+    Full text index over the descriptions, partners and references of all
+    loaded transactions, kept in an SQLite database in the cache directory.
+
+    The rows are stored per source file together with its size and
+    modification time, so a run only indexes new or changed files. The
+    text columns are indexed by an FTS5 table and the matches are ranked
+    by bm25, with partners and references weighing more than descriptions.
+    """
+    FILE_NAME = "search.sqlite"
+    VERSION = 1
+    COLUMNS = ["partner", "description", "reference"]
+    WEIGHTS = [2.0, 1.0, 4.0]
+
+    def __init__(self, configuration:Configuration):
+        self.configuration = configuration
+        self.path = None
+        self.connection = None
+        cache_dir = configuration.getCacheDir()
+        if cache_dir:
+            self.path = os.path.join(cache_dir, self.FILE_NAME)
+
+    def _connect(self)->sqlite3.Connection:
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path)
+            if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+                self._create()
+        return self.connection
+
+    def _create(self)->None:
+        columns = ", ".join(self.COLUMNS)
+        with self.connection:
+            self.connection.executescript(f"""
+                DROP TABLE IF EXISTS entries_text;
+                DROP TABLE IF EXISTS entries;
+                DROP TABLE IF EXISTS sources;
+                CREATE TABLE sources (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+                CREATE TABLE entries (rowid INTEGER PRIMARY KEY, source TEXT, date TEXT, institute TEXT, {columns}, data TEXT);
+                CREATE INDEX entries_source ON entries (source);
+                CREATE VIRTUAL TABLE entries_text USING fts5({columns}, content='entries', content_rowid='rowid',
+                                                             tokenize='unicode61 remove_diacritics 2');
+                PRAGMA user_version = {self.VERSION};
+            """)
+
+    def close(self)->None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def getSources(self)->dict:
+        """Returns the indexed files with their [mtime_ns, size]."""
+        return {path: [mtime_ns, size] for path, mtime_ns, size in self._connect().execute("SELECT path, mtime_ns, size FROM sources")}
+
+    def removeSource(self, path:str)->None:
+        columns = ", ".join(self.COLUMNS)
+        connection = self._connect()
+        with connection:
+            # External content tables are told about deleted rows with their old values
+            connection.execute(f"INSERT INTO entries_text (entries_text, rowid, {columns}) "
+                               f"SELECT 'delete', rowid, {columns} FROM entries WHERE source = ?", (path,))
+            connection.execute("DELETE FROM entries WHERE source = ?", (path,))
+            connection.execute("DELETE FROM sources WHERE path = ?", (path,))
+
+    def addSource(self, path:str, stat:list, rows:[dict])->None:
+        """Replaces the rows of the file; rows are flat dictionaries as produced by Transaction.getDictionary()."""
+        self.removeSource(path)
+        columns = ", ".join(self.COLUMNS)
+        entries = [(path, row["date"], row.get("owner_institute"),
+                    " ".join(str(row.get(key)) for key in ("partner_name", "partner_id") if row.get(key)),
+                    row.get("description") or "",
+                    " ".join(str(row.get(key)) for key in ("invoice_id", "invoice_mandate_reference", "invoice_customer_reference", "invoice_creditor_id") if row.get(key)),
+                    json.dumps(row, default=str))
+                   for row in rows]
+        connection = self._connect()
+        with connection:
+            connection.execute("INSERT INTO sources (path, mtime_ns, size) VALUES (?, ?, ?)", (path, *stat))
+            cursor = connection.execute("SELECT COALESCE(MAX(rowid), 0) FROM entries")
+            first = cursor.fetchone()[0] + 1
+            connection.executemany(f"INSERT INTO entries (rowid, source, date, institute, {columns}, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   [(first + position, *entry) for position, entry in enumerate(entries)])
+            connection.execute(f"INSERT INTO entries_text (rowid, {columns}) "
+                               f"SELECT rowid, {columns} FROM entries WHERE rowid >= ?", (first,))
+
+    def _getMatchExpression(self, text:str)->str:
+        """
+        Turns the search text into an FTS5 expression: every word has to
+        occur, words ending with * are prefixes, and words such as invoice
+        numbers are searched as phrases of their parts.
+        """
+        terms = []
+        for word in text.split():
+            prefix = word.endswith("*")
+            word = word.rstrip("*")
+            if not re.search(r"\w", word):
+                continue
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+        return " ".join(terms)
+
+    def search(self, text:str, from_date:str=None, to_date:str=None, institute:str=None, limit:int=20)->[dict]:
+        """Returns the best matching rows, each with its bm25 score; lower scores rank higher."""
+        expression = self._getMatchExpression(text)
+        if not expression or not self.path or not os.path.exists(self.path):
+            return []
+        conditions = ["entries_text MATCH ?"]
+        parameters = [expression]
+        if from_date:
+            conditions.append("entries.date >= ?")
+            parameters.append(from_date)
+        if to_date:
+            conditions.append("entries.date <= ?")
+            parameters.append(to_date)
+        if institute:
+            conditions.append("LOWER(entries.institute) = ?")
+            parameters.append(institute.lower())
+        weights = ", ".join(str(weight) for weight in self.WEIGHTS)
+        query = (f"SELECT entries.data, bm25(entries_text, {weights}) AS score FROM entries_text "
+                 f"JOIN entries ON entries.rowid = entries_text.rowid WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY score, entries.date DESC LIMIT ?")
+        results = []
+        for data, score in self._connect().execute(query, (*parameters, limit)):
+            row = json.loads(data)
+            row["score"] = round(score, 4)
+            results.append(row)
+        return results
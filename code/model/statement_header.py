@@ -0,0 +1,61 @@
+from datetime import date
+
+class StatementHeader:
+    """
+    Metadata printed in the header of a statement.
+    Every field is None if the header doesn't contain it.
+    """
+    def __init__(self,
+                 iban:str=None,
+                 holder:str=None,
+                 currency:str=None,
+                 period_start:date=None,
+                 period_end:date=None,
+                 statement_date:date=None,
+                 opening_balance:int=None,
+                 closing_balance:int=None
+                 ):
+        self.iban               = iban              # IBAN of the statement account
+        self.holder             = holder            # Account holder like Max Mustermann
+        self.currency           = currency          # Currency of the account like EUR
+        self.period_start       = period_start      # First day covered by the statement
+        self.period_end         = period_end        # Last day covered by the statement
+        self.statement_date     = statement_date    # Date on which the statement was issued
+        self.opening_balance    = opening_balance   # Balance before the first booking in cents
+        self.closing_balance    = closing_balance   # Balance after the last booking in cents
+
+    def getPeriod(self)->tuple:
+        """Returns the (first day, last day) of the statement or None."""
+        if self.period_start and self.period_end:
+            return self.period_start, self.period_end
+        return None
+
+    def getDictionary(self)->dict:
+        return {
+            "iban":             self.iban,
+            "holder":           self.holder,
+            "currency":         self.currency,
+            "period_start":     self.period_start and self.period_start.isoformat(),
+            "period_end":       self.period_end and self.period_end.isoformat(),
+            "statement_date":   self.statement_date and self.statement_date.isoformat(),
+            "opening_balance":  self.opening_balance,
+            "closing_balance":  self.closing_balance,
+        }
+
+    @classmethod
+    def fromDictionary(cls, data:dict)->"StatementHeader":
+        def _date(value):
+            return date.fromisoformat(value) if value else None
+        return cls(
+            iban=data.get("iban"),
+            holder=data.get("holder"),
+            currency=data.get("currency"),
+            period_start=_date(data.get("period_start")),
+            period_end=_date(data.get("period_end")),
+            statement_date=_date(data.get("statement_date")),
+            opening_balance=data.get("opening_balance"),
+            closing_balance=data.get("closing_balance"),
+        )
+
+    def __str__(self):
+        return str(self.getDictionary())
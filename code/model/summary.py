@@ -0,0 +1,30 @@
+class Summary:
+    """
+    Aggregated table of the transactions grouped by some dimensions, for
+    example ["institute", "month"]. Every row holds the values of the
+    dimensions and the currency, followed by count, sum, min and max. Tables
+    grouped by a year or month also hold the running balance, which adds up
+    the sums in time order per group of the other dimensions.
+    """
+    def __init__(self, dimensions:[str], rows:[dict]=None):
+        self.dimensions = dimensions
+        self.rows = rows if rows is not None else []
+
+    def getName(self)->str:
+        return "-".join(self.dimensions)
+
+    def getRows(self)->[dict]:
+        return self.rows
+
+    def getDictionary(self)->dict:
+        return {
+            "dimensions":   self.dimensions,
+            "rows":         self.rows,
+        }
+
+    @classmethod
+    def fromDictionary(cls, data:dict)->"Summary":
+        return cls(data["dimensions"], data["rows"])
+
+    def __str__(self)->str:
+        return f"Summary by {', '.join(self.dimensions)}: {len(self.rows)} rows"
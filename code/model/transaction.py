@@ -4,6 +4,7 @@ from code.model.log import Log
 from datetime import datetime
 from code.model.account import Account, OwnerAccount
 from .invoice import Invoice
+from code.helper.money import to_cents, cents_to_float
 from datetime import date, datetime,time 
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -21,19 +22,21 @@ class Transaction:
                  ):
         self.log                 = log
         self.description            = ""                                # Optional
-        self.value                  = None                              # Needs to be defined type integer
+        self.value                  = None                              # Obligatoric: Amount in integer cents
         self.owner                  = owner or OwnerAccount(self.log)   # Owner of this transaction
         self.partner                = partner or Account(self.log)      # Optional: The transaction partner
         self.source                 = source                            # Obligatoric: File in which the transaction was found
         self.currency               = None                              # Obligatoric    
-        self.invoice                = invoice or Invoice(self.log)      # Optional: The linked invoice
+        self.invoice                = invoice or Invoice()              # Optional: The linked invoice
         self.date                   = date                              # Obligatoric: The date when the transaction was done
         self.id                     = None                              # Obligatoric: The unique identifier of the transaction
         self.related_transaction_id = None                              # Optional: ID of the related transaction
+        self.transfer_id            = None                              # Optional: Shared by both bookings of a transfer between own accounts
         self.valuta_date            = None                              # Optional: Date when the booking was ordered
         self.type                   = None
         self.medium                 = None
         self.posting_number         = None
+        self.category               = None                              # Optional: Set by the category rules
     
     def _getDate(self,date_string:str)->date:
         self.log.debug(f"Attempting to parse date: '{date_string}'")
@@ -131,12 +134,13 @@ class Transaction:
         return None;
     
     def setValue(self,value):
-        self.value = float(value)
+        """Sets the amount given in currency units, e.g. "-12.34", as cents."""
+        self.value = to_cents(value)
     
     def isValid(self):
         # Dictionary with variable names as keys and expected types as values
         validations = {
-            "value":        float,          # value needs to be of type float
+            "value":        int,            # value needs to be of type int (cents)
             "owner":        OwnerAccount,   # Owner account
             "partner":      Account,        # The partner account
             "source":       str,            # source should be a string (file path)
@@ -197,7 +201,7 @@ class Transaction:
         dictionary = {
             "id":                       self.id,
             "date":                     self.date.strftime("%Y-%m-%d"),
-            "value":                    self.value,
+            "value":                    cents_to_float(self.value),
             "currency":                 self.currency,
             "sender":                   self.getSender() and self.getSender().getIdentity(),
             "receiver":                 self.getReceiver() and self.getReceiver().getIdentity(),
@@ -208,10 +212,13 @@ class Transaction:
             "medium":                   self.medium,
             "type":                     self.type,
             "related_transaction_id":   self.related_transaction_id,
+            "transfer_id":              self.transfer_id,
             "posting_number":           self.posting_number,
+            "category":                 self.category,
         }
         for key, value in self.partner.getDictionary().items():
             dictionary["partner_" + key]  = value        
+        dictionary["partner_original_name"] = self.partner.original_name
         
         for key, value in self.owner.getDictionary().items():
             dictionary["owner_" + key]  = value
@@ -1,22 +1,45 @@
 from code.model.log import Log
 from code.model.transaction import Transaction
+from code.model.reconciliation import Reconciliation
+from code.model.summary import Summary
 from typing import List
 from code.helper.datetime import createComparatableTime
 
 class TransactionsWrapper:
-    def __init__(self, log: Log, transactions: [Transaction] = []):
+    def __init__(self, log: Log, transactions: [Transaction] = None, reconciliations: [Reconciliation] = None):
         self.log = log 
         # Initialize the list of transactions.
-        # If no transactions are provided, use an empty list.
-        self.transactions = transactions
+        # If no transactions are provided, use a new empty list.
+        # A shared default list would leak transactions between wrappers.
+        self.transactions = transactions if transactions is not None else []
+        # Balance checks of the loaded files, passed on by every stage
+        self.reconciliations = reconciliations if reconciliations is not None else []
+        # Aggregated tables of the AggregationProcessor
+        self.summaries = []
+        # Avoids resorting when several stages request the date order
+        self._sorted_by_date = False
 
     def appendTransaction(self, transaction: Transaction)->None:
         # Add the given transaction to the list.
         self.transactions.append(transaction)
+        self._sorted_by_date = False
         
     def extendTransactions(self, transactions:[Transaction])->None:
         # Add the given transactions to the list.
         self.transactions.extend(transactions)
+        self._sorted_by_date = False
+
+    def addReconciliation(self, reconciliation: Reconciliation)->None:
+        self.reconciliations.append(reconciliation)
+
+    def getReconciliations(self)-> List[Reconciliation]:
+        return self.reconciliations
+
+    def addSummary(self, summary: Summary)->None:
+        self.summaries.append(summary)
+
+    def getSummaries(self)-> List[Summary]:
+        return self.summaries
 
     def getAll(self)-> List[Transaction]:
         # Return all transactions.
@@ -42,10 +65,14 @@ class TransactionsWrapper:
             return self._sort_key(transaction, attribute)
         
         self.transactions.sort(key=sort_key)
+        self._sorted_by_date = False
         
     def sortByDate(self):
+        if self._sorted_by_date:
+            return
         # Sorting the transactions by date, using the normalization method
         self.transactions = sorted(
             self.transactions, 
             key=lambda transaction: transaction.getTransactionDatetime()
         )
+        self._sorted_by_date = True
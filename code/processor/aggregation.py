@@ -0,0 +1,145 @@
+from .abstract import AbstractProcessor
+from .load import LoadProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.model.summary import Summary
+from code.helper.money import cents_to_float
+import hashlib
+import json
+import os
+
+class AggregationProcessor(AbstractProcessor):
+    """
+    Groups the filtered transactions by the configured dimensions and adds
+    a Summary with count, sum, min and max per group to the transactions
+    wrapper. All summaries are built in one pass with one dictionary of
+    accumulators per summary.
+
+    The summaries are persisted in the cache directory together with a key
+    of the input files (path, modification time and size), the date range,
+    the selected institutes, the category rules and the dimensions. As long as the key matches,
+    the cached summaries are used instead.
+    """
+    FILE_NAME = "summaries.json"
+    VERSION = 1
+
+    # Value of a dimension per transaction
+    DIMENSIONS = {
+        "year":         lambda transaction: transaction.date.strftime("%Y"),
+        "month":        lambda transaction: transaction.date.strftime("%Y-%m"),
+        "institute":    lambda transaction: (transaction.owner.institute or "unknown").lower(),
+        "partner":      lambda transaction: transaction.partner.name or transaction.partner.id or "",
+        "type":         lambda transaction: transaction.type or "",
+        "category":     lambda transaction: transaction.category or "",
+    }
+    # Dimensions along which the running balance adds up
+    TIME_DIMENSIONS = ["year", "month"]
+
+    def _getCacheFile(self)->str:
+        cache_dir = self.configuration.getCacheDir()
+        return os.path.join(cache_dir, self.FILE_NAME) if cache_dir else None
+
+    def getInputKey(self)->str:
+        """Digest of the input manifest: the discovered files with their size and modification time, and the options."""
+        files = []
+        for file_path in LoadProcessor(self.log, self.configuration).discover():
+            stat = os.stat(file_path)
+            files.append([os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size])
+        from_datetime = self.configuration.getFromDatetime()
+        to_datetime = self.configuration.getToDatetime()
+        manifest = {
+            "version":      self.VERSION,
+            "files":        sorted(files),
+            "from":         from_datetime.isoformat() if from_datetime else None,
+            "to":           to_datetime.isoformat() if to_datetime else None,
+            "institutes":   self.configuration.getSelectedInstitutes(),
+            "aggregations": self.configuration.getAggregations(),
+            "categories":   self.configuration.getCategoryRules(),
+            "partners":     self.configuration.getPartnerAliases() if self.configuration.shouldNormalizePartners() else None,
+        }
+        return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
+
+    def lookup(self, key:str)->[Summary]:
+        """Returns the cached summaries of the key, or None."""
+        cache_file = self._getCacheFile()
+        if not cache_file:
+            return None
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key:
+            return None
+        return [Summary.fromDictionary(summary) for summary in data["summaries"]]
+
+    def _store(self, key:str, summaries:[Summary])->None:
+        cache_file = self._getCacheFile()
+        if not cache_file:
+            return
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temporary_path = cache_file + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "summaries": [summary.getDictionary() for summary in summaries]}, f)
+        os.replace(temporary_path, cache_file)
+
+    def aggregate(self, aggregations:[[str]])->[Summary]:
+        """Returns one Summary per list of dimensions."""
+        used_dimensions = sorted({dimension for dimensions in aggregations for dimension in dimensions})
+        # Accumulators [count, sum, min, max] in cents per group key
+        groups = [{} for _ in aggregations]
+        for transaction in self.transactions_wrapper.getAll():
+            values = {dimension: self.DIMENSIONS[dimension](transaction) for dimension in used_dimensions}
+            value = transaction.value
+            for dimensions, accumulators in zip(aggregations, groups):
+                key = tuple(values[dimension] for dimension in dimensions) + (transaction.currency or "",)
+                accumulator = accumulators.get(key)
+                if accumulator is None:
+                    accumulators[key] = [1, value, value, value]
+                    continue
+                accumulator[0] += 1
+                accumulator[1] += value
+                if value < accumulator[2]:
+                    accumulator[2] = value
+                elif value > accumulator[3]:
+                    accumulator[3] = value
+        return [self._getSummary(dimensions, accumulators) for dimensions, accumulators in zip(aggregations, groups)]
+
+    def _getSummary(self, dimensions:[str], accumulators:dict)->Summary:
+        time_positions = [position for position, dimension in enumerate(dimensions) if dimension in self.TIME_DIMENSIONS]
+        rows = []
+        running_balances = {}
+        # Sorted by the other dimensions first, so every running balance adds up in time order
+        def sort_key(key:tuple):
+            other = tuple(part for position, part in enumerate(key) if position not in time_positions)
+            return other + tuple(key[position] for position in time_positions)
+        for key in sorted(accumulators, key=sort_key):
+            count, total, minimum, maximum = accumulators[key]
+            row = dict(zip(dimensions + ["currency"], key))
+            row.update({
+                "count":    count,
+                "sum":      cents_to_float(total),
+                "min":      cents_to_float(minimum),
+                "max":      cents_to_float(maximum),
+            })
+            if time_positions:
+                group = tuple(part for position, part in enumerate(key) if position not in time_positions)
+                running_balances[group] = running_balances.get(group, 0) + total
+                row["running_balance"] = cents_to_float(running_balances[group])
+            rows.append(row)
+        return Summary(dimensions, rows)
+
+    def process(self)->TransactionsWrapper:
+        aggregations = self.configuration.getAggregations()
+        if not aggregations:
+            return self.transactions_wrapper
+        key = self.getInputKey()
+        summaries = self.lookup(key)
+        if summaries is None:
+            summaries = self.aggregate(aggregations)
+            self._store(key, summaries)
+        else:
+            self.log.debug("Using the cached summaries.")
+        for summary in summaries:
+            self.transactions_wrapper.addSummary(summary)
+            self.log.debug(str(summary))
+        return self.transactions_wrapper
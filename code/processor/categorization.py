@@ -0,0 +1,22 @@
+from .abstract import AbstractProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.model.category_rules import CategoryRules
+import re
+
+class CategorizationProcessor(AbstractProcessor):
+    """Sets the category of every transaction by the rules under "categories" in the configuration."""
+    def process(self)->TransactionsWrapper:
+        try:
+            category_rules = CategoryRules(self.configuration.getCategoryRules())
+        except (ValueError, TypeError, re.error) as e:
+            self.log.error(f"Invalid category rules: {e}")
+            return self.transactions_wrapper
+        if category_rules.isEmpty():
+            return self.transactions_wrapper
+        categorized = 0
+        for transaction in self.transactions_wrapper.getAll():
+            transaction.category = category_rules.categorize(transaction)
+            if transaction.category:
+                categorized += 1
+        self.log.info(f"Categorized {categorized} of {len(self.transactions_wrapper.getAll())} transactions.")
+        return self.transactions_wrapper
@@ -2,23 +2,212 @@ from .abstract import AbstractProcessor
 from code.model.log import Log
 from code.model.transactions_wrapper import TransactionsWrapper
 from code.model.configuration import Configuration
+from code.model.export_manifest import ExportManifest
+from code.helper.money import cents_to_float
+import concurrent.futures
+import hashlib
 import importlib
+import json
 import os
+import time
 
 class ExportProcessor(AbstractProcessor):
+    """
+    Writes the transactions in every configured export type.
+
+    The "single" layout writes one file per type. The partitioned layouts
+    write one file per type and (institute, year) or (institute, month) into
+    the directory <output_base>, next to a manifest.json which indexes the
+    partitions. A partition is only written again if its rows changed since
+    the previous export, if one of its files is missing, or if one of its
+    exports failed.
+
+    The summaries of the AggregationProcessor are written next to them in
+    the tabular export types.
+    """
+    # strftime format of the period of a partition per layout
+    PARTITION_PERIODS = {
+        "institute-year":   "%Y",
+        "institute-month":  "%Y-%m",
+    }
+    # The console prints everything at once and has no files to partition
+    UNPARTITIONED_TYPES = ["console"]
+    # Export types which can hold the summary tables
+    SUMMARY_TYPES = ["csv", "json", "yaml"]
+    MAX_WORKERS = 8
+
+    def _getOutputFile(self, export_type:str)->str:
+        ext = f".{export_type}"
+        output_file = self.configuration.getOutputBase()
+        if not output_file.endswith(ext):
+            output_file += ext
+        if self.configuration.shouldCreateDirs():
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        return output_file
+
+    def _getSummaryFile(self, summary, export_type:str)->str:
+        """<output_base>.summary-<dimensions>.<type>, or summary-<dimensions>.<type> in the directory of a partitioned export."""
+        output_base = self.configuration.getOutputBase()
+        if self.configuration.getExportLayout() in self.PARTITION_PERIODS:
+            os.makedirs(output_base, exist_ok=True)
+            return os.path.join(output_base, f"summary-{summary.getName()}.{export_type}")
+        if self.configuration.shouldCreateDirs():
+            os.makedirs(os.path.dirname(os.path.abspath(output_base)), exist_ok=True)
+        return f"{output_base}.summary-{summary.getName()}.{export_type}"
+
+    def _getExporterClass(self, export_type:str):
+        module = importlib.import_module(f"code.exporter.{export_type}", package=__package__)
+        class_name = export_type.capitalize() + "Exporter"
+        return getattr(module, class_name)
+
+    def _export(self, exporter_class, output_file:str, rows:[dict], transactions_wrapper:TransactionsWrapper)->tuple:
+        """Runs a single exporter and returns the time it took in seconds and whether it succeeded."""
+        start = time.perf_counter()
+        exporter = exporter_class(transactions_wrapper, self.configuration, self.log, output_file, rows)
+        exporter.export()
+        return time.perf_counter() - start, not exporter.failed
+
+    def _getPartitionKey(self, transaction)->str:
+        institute = (transaction.owner.institute or "unknown").lower()
+        return f"{institute}/{transaction.date.strftime(self.PARTITION_PERIODS[self.configuration.getExportLayout()])}"
+
+    def _getDigest(self, rows:[dict])->str:
+        """Digest of the partition rows. Generated ids differ between runs, so they are left out."""
+        digest = hashlib.sha256()
+        for row in rows:
+            digest.update(json.dumps({key: value for key, value in row.items() if key != "id"},
+                                     sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _runExports(self, jobs:list)->tuple:
+        """
+        Runs the (export_type, output_file, transactions_wrapper, rows) jobs
+        concurrently, as the writers are mostly I/O bound. Returns the seconds
+        spent per export type and the output files of the failed exports.
+        """
+        timings = {}
+        failed_files = set()
+        if not jobs:
+            return timings, failed_files
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(jobs), self.MAX_WORKERS)) as executor:
+            futures = {}
+            for export_type, output_file, transactions_wrapper, rows in jobs:
+                exporter_class = self._getExporterClass(export_type)
+                future = executor.submit(self._export, exporter_class, output_file, rows, transactions_wrapper)
+                futures[future] = (export_type, output_file)
+            for future in concurrent.futures.as_completed(futures):
+                export_type, output_file = futures[future]
+                try:
+                    seconds, succeeded = future.result()
+                    timings[export_type] = timings.get(export_type, 0.0) + seconds
+                    if not succeeded:
+                        failed_files.add(output_file)
+                except Exception as e:
+                    failed_files.add(output_file)
+                    self.log.error(f"Export to {export_type} failed: {e}")
+        return timings, failed_files
+
+    def _invalidateFailedPartitions(self, manifest:ExportManifest, failed_files:set)->None:
+        """Drops the digest of the partitions with a failed export, so the next run writes them again."""
+        for partition in manifest.partitions.values():
+            if any(os.path.join(manifest.directory, file_name) in failed_files for file_name in partition["files"].values()):
+                partition["digest"] = None
+                self.log.warning(f"Partition {partition['key']} is incomplete and will be written again by the next run.")
+
+    def _getPartitionJobs(self, export_types:[str], previous:ExportManifest)->tuple:
+        """
+        Groups the transactions into partitions and returns the export jobs
+        of the partitions which changed since the previous manifest together
+        with the new manifest.
+        """
+        directory = self.configuration.getOutputBase()
+        layout = self.configuration.getExportLayout()
+        if previous and previous.layout != layout:
+            previous_partitions = {}
+        else:
+            previous_partitions = previous.partitions if previous else {}
+        manifest = ExportManifest(directory, layout)
+
+        partitions = {}
+        for transaction in self.transactions_wrapper.getAll():
+            partitions.setdefault(self._getPartitionKey(transaction), []).append(transaction)
+
+        jobs = []
+        changed_partitions = 0
+        for key, transactions in partitions.items():
+            rows = [transaction.getDictionary() for transaction in transactions]
+            institute, period = key.split("/")
+            partition = {
+                "key":          key,
+                "institute":    institute,
+                "period":       period,
+                "first_date":   rows[0]["date"],
+                "last_date":    rows[-1]["date"],
+                "transactions": len(rows),
+                "total":        cents_to_float(sum(transaction.value for transaction in transactions)),
+                "digest":       self._getDigest(rows),
+                "files":        {export_type: f"{key}.{export_type}" for export_type in export_types},
+            }
+            manifest.setPartition(partition)
+            changed = previous_partitions.get(key, {}).get("digest") != partition["digest"]
+            transactions_wrapper = None
+            for export_type, file_name in partition["files"].items():
+                output_file = os.path.join(directory, file_name)
+                if not changed and export_type in previous_partitions[key].get("files", {}) and os.path.exists(output_file):
+                    continue
+                if transactions_wrapper is None:
+                    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                    transactions_wrapper = TransactionsWrapper(self.log, transactions)
+                    changed_partitions += 1
+                jobs.append((export_type, output_file, transactions_wrapper, rows))
+
+        self.log.info(f"Writing {changed_partitions} of {len(partitions)} partitions, the others are unchanged.")
+        return jobs, manifest
+
+    def _removeStaleFiles(self, previous:ExportManifest, manifest:ExportManifest)->None:
+        """Removes the files of partitions and export types which are no longer exported."""
+        for stale_file in (previous.getFiles() if previous else set()) - manifest.getFiles():
+            try:
+                os.remove(stale_file)
+                self.log.debug(f"Removed stale export {stale_file}.")
+                if not os.listdir(os.path.dirname(stale_file)):
+                    os.rmdir(os.path.dirname(stale_file))
+            except OSError:
+                pass
+
     def process(self)->TransactionsWrapper:
-        # Export logic: iterate over all specified export types
-        for export_type in self.configuration.getExportTypes():
-            ext = f".{export_type}"
-            output_file = self.configuration.getOutputBase()
-            if not output_file.endswith(ext):
-                output_file += ext
-            if self.configuration.shouldCreateDirs():
-                os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
-            module = importlib.import_module(f"code.exporter.{export_type}", package=__package__)
-            class_name = export_type.capitalize() + "Exporter"
-            exporter_class = getattr(module, class_name)
-            exporter = exporter_class(self.transactions_wrapper, self.configuration, self.log, output_file)
-            exporter.export()
-        self.transactions_wrapper
\ No newline at end of file
+        export_types = self.configuration.getExportTypes() or []
+        if not export_types:
+            return self.transactions_wrapper
+
+        # Sort once; all exporters and partitions share the date order
+        self.transactions_wrapper.sortByDate()
+        previous = manifest = None
+        if self.configuration.shouldOnlySummarize():
+            jobs = []
+        elif self.configuration.getExportLayout() in self.PARTITION_PERIODS:
+            file_types = [export_type for export_type in export_types if export_type not in self.UNPARTITIONED_TYPES]
+            previous = ExportManifest.load(self.configuration.getOutputBase())
+            jobs, manifest = self._getPartitionJobs(file_types, previous)
+            jobs += [(export_type, None, self.transactions_wrapper, None)
+                     for export_type in export_types if export_type in self.UNPARTITIONED_TYPES]
+        else:
+            # Flatten once; all exporters share the same rows
+            rows = [transaction.getDictionary() for transaction in self.transactions_wrapper.getAll()]
+            jobs = [(export_type, self._getOutputFile(export_type), self.transactions_wrapper, rows)
+                    for export_type in export_types]
+        jobs += [(export_type, self._getSummaryFile(summary, export_type), self.transactions_wrapper, summary.getRows())
+                 for summary in self.transactions_wrapper.getSummaries()
+                 for export_type in export_types if export_type in self.SUMMARY_TYPES]
+
+        timings, failed_files = self._runExports(jobs)
+        if manifest:
+            self._invalidateFailedPartitions(manifest, failed_files)
+            self._removeStaleFiles(previous, manifest)
+            manifest.save()
+            self.log.success(f"Export manifest written: {manifest.path}")
+
+        for export_type in export_types:
+            if export_type in timings:
+                self.log.info(f"Export {export_type} took {timings[export_type] * 1000:.1f} ms.")
+        return self.transactions_wrapper
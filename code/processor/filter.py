@@ -21,6 +21,7 @@ class FilterProcessor(AbstractProcessor):
     def process(self)->TransactionsWrapper:
         all_transactions = self.transactions_wrapper.getAll()
         self.transactions_wrapper = TransactionsWrapper(
-            self.log,self._filter_by_date(all_transactions)
+            self.log,self._filter_by_date(all_transactions),
+            self.transactions_wrapper.getReconciliations()
             )
         return self.transactions_wrapper
\ No newline at end of file
@@ -2,20 +2,133 @@ from .abstract import AbstractProcessor
 from code.model.transactions_wrapper import TransactionsWrapper
 from code.model.configuration import Configuration
 from code.factories.extractor import ExtractorFactory
+from code.helper.period import period_from_filename, overlaps
+from code.model.statement_header import StatementHeader
+from datetime import date, datetime
 import os
+import time
 import concurrent.futures
 
 
 class LoadProcessor(AbstractProcessor):
+    """
+    Extracts the transactions of all input files in parallel.
+
+    If a date range is configured, the statement period of every file is
+    determined before its extraction, from the cached catalog, the filename
+    or the header of the first page, and files outside the range are skipped.
+
+    Every worker reconciles its file against the opening and closing balance
+    printed on the statement; only these per-file results are collected.
+    """
+
+    def __init__(self, log, configuration, transactions_wrapper:TransactionsWrapper=None):
+        super().__init__(log, configuration, transactions_wrapper)
+        self.extractor_factory = ExtractorFactory(log, configuration=configuration)
+        self.institutes = {} # Institute of every discovered file
+        self.reconciliations = {} # Reconciliation of every extracted file
+
+    def _getDateRange(self)->tuple:
+        from_datetime = self.configuration.getFromDatetime()
+        to_datetime = self.configuration.getToDatetime()
+        return from_datetime and from_datetime.date(), to_datetime and to_datetime.date()
+
+    def _hasDateRange(self)->bool:
+        return any(self._getDateRange())
+
+    def _getKnownPeriod(self, file_path:str)->tuple:
+        """Returns the period known without opening the file."""
+        if self.configuration.catalog:
+            facts = self.configuration.catalog.lookup(file_path)
+            if facts.get("period"):
+                return tuple(date.fromisoformat(day) for day in facts["period"])
+            if facts.get("header"):
+                period = StatementHeader.fromDictionary(facts["header"]).getPeriod()
+                if period:
+                    return period
+        return period_from_filename(file_path)
+
+    def _getHeaderPeriod(self, extractor)->tuple:
+        return extractor.getStatementHeader().getPeriod()
+
+    def _isOutsideDateRange(self, file_path:str, period:tuple)->bool:
+        if period and not overlaps(period, *self._getDateRange()):
+            self.log.debug(f"Skipped {file_path}: statement period {period[0]} - {period[1]} is outside of the date range.")
+            return True
+        return False
+
+    def _recordPeriod(self, file_path:str, transactions:list)->None:
+        if not self.configuration.catalog or not transactions:
+            return
+        days = [transaction.getTransactionDate() for transaction in transactions]
+        days = [day.date() if isinstance(day, datetime) else day for day in days if day]
+        if days:
+            self.configuration.catalog.update(file_path, period=[min(days).isoformat(), max(days).isoformat()])
 
     def extract_from_file(self, file_path):
-        extractor_factory = ExtractorFactory(self.log, configuration=self.configuration)
-        extractor = extractor_factory.create_extractor(file_path)
-        if extractor:
-            return extractor.extract_transactions()
-        return []
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        period = None
+        if self._hasDateRange():
+            period = self._getKnownPeriod(file_path)
+            if self._isOutsideDateRange(file_path, period):
+                return []
+        extractor = self.extractor_factory.create_extractor(file_path, self.institutes.get(file_path))
+        if not extractor:
+            return []
+        with extractor:
+            return self._extract(extractor, file_path, start, start_cpu, period)
 
-    def process(self)->TransactionsWrapper:
+    def _extract(self, extractor, file_path:str, start:float, start_cpu:float, period)->list:
+        if self._hasDateRange() and not period:
+            if self._isOutsideDateRange(file_path, self._getHeaderPeriod(extractor)):
+                return []
+        detect_seconds = time.perf_counter() - start
+        pdf_converter = getattr(extractor, "pdf_converter", None)
+        # Text extracted during the detection is accounted to the detection
+        pdf_text_start = pdf_converter.text_extraction_seconds if pdf_converter else 0.0
+        start = time.perf_counter()
+        transactions = extractor.extract_transactions()
+        self._recordPeriod(file_path, transactions)
+        self.reconciliations[file_path] = extractor.reconcile(transactions)
+        extract_seconds = time.perf_counter() - start
+        pdf_text_seconds = pdf_converter.text_extraction_seconds - pdf_text_start if pdf_converter else 0.0
+        if self.configuration.profiler:
+            self.configuration.profiler.addFile(
+                file_path=file_path,
+                extractor=extractor.__class__.__name__,
+                detect_seconds=detect_seconds,
+                pdf_text_seconds=pdf_text_seconds,
+                parse_seconds=extract_seconds - pdf_text_seconds,
+                cpu_seconds=time.thread_time() - start_cpu,
+                transactions=len(transactions)
+            )
+        return transactions
+
+    def discover(self)->[str]:
+        """
+        Returns the PDF and CSV files found in the configured input paths
+        which belong to a supported and selected institute.
+        The institute is decided without parsing the files.
+        """
+        files = []
+        for file_path in self._listFiles():
+            institute = self.extractor_factory.getInstituteFromPath(file_path)
+            if institute and not self.extractor_factory.isSelected(institute):
+                self.log.debug(f"Skipped {file_path}: {institute} is not selected.")
+                continue
+            institute = self.extractor_factory.classify(file_path)
+            if not institute:
+                continue
+            if not self.extractor_factory.isSelected(institute):
+                self.log.debug(f"Skipped {file_path}: {institute} is not selected.")
+                continue
+            self.institutes[file_path] = institute
+            files.append(file_path)
+        return files
+
+    def _listFiles(self)->[str]:
+        """Returns the PDF and CSV files found in the configured input paths."""
         pdf_csv_files = []
         for path in self.configuration.getInputPaths():
             if os.path.isdir(path):
@@ -34,14 +147,22 @@ class LoadProcessor(AbstractProcessor):
                 pdf_csv_files.append(path)
             else:
                 self.log.warning(f"Invalid input path: {path}")
+        return pdf_csv_files
+
+    def process(self)->TransactionsWrapper:
+        pdf_csv_files = self.discover()
         if not pdf_csv_files:
             self.log.warning("No PDF/CSV files found in the given paths.")
-            return
+            return self.transactions_wrapper
         self.log.info(f"Found {len(pdf_csv_files)} files.")
 
         with concurrent.futures.ThreadPoolExecutor() as executor:
             results = list(executor.map(self.extract_from_file, pdf_csv_files))
-            for transactions in results:
+            for file_path, transactions in zip(pdf_csv_files, results):
                 self.transactions_wrapper.extendTransactions(transactions)
-                
+                if file_path in self.reconciliations:
+                    self.transactions_wrapper.addReconciliation(self.reconciliations[file_path])
+
+        if self.configuration.catalog:
+            self.configuration.catalog.save()
         return self.transactions_wrapper
\ No newline at end of file
@@ -0,0 +1,37 @@
+from .abstract import AbstractProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.model.partner_names import PartnerNames
+
+class PartnerProcessor(AbstractProcessor):
+    """
+    Replaces the partner names by their canonical names, see PartnerNames.
+    The spelling of the statement is kept as the original name of the partner.
+    The most frequent spellings are resolved first, so they become the
+    canonical names of new partners.
+    """
+    def process(self)->TransactionsWrapper:
+        if not self.configuration.shouldNormalizePartners():
+            return self.transactions_wrapper
+        partner_names = PartnerNames(self.configuration)
+        transactions_by_name = {}
+        for transaction in self.transactions_wrapper.getAll():
+            # Transactions normalized before, e.g. in watch mode, are resolved from their original name
+            name = transaction.partner.original_name or transaction.partner.name
+            if name:
+                transactions_by_name.setdefault(name, []).append(transaction)
+
+        renamed = 0
+        for name in sorted(transactions_by_name, key=lambda name: (-len(transactions_by_name[name]), name)):
+            canonical = partner_names.resolve(name)
+            for transaction in transactions_by_name[name]:
+                transaction.partner.original_name = name if canonical != name else None
+                transaction.partner.name = canonical
+            if canonical != name:
+                renamed += len(transactions_by_name[name])
+                self.log.debug(f"Partner '{name}' is '{canonical}'.")
+        partner_names.save()
+        for name, similar in partner_names.suggestions:
+            self.log.info(f"Partner '{name}' resembles '{similar}'; list it under \"partners\" in the configuration to merge them.")
+        canonicals = len(set(partner_names.resolve(name) for name in transactions_by_name))
+        self.log.info(f"Normalized {renamed} partner names; {len(transactions_by_name)} spellings belong to {canonicals} partners.")
+        return self.transactions_wrapper
@@ -0,0 +1,47 @@
+from .abstract import AbstractProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.model.search_index import SearchIndex
+import os
+
+class SearchIndexProcessor(AbstractProcessor):
+    """
+    Adds the transactions of new or changed files to the search index and
+    removes files which disappeared, if indexing is enabled by --index. Like the timeline it runs before the
+    filter, so the whole history stays searchable.
+    """
+    def _stat(self, file_path:str)->list:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def process(self)->TransactionsWrapper:
+        if not self.configuration.shouldIndex():
+            return self.transactions_wrapper
+        if self.configuration.search_index is None:
+            self.configuration.search_index = SearchIndex(self.configuration)
+        search_index = self.configuration.search_index
+        if not search_index.path:
+            return self.transactions_wrapper
+
+        transactions_by_file = {}
+        for transaction in self.transactions_wrapper.getAll():
+            transactions_by_file.setdefault(os.path.abspath(transaction.source), []).append(transaction)
+
+        sources = search_index.getSources()
+        added = 0
+        for file_path, transactions in transactions_by_file.items():
+            stat = self._stat(file_path)
+            if stat is None or sources.get(file_path) == stat:
+                continue
+            search_index.addSource(file_path, stat, [transaction.getDictionary() for transaction in transactions])
+            added += len(transactions)
+        # Files which changed without being loaded again are outdated as well
+        for file_path, stat in sources.items():
+            if file_path not in transactions_by_file and self._stat(file_path) != stat:
+                search_index.removeSource(file_path)
+                self.log.debug(f"Removed {file_path} from the search index.")
+        if added:
+            self.log.info(f"Indexed {added} transactions for the search.")
+        return self.transactions_wrapper
@@ -0,0 +1,96 @@
+from .abstract import AbstractProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.model.balance_timeline import AccountTimeline, BalanceTimeline, to_day
+from code.helper.money import to_cents
+import os
+
+class TimelineProcessor(AbstractProcessor):
+    """
+    Keeps the balance timeline of every owner account up to date with the
+    loaded transactions, if the validation or the HTML export reads it. It runs before the filter, so the timelines cover
+    the whole history of the statements loaded so far.
+
+    Files which are already part of a timeline are skipped and new files are
+    added, so runs limited by --from/--to or --institutes keep the files they
+    didn't load. A file which changed or disappeared is removed from its
+    timeline until it is loaded again, and a new file with exactly the
+    bookings of a file which wasn't loaded, like a copy in another
+    directory, replaces it. Accounts without files are dropped.
+
+    The timelines are anchored by the opening and closing balances of the
+    reconciled statements and by the validation checkpoints of the
+    configuration, whose values are the balances at the start of their day.
+    """
+    CONFIGURATION_ORIGIN = "configuration"
+
+    def _stat(self, file_path:str)->list:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _getCheckpoints(self)->dict:
+        """Returns the validation checkpoints as [(day, cents)] per lowercase institute."""
+        checkpoints = {}
+        institutes = (self.configuration.configuration_file_data or {}).get("institutes") or {}
+        for institute, data in institutes.items():
+            for checkpoint in (data or {}).get("validate") or []:
+                checkpoints.setdefault(institute.lower(), []).append((to_day(checkpoint["date"]), to_cents(checkpoint["value"])))
+        return checkpoints
+
+    def process(self)->TransactionsWrapper:
+        if not self.configuration.shouldKeepTimeline():
+            return self.transactions_wrapper
+        if self.configuration.timeline is None:
+            self.configuration.timeline = BalanceTimeline(self.configuration)
+        timeline = self.configuration.timeline
+        reconciliations = {os.path.abspath(reconciliation.source): reconciliation
+                           for reconciliation in self.transactions_wrapper.getReconciliations()}
+
+        # Transactions per account and file
+        files_by_account = {}
+        for transaction in self.transactions_wrapper.getAll():
+            if transaction.owner.id and transaction.value is not None:
+                account_files = files_by_account.setdefault(transaction.owner.id, {})
+                account_files.setdefault(os.path.abspath(transaction.source), (transaction.owner.institute, []))[1].append(transaction)
+
+        # Files which changed or disappeared are outdated, whether they were loaded or not
+        for account in timeline.accounts.values():
+            for file_path in [file_path for file_path, source in account.sources.items() if self._stat(file_path) != source["stat"]]:
+                account.removeSource(file_path)
+                self.log.debug(f"Removed {file_path} from the timeline of {account.account_id}.")
+
+        for account_id, account_files in files_by_account.items():
+            account = timeline.accounts.get(account_id)
+            if account is None:
+                institute = next(iter(account_files.values()))[0]
+                account = timeline.accounts[account_id] = AccountTimeline(account_id, institute)
+            for file_path, (_, transactions) in account_files.items():
+                if file_path in account.sources:
+                    continue
+                days = [to_day(transaction.date) for transaction in transactions]
+                bookings = list(zip(days, (transaction.value for transaction in transactions)))
+                copy = account.findSource(bookings)
+                if copy and copy not in account_files:
+                    account.removeSource(copy)
+                    self.log.debug(f"{file_path} replaces its copy {copy} in the timeline of {account_id}.")
+                account.addSource(file_path, self._stat(file_path), bookings)
+                reconciliation = reconciliations.get(file_path)
+                if reconciliation and reconciliation.isChecked():
+                    # The closing balance holds at the start of the day after the last booking
+                    account.addAnchor(min(days), reconciliation.opening_balance, file_path)
+                    account.addAnchor(max(days) + 1, reconciliation.closing_balance, file_path)
+                self.log.debug(f"Added {len(transactions)} bookings of {file_path} to the timeline of {account_id}.")
+
+        for account_id in [account_id for account_id, account in timeline.accounts.items() if not account.sources]:
+            self.log.debug(f"Dropped the timeline of {account_id}, none of its files is left.")
+            del timeline.accounts[account_id]
+
+        checkpoints = self._getCheckpoints()
+        for account in timeline.accounts.values():
+            account.removeAnchors(self.CONFIGURATION_ORIGIN)
+            for day, balance in checkpoints.get((account.institute or "").lower(), []):
+                account.addAnchor(day, balance, self.CONFIGURATION_ORIGIN)
+        timeline.save()
+        return self.transactions_wrapper
@@ -0,0 +1,104 @@
+from .abstract import AbstractProcessor
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from bisect import bisect_left
+from datetime import datetime
+import base64
+import hashlib
+
+class TransferProcessor(AbstractProcessor):
+    """
+    Links transfers between the own accounts, which appear once as the
+    outgoing booking of one account and once as the incoming booking of
+    another, through a transfer_id shared by both bookings. The transfer_id
+    is derived from the contents of the bookings, so it stays the same
+    between runs, and it is computed again on every run, so removed or
+    changed statements don't leave links behind.
+
+    The outgoing and incoming transactions are hash joined on their absolute
+    amount and currency. Within an amount, the incoming bookings are sorted
+    by date, so the candidates within the date window are found by bisection.
+    A pair matches if the bookings belong to different own accounts, at
+    least one of them names its partner, and every named partner is the
+    account of the other booking. Every outgoing booking takes the closest
+    unmatched incoming booking.
+    Transactions whose statement names a related transaction, like PayPal
+    exports, are left alone.
+    """
+    def _normalize(self, account_id:str)->str:
+        return "".join((account_id or "").split()).upper()
+
+    def _getDay(self, transaction:Transaction)->int:
+        day = transaction.date
+        if isinstance(day, datetime):
+            day = day.date()
+        return day.toordinal()
+
+    def _isTransfer(self, outgoing:Transaction, incoming:Transaction)->bool:
+        outgoing_owner = self._normalize(outgoing.owner.id)
+        incoming_owner = self._normalize(incoming.owner.id)
+        if not outgoing_owner or not incoming_owner or outgoing_owner == incoming_owner:
+            return False
+        outgoing_partner = self._normalize(outgoing.partner.id)
+        incoming_partner = self._normalize(incoming.partner.id)
+        if not outgoing_partner and not incoming_partner:
+            return False
+        # A known partner has to be the other account
+        return outgoing_partner in ("", incoming_owner) and incoming_partner in ("", outgoing_owner)
+
+    def _getTransferId(self, outgoing:Transaction, incoming:Transaction)->str:
+        """Derives the id from the bookings, not from their transaction ids, which differ between runs."""
+        fields = []
+        for transaction in (outgoing, incoming):
+            fields += [self._normalize(transaction.owner.id), str(self._getDay(transaction)), str(transaction.value),
+                       transaction.currency or "", " ".join((transaction.description or "").split())]
+        digest = hashlib.sha256("\x1f".join(fields).encode()).digest()
+        return "TRF" + base64.b32encode(digest[:10]).decode("utf-8")[:15]
+
+    def match(self)->[tuple]:
+        """Returns the matched (outgoing, incoming) pairs."""
+        window = self.configuration.getTransferWindow()
+        # Hash join on the amount; both sides are kept in date order
+        outgoing_by_amount = {}
+        incoming_by_amount = {}
+        for transaction in self.transactions_wrapper.getAll():
+            if transaction.related_transaction_id or not transaction.value or not transaction.owner.id:
+                continue
+            key = (abs(transaction.value), transaction.currency)
+            side = outgoing_by_amount if transaction.value < 0 else incoming_by_amount
+            side.setdefault(key, []).append((self._getDay(transaction), transaction))
+
+        pairs = []
+        for key, outgoing in outgoing_by_amount.items():
+            incoming = incoming_by_amount.get(key)
+            if not incoming:
+                continue
+            outgoing.sort(key=lambda entry: entry[0])
+            incoming.sort(key=lambda entry: entry[0])
+            incoming_days = [day for day, _ in incoming]
+            matched = [False] * len(incoming)
+            for day, outgoing_transaction in outgoing:
+                best = None
+                position = bisect_left(incoming_days, day - window)
+                while position < len(incoming) and incoming_days[position] <= day + window:
+                    if not matched[position] and self._isTransfer(outgoing_transaction, incoming[position][1]):
+                        if best is None or abs(incoming_days[position] - day) < abs(incoming_days[best] - day):
+                            best = position
+                    position += 1
+                if best is not None:
+                    matched[best] = True
+                    pairs.append((outgoing_transaction, incoming[best][1]))
+        return pairs
+
+    def process(self)->TransactionsWrapper:
+        if not self.configuration.shouldMatchTransfers():
+            return self.transactions_wrapper
+        # Links of earlier runs, e.g. in watch mode, may point at bookings which are gone
+        for transaction in self.transactions_wrapper.getAll():
+            transaction.transfer_id = None
+        pairs = self.match()
+        for outgoing, incoming in pairs:
+            outgoing.transfer_id = incoming.transfer_id = self._getTransferId(outgoing, incoming)
+            self.log.debug(f"Linked the transfer {outgoing.transfer_id} from {outgoing.owner.id} to {incoming.owner.id}.")
+        self.log.info(f"Matched {len(pairs)} transfers between own accounts.")
+        return self.transactions_wrapper
@@ -3,11 +3,31 @@ from code.validator.transaction import TransactionValidator
 from code.model.transactions_wrapper import TransactionsWrapper
 
 class ValidatorProcessor(AbstractProcessor):
+    """
+    Reports the balance reconciliation which every file did during the
+    extraction and validates the checkpoints of the configuration file.
+    """
+    def _reportReconciliations(self)->None:
+        reconciliations = self.transactions_wrapper.getReconciliations()
+        checked = [reconciliation for reconciliation in reconciliations if reconciliation.isChecked()]
+        failed = [reconciliation for reconciliation in checked if not reconciliation.isBalanced()]
+        for reconciliation in reconciliations:
+            if reconciliation in failed:
+                self.log.error(f"Reconciliation failed for {reconciliation}")
+            else:
+                self.log.debug(f"Reconciliation of {reconciliation}")
+        if failed:
+            self.log.error(f"{len(failed)} of {len(checked)} statements don't match their printed balances.")
+        elif checked:
+            self.log.success(f"All {len(checked)} statements match their printed balances.")
+        if len(checked) < len(reconciliations):
+            self.log.info(f"{len(reconciliations) - len(checked)} files print no opening and closing balance and weren't reconciled.")
 
     def process(self)->TransactionsWrapper:
         if self.configuration.validate:
+            self._reportReconciliations()
             # Create an instance of TransactionValidator and validate transactions
             validator = TransactionValidator(self.configuration, self.log)
             validator.validate(self.transactions_wrapper.getAll())
         
-        return self.transactions_wrapper
\ No newline at end of file
+        return self.transactions_wrapper
@@ -0,0 +1,122 @@
+from .abstract import AbstractProcessor
+from .load import LoadProcessor
+from .filter import FilterProcessor
+from .validator import ValidatorProcessor
+from .exporter import ExportProcessor
+from .aggregation import AggregationProcessor
+from .categorization import CategorizationProcessor
+from .transfer import TransferProcessor
+from .timeline import TimelineProcessor
+from .search_index import SearchIndexProcessor
+from .partner import PartnerProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
+import concurrent.futures
+import os
+import time
+
+class WatchProcessor(AbstractProcessor):
+    """
+    Keeps polling the input paths and updates the exports whenever
+    statements appear, change or disappear.
+
+    Files are compared by modification time and size, so no OS specific
+    notifier is needed. Only new or changed files are extracted; the
+    transactions of all other files are kept in memory. A file which has
+    been modified within the last interval is only ingested once its stat
+    stays the same for one poll, so half downloaded files are skipped.
+    """
+    def __init__(self, log, configuration, transactions_wrapper:TransactionsWrapper=None):
+        super().__init__(log, configuration, transactions_wrapper)
+        self.load_processor = LoadProcessor(log, configuration)
+        self.file_transactions = {}
+        self.file_stats = {}
+        self._pending_stats = {}
+
+    def _stat(self, file_path:str):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _isSettled(self, file_path:str, stat)->bool:
+        if time.time() - stat[0] / 1e9 >= self.configuration.getWatchInterval():
+            return True
+        if self._pending_stats.get(file_path) == stat:
+            return True
+        self._pending_stats[file_path] = stat
+        return False
+
+    def _extract(self, file_path:str)->list:
+        try:
+            return self.load_processor.extract_from_file(file_path)
+        except Exception as e:
+            # A broken statement must not stop the resident process
+            self.log.error(f"Extraction of {file_path} failed: {e}")
+            self.load_processor.reconciliations.pop(file_path, None)
+            return []
+
+    def poll(self)->bool:
+        """
+        Ingests new and changed files and drops removed ones.
+        Returns True if the loaded transactions changed.
+        """
+        discovered = set(self.load_processor.discover())
+        removed = [file_path for file_path in self.file_stats if file_path not in discovered]
+        for file_path in removed:
+            del self.file_stats[file_path]
+            del self.file_transactions[file_path]
+            self.load_processor.reconciliations.pop(file_path, None)
+            self.log.info(f"Removed {file_path}.")
+
+        ready = {}
+        for file_path in sorted(discovered):
+            stat = self._stat(file_path)
+            if stat is None or self.file_stats.get(file_path) == stat:
+                continue
+            if self._isSettled(file_path, stat):
+                ready[file_path] = stat
+
+        if ready:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                results = executor.map(self._extract, ready)
+                for (file_path, stat), transactions in zip(ready.items(), results):
+                    self._pending_stats.pop(file_path, None)
+                    self.file_stats[file_path] = stat
+                    self.file_transactions[file_path] = transactions
+                    self.log.info(f"Ingested {len(transactions)} transactions from {file_path}.")
+            if self.configuration.catalog:
+                self.configuration.catalog.save()
+        return bool(removed or ready)
+
+    def export(self)->TransactionsWrapper:
+        """Runs the stages after the load on all transactions in memory."""
+        transactions = []
+        reconciliations = []
+        for file_path in sorted(self.file_transactions):
+            transactions.extend(self.file_transactions[file_path])
+            if file_path in self.load_processor.reconciliations:
+                reconciliations.append(self.load_processor.reconciliations[file_path])
+        self.transactions_wrapper = TransactionsWrapper(self.log, transactions, reconciliations)
+        self.transactions_wrapper.sortByDate()
+        TimelineProcessor(self.log, self.configuration, self.transactions_wrapper).process()
+        SearchIndexProcessor(self.log, self.configuration, self.transactions_wrapper).process()
+        transactions_wrapper = FilterProcessor(self.log, self.configuration, self.transactions_wrapper).process()
+        transactions_wrapper = TransferProcessor(self.log, self.configuration, transactions_wrapper).process()
+        transactions_wrapper = PartnerProcessor(self.log, self.configuration, transactions_wrapper).process()
+        transactions_wrapper = CategorizationProcessor(self.log, self.configuration, transactions_wrapper).process()
+        transactions_wrapper = AggregationProcessor(self.log, self.configuration, transactions_wrapper).process()
+        transactions_wrapper = ValidatorProcessor(self.log, self.configuration, transactions_wrapper).process()
+        return ExportProcessor(self.log, self.configuration, transactions_wrapper).process()
+
+    def process(self, max_polls:int=None)->TransactionsWrapper:
+        polls = 0
+        self.log.info(f"Watching {', '.join(self.configuration.getInputPaths())} every {self.configuration.getWatchInterval()} s.")
+        while True:
+            if self.poll():
+                self.export()
+                self.log.success(f"Exported {len(self.transactions_wrapper.getAll())} transactions from {len(self.file_transactions)} files.")
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                return self.transactions_wrapper
+            time.sleep(self.configuration.getWatchInterval())
@@ -0,0 +1,65 @@
+import bisect
+
+class TransactionIndex:
+    """
+    In memory index over flat transaction rows as produced by
+    Transaction.getDictionary() or read from a JSON export.
+
+    The rows are kept in date order, so date ranges are found by bisection.
+    Every institute has its own sorted position list and the lowercased
+    search fields are precomputed once, so a query only scans the rows
+    which can match.
+    """
+    SEARCH_FIELDS = ["description", "partner_name", "partner_id", "sender", "receiver", "type", "medium", "invoice_id"]
+
+    def __init__(self, rows:[dict]):
+        self.rows = sorted(rows, key=lambda row: row["date"])
+        self.dates = [row["date"] for row in self.rows]
+        self.institute_positions = {}
+        self.partners = []
+        self.texts = []
+        for position, row in enumerate(self.rows):
+            institute = (row.get("owner_institute") or "").lower()
+            self.institute_positions.setdefault(institute, []).append(position)
+            self.partners.append(" ".join(str(row.get(key) or "") for key in ("partner_name", "partner_id")).lower())
+            self.texts.append(" ".join(str(row.get(key) or "") for key in self.SEARCH_FIELDS).lower())
+
+    def getInstitutes(self)->[str]:
+        return sorted(institute for institute in self.institute_positions if institute)
+
+    def _positions(self, from_date:str=None, to_date:str=None, institute:str=None):
+        start = bisect.bisect_left(self.dates, from_date) if from_date else 0
+        end = bisect.bisect_right(self.dates, to_date) if to_date else len(self.dates)
+        if not institute:
+            return range(start, end)
+        positions = self.institute_positions.get(institute.lower(), [])
+        return positions[bisect.bisect_left(positions, start):bisect.bisect_left(positions, end)]
+
+    def query(self, from_date:str=None, to_date:str=None, institute:str=None, partner:str=None,
+              min_value:float=None, max_value:float=None, text:str=None, offset:int=0, limit:int=100)->dict:
+        """
+        Returns one page of the matching rows in date order together with the
+        total number of matches. Dates are ISO strings (YYYY-MM-DD), partner and
+        text are case insensitive substrings.
+        """
+        partner = partner.lower() if partner else None
+        text = text.lower() if text else None
+        matches = []
+        for position in self._positions(from_date, to_date, institute):
+            if partner and partner not in self.partners[position]:
+                continue
+            if text and text not in self.texts[position]:
+                continue
+            if min_value is not None or max_value is not None:
+                value = self.rows[position]["value"]
+                if min_value is not None and value < min_value:
+                    continue
+                if max_value is not None and value > max_value:
+                    continue
+            matches.append(position)
+        return {
+            "total": len(matches),
+            "offset": offset,
+            "limit": limit,
+            "transactions": [self.rows[position] for position in matches[offset:offset + limit]],
+        }
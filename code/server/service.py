@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from code.model.log import Log
+from code.server.index import TransactionIndex
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers JSON queries over the transaction index of the server:
+
+        GET /transactions?from=2023-01-01&to=2023-03-31&institute=ing
+            &partner=rewe&min=-100&max=0&q=miete&offset=0&limit=100
+        GET /institutes
+        GET /health
+    """
+    MAX_LIMIT = 1000
+
+    def _send(self, status:int, data)->None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _getDate(self, parameters:dict, name:str)->str:
+        value = parameters.get(name)
+        if value is None:
+            return None
+        # Validates the format, the index compares the ISO strings
+        datetime.strptime(value, "%Y-%m-%d")
+        return value
+
+    def _getNumber(self, parameters:dict, name:str, cast, default=None):
+        value = parameters.get(name)
+        return default if value is None else cast(value)
+
+    def _queryTransactions(self, parameters:dict)->dict:
+        limit = self._getNumber(parameters, "limit", int, 100)
+        offset = self._getNumber(parameters, "offset", int, 0)
+        if limit < 0 or offset < 0:
+            raise ValueError("offset and limit must not be negative")
+        return self.server.index.query(
+            from_date=self._getDate(parameters, "from"),
+            to_date=self._getDate(parameters, "to"),
+            institute=parameters.get("institute"),
+            partner=parameters.get("partner"),
+            min_value=self._getNumber(parameters, "min", float),
+            max_value=self._getNumber(parameters, "max", float),
+            text=parameters.get("q"),
+            offset=offset,
+            limit=min(limit, self.MAX_LIMIT),
+        )
+
+    def do_GET(self)->None:
+        url = urlparse(self.path)
+        parameters = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/transactions":
+            try:
+                self._send(200, self._queryTransactions(parameters))
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+        elif url.path == "/institutes":
+            self._send(200, self.server.index.getInstitutes())
+        elif url.path == "/health":
+            self._send(200, {"status": "ok", "transactions": len(self.server.index.rows)})
+        else:
+            self._send(404, {"error": f"Unknown path {url.path}"})
+
+    def log_message(self, format, *args)->None:
+        self.server.log.debug(f"{self.address_string()} {format % args}")
+
+class QueryServer(ThreadingHTTPServer):
+    """HTTP server which keeps the transaction index in memory."""
+    daemon_threads = True
+
+    def __init__(self, address:tuple, index:TransactionIndex, log:Log):
+        self.index = index
+        self.log = log
+        super().__init__(address, QueryRequestHandler)
@@ -5,14 +5,20 @@ import yaml
 from code.helper.datetime import createComparatableTime
 from code.model.log import Log
 from code.model.configuration import Configuration
+from code.helper.money import to_cents, format_cents
 
 class Validator:
+    """
+    Checks that the balance at start_date plus the transactions in between
+    gives the balance at end_date. The values are given in currency units
+    and compared in integer cents, so no rounding is involved.
+    """
     def __init__(self, start_value: float, start_date: date, end_value: float, end_date: date, margin: float, log: Log, institute: str = None):
-        self.start_value = start_value
+        self.start_value = to_cents(start_value)
         self.start_date = createComparatableTime(start_date)
-        self.end_value = end_value
+        self.end_value = to_cents(end_value)
         self.end_date = createComparatableTime(end_date)
-        self.margin = margin  # Margin for tolerance
+        self.margin = to_cents(margin)  # Margin for tolerance
         self.log = log  # Log instance to log messages
         self.institute = institute.lower() if institute else None  # Optional: filter by owner institute
         # Debugging: Log the initialization of the Validator
@@ -40,24 +46,29 @@ class Validator:
 
             # Check if the transaction date is within the specified date range
             if self.start_date <= transaction_date <= self.end_date:
-                total_value += transaction.value  # Add the transaction value
-                self.log.debug(f"Added {transaction.value} for transaction {transaction.id} on {transaction.date}")
+                total_value += transaction.value  # Add the transaction value in cents
+                self.log.debug(f"Added {format_cents(transaction.value)} for transaction {transaction.id} on {transaction.date}")
 
-        total_value = round(total_value, 2)
-        
+        return self._check(total_value)
+
+    def validate_sum(self, bookings_sum: int) -> bool:
+        """Validates the precomputed sum in cents of the bookings between start_date and end_date."""
+        return self._check(self.start_value + bookings_sum)
+
+    def _check(self, total_value: int) -> bool:
         # Log the total value after adding all relevant transactions
-        self.log.debug(f"Total calculated value after transactions: {total_value}")
+        self.log.debug(f"Total calculated value after transactions: {format_cents(total_value)}")
 
         # Margin tolerance check based on whether the margin is positive or negative
         if self.margin > 0:  # Positive margin: total_value can be larger than expected
             if total_value >= self.end_value and total_value <= (self.end_value + self.margin):
                 self.log.warning(f"Validation for {self.start_date} and {self.end_date} passed with warning:\nThe total value is within the margin tolerance "
-                                    f"of {self.margin}. Total value: {total_value}, expected: {self.end_value}, difference: {round(total_value - self.end_value, 2)}.")
+                                    f"of {format_cents(self.margin)}. Total value: {format_cents(total_value)}, expected: {format_cents(self.end_value)}, difference: {format_cents(total_value - self.end_value)}.")
                 return True
         elif self.margin < 0:  # Negative margin: total_value can be smaller than expected
             if total_value >= (self.end_value + self.margin) and total_value <= self.end_value:
                 self.log.warning(f"Validation for {self.start_date} and {self.end_date} passed with warning:\nThe total value is within the margin tolerance "
-                                    f"of {self.margin}. Total value: {total_value}, expected: {self.end_value}, difference: {round(total_value - self.end_value, 2)}.")
+                                    f"of {format_cents(self.margin)}. Total value: {format_cents(total_value)}, expected: {format_cents(self.end_value)}, difference: {format_cents(total_value - self.end_value)}.")
                 return True
 
 
@@ -68,7 +79,7 @@ class Validator:
             return True
         else:
             self.log.error(f"Validation failed for the period between {self.start_date} and {self.end_date}. "
-                                f"\nTotal value is {total_value}, but expected {self.end_value}.\nDifference: {round(total_value - self.end_value, 2)}")
+                                f"\nTotal value is {format_cents(total_value)}, but expected {format_cents(self.end_value)}.\nDifference: {format_cents(total_value - self.end_value)}")
             return False
 
 from datetime import datetime
@@ -128,8 +139,14 @@ class TransactionValidator:
                             institute=institute  # Optional filtering by institute owner
                         )
 
-                        # Perform validation for this range of transactions
-                        if not validator.validate_transactions(institute_transactions):
+                        # Perform validation for this range of transactions; a timeline which holds
+                        # exactly these transactions knows the sum without adding them up
+                        timeline = self.configuration.timeline
+                        if timeline and timeline.holds(institute, institute_transactions):
+                            valid = validator.validate_sum(timeline.getTotal(institute, start_point['date'], end_point['date']))
+                        else:
+                            valid = validator.validate_transactions(institute_transactions)
+                        if not valid:
                             self.log.error(f"Validation failed for {institute} between {start_point['date']} and {end_point['date']}")
 
                             # Log all transactions in the date range and their values
@@ -137,7 +154,7 @@ class TransactionValidator:
                             for transaction in institute_transactions:
                                 transaction_date = transaction.date
                                 if start_point['date'] <= transaction_date <= end_point['date']:
-                                    self.log.debug(f"Transaction ID: {transaction.id}, Date: {transaction_date}, Value: {transaction.value}, Description: {transaction.description}")
+                                    self.log.debug(f"Transaction ID: {transaction.id}, Date: {transaction_date}, Value: {format_cents(transaction.value)}, Description: {transaction.description}")
                         else:
                             self.log.debug(f"Validation passed for {institute} between {start_point['date']} and {end_point['date']}")
                 else:
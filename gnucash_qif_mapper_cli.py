@@ -4,7 +4,46 @@
 
 import argparse
 import sys
-from code.mapper.qif_mapper import build_qif_from_csv
+from code.mapper.qif_mapper import build_qif_from_csv, build_qifs_from_csv
+
+def load_targets(targets_file: str, args) -> list:
+    """
+    Load the multi-target mapping from a YAML file. Each entry routes one category
+    into its own QIF file. Account names missing in an entry fall back to the CLI values.
+
+    Example:
+      targets:
+        - category: Betriebseinnahmen
+          output_qif: income.qif
+          income_account: Income:Sales
+        - category: Bürobedarf
+          output_qif: office.qif
+          expense_account: Expenses:Office Supplies
+    """
+    import yaml
+    with open(targets_file, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+
+    targets = []
+    for entry in data.get("targets", []):
+        target = {
+            "category": entry.get("category"),
+            "output_qif": entry.get("output_qif"),
+            "bank_account_name": entry.get("bank_account", args.bank_account),
+            "income_account_name": entry.get("income_account", args.income_account),
+            "expense_account_name": entry.get("expense_account", args.expense_account),
+            "vat_output_account_name": entry.get("vat_output_account", args.vat_output_account),
+            "vat_input_account_name": entry.get("vat_input_account", args.vat_input_account),
+        }
+        for key in ("output_qif", "bank_account_name", "income_account_name", "expense_account_name"):
+            if not target[key]:
+                raise ValueError(f"Target for category '{target['category']}' is missing '{key}'.")
+        targets.append(target)
+
+    output_files = [target["output_qif"] for target in targets]
+    if len(output_files) != len(set(output_files)):
+        raise ValueError("Each target needs its own output QIF file.")
+    return targets
 
 def main():
     parser = argparse.ArgumentParser(
@@ -18,22 +57,22 @@ def main():
     )
     parser.add_argument(
         "-o", "--output-qif",
-        required=True,
+        required=False,
         help="Path where the resulting QIF file will be written (e.g. 'transactions.qif')."
     )
     parser.add_argument(
         "--bank-account",
-        required=True,
+        required=False,
         help="Name of the Bank account in GnuCash (e.g. 'Assets:Bank:Consorsbank')."
     )
     parser.add_argument(
         "--income-account",
-        required=True,
+        required=False,
         help="Name of the Income account (for net amounts when brutto > 0). E.g. 'Income:Sales'."
     )
     parser.add_argument(
         "--expense-account",
-        required=True,
+        required=False,
         help="Name of the Expense account (for net amounts when brutto < 0). E.g. 'Expenses:Office Supplies'."
     )
     parser.add_argument(
@@ -53,9 +92,27 @@ def main():
         required=False,
         help="If set, only process rows where the 'category' column exactly matches this value."
     )
+    parser.add_argument(
+        "--targets",
+        required=False,
+        help="(Optional) Path to a YAML file routing categories into separate QIF files, each with its own accounts. The CSV is read only once."
+    )
 
     args = parser.parse_args()
 
+    if args.targets:
+        try:
+            targets = load_targets(args.targets, args)
+            build_qifs_from_csv(input_csv=args.input_csv, targets=targets)
+        except Exception as e:
+            print(f"[Error] QIF generation failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    for option in ("output_qif", "bank_account", "income_account", "expense_account"):
+        if not getattr(args, option):
+            parser.error(f"--{option.replace('_', '-')} is required unless --targets is given.")
+
     try:
         build_qif_from_csv(
             input_csv=args.input_csv,
@@ -1,12 +1,30 @@
 import argparse
 from code.model.log import Log
-import yaml
+from code.model.profiler import Profiler
+from code.model.catalog import Catalog
+from code.model.balance_timeline import BalanceTimeline
+from code.model.search_index import SearchIndex
 import sys
 from code.processor.load import LoadProcessor
 from code.processor.filter import FilterProcessor
 from code.model.configuration import Configuration
 from code.processor.validator import ValidatorProcessor
+from code.processor.aggregation import AggregationProcessor
+from code.processor.categorization import CategorizationProcessor
+from code.processor.transfer import TransferProcessor
+from code.processor.timeline import TimelineProcessor
+from code.processor.search_index import SearchIndexProcessor
+from code.processor.partner import PartnerProcessor
+from code.model.transactions_wrapper import TransactionsWrapper
 from code.processor.exporter import ExportProcessor
+from code.processor.watch import WatchProcessor
+
+def aggregation_type(value:str)->[str]:
+    dimensions = value.split(",")
+    unknown = [dimension for dimension in dimensions if dimension not in AggregationProcessor.DIMENSIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown dimensions {', '.join(unknown)}")
+    return dimensions
 
 def main():
     parser = argparse.ArgumentParser(
@@ -18,13 +36,30 @@ def main():
     parser.add_argument("--from", dest="from_date", type=str, help="Only include transactions on or after this date.")
     parser.add_argument("--to", dest="to_date", type=str, help="Only include transactions on or before this date.")
     parser.add_argument("--create-dirs", action="store_true", default=False, help="Create parent directories for output base.")
-    parser.add_argument("--export-types", nargs="+", choices=["csv", "html", "json", "yaml","console"],
-                        help="Export formats (choose one or more: csv, html, json, yaml)")
+    parser.add_argument("--export-types", nargs="+", choices=["csv", "html", "json", "yaml", "qif", "console"],
+                        help="Export formats (choose one or more: csv, html, json, yaml, qif)")
     parser.add_argument("-q", "--quiet", action="store_true",default=False, help="Suppress all output (except CMD if --print-cmd).")
     parser.add_argument("-d", "--debug", action="store_true",default=False, help="Enable detailed debug output.")
     parser.add_argument("--print-cmd", action="store_true", help="Print constructed CMD commands before execution.")
     parser.add_argument("-c", "--configuration-file", type=str, help="Path to a YAML config file with default values.")
     parser.add_argument("--validate", action="store_true", help="Enable validation based on configuration.")
+    parser.add_argument("--profile", action="store_true", default=False, help="Record timings per stage and file and write them to <output_base>.profile.json.")
+    parser.add_argument("--page-workers", type=int, help="Processes per PDF with many pages (default: 1, which disables the page parallel extraction; files are already loaded in parallel).")
+    parser.add_argument("--institutes", nargs="+", choices=["barclays", "consorsbank", "dkb", "ing", "paypal"],
+                        help="Only load statements of these institutes. Other files are never opened.")
+    parser.add_argument("--cache-dir", type=str, help="Directory of the caches which are kept between runs: the file catalog, the balance timeline, the search index, the partner names and the summaries (default: no cache).")
+    parser.add_argument("--no-cache", action="store_true", default=False, help="Neither read nor write the caches, even with --cache-dir.")
+    parser.add_argument("--export-layout", choices=["single", "institute-year", "institute-month"], default="single",
+                        help="Write one file per export type (single) or one per institute and year or month into the directory <output_base>, indexed by a manifest.json. Unchanged partitions are not rewritten.")
+    parser.add_argument("--aggregate", nargs="+", type=aggregation_type, metavar="DIMENSIONS",
+                        help=f"Summaries to export next to the transactions, each a comma separated list of {', '.join(AggregationProcessor.DIMENSIONS)}, e.g. month institute,month partner.")
+    parser.add_argument("--summary-only", action="store_true", default=False, help="Only export the summaries of --aggregate. With --cache-dir, unchanged inputs are answered from the cache without loading them.")
+    parser.add_argument("--match-transfers", action="store_true", default=False, help="Link transfers between the own accounts through a shared transfer_id.")
+    parser.add_argument("--transfer-window", type=int, default=3, help="Days the outgoing and the incoming booking of a transfer may lie apart (default 3).")
+    parser.add_argument("--normalize-partners", action="store_true", default=False, help="Merge the spellings of every partner into one name; always on if the configuration has an alias table under \"partners\".")
+    parser.add_argument("--index", action="store_true", default=False, help="Add the transactions to the search index of search.py in the --cache-dir.")
+    parser.add_argument("--watch", action="store_true", default=False, help="Keep running, poll the input paths and update the exports when statements are added, changed or removed.")
+    parser.add_argument("--watch-interval", type=float, default=5.0, help="Seconds between two polls in watch mode.")
     
     args = parser.parse_args()
     
@@ -39,7 +74,21 @@ def main():
         debug=args.debug,
         validate=args.validate,
         print_cmd=args.print_cmd,
-        recursive=args.recursive
+        recursive=args.recursive,
+        profile=args.profile,
+        watch=args.watch,
+        watch_interval=args.watch_interval,
+        page_workers=args.page_workers,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        selected_institutes=args.institutes,
+        export_layout=args.export_layout,
+        aggregations=args.aggregate,
+        summary_only=args.summary_only,
+        match_transfers=args.match_transfers,
+        transfer_window=args.transfer_window,
+        normalize_partners=args.normalize_partners,
+        index=args.index
         )
     if args.from_date:
         configuration.setFromDate(args.from_date)
@@ -48,43 +97,142 @@ def main():
 
     # Initialize log
     log = Log(configuration)
+    profiler = Profiler(configuration)
+    configuration.catalog = Catalog(configuration)
+    if configuration.shouldKeepTimeline():
+        configuration.timeline = BalanceTimeline(configuration)
+    if configuration.shouldIndex():
+        configuration.search_index = SearchIndex(configuration)
     log.info("Starting main process...")
+
+    if configuration.shouldWatch():
+        try:
+            WatchProcessor(
+                log=log,
+                configuration=configuration
+                ).process()
+        except KeyboardInterrupt:
+            log.info("Watch mode stopped.")
+        return
     
-    # Load
-    loaded_transactions_wrapper = LoadProcessor(
-        log=log,
-        configuration=configuration
-        ).process()
+    # Reports of unchanged inputs are served from the summary cache, without loading the statements
+    cached_summaries = None
+    if configuration.shouldOnlySummarize() and configuration.getAggregations():
+        aggregation_processor = AggregationProcessor(log=log, configuration=configuration)
+        cached_summaries = aggregation_processor.lookup(aggregation_processor.getInputKey())
+
+    if cached_summaries is not None:
+        log.info("The inputs didn't change, exporting the cached summaries.")
+        valid_transactions_wrapper = TransactionsWrapper(log)
+        for summary in cached_summaries:
+            valid_transactions_wrapper.addSummary(summary)
+    else:
+        # Load
+        with profiler.stage("load") as record:
+            loaded_transactions_wrapper = LoadProcessor(
+                log=log,
+                configuration=configuration
+                ).process()
+            record["items"] = len(loaded_transactions_wrapper.getAll())
     
-    # Sort Transactions by Date
-    loaded_transactions_wrapper.sortByDate()
+        # Sort Transactions by Date
+        with profiler.stage("sort") as record:
+            loaded_transactions_wrapper.sortByDate()
+            record["items"] = len(loaded_transactions_wrapper.getAll())
     
-    # Filter
-    filtered_transactions_wrapper=FilterProcessor(
-        log=log,
-        configuration=configuration,
-        transactions_wrapper=loaded_transactions_wrapper
-        ).process()
+        # Balance timelines of the whole history, for the validation and the HTML balances
+        with profiler.stage("timeline") as record:
+            loaded_transactions_wrapper = TimelineProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=loaded_transactions_wrapper
+                ).process()
+            record["items"] = len(configuration.timeline.accounts) if configuration.timeline else 0
+
+        # Full text search index of the whole history
+        with profiler.stage("index") as record:
+            loaded_transactions_wrapper = SearchIndexProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=loaded_transactions_wrapper
+                ).process()
+            record["items"] = len(loaded_transactions_wrapper.getAll())
+
+        # Filter
+        with profiler.stage("filter") as record:
+            filtered_transactions_wrapper=FilterProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=loaded_transactions_wrapper
+                ).process()
+            record["items"] = len(filtered_transactions_wrapper.getAll())
     
-    log.debug(f"{len(filtered_transactions_wrapper.getAll())} filtered.")
+        log.debug(f"{len(filtered_transactions_wrapper.getAll())} filtered.")
+
+        # Link transfers between the own accounts
+        with profiler.stage("transfers") as record:
+            filtered_transactions_wrapper=TransferProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=filtered_transactions_wrapper
+                ).process()
+            record["items"] = len(filtered_transactions_wrapper.getAll())
+
+        # Canonical partner names
+        with profiler.stage("partners") as record:
+            filtered_transactions_wrapper=PartnerProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=filtered_transactions_wrapper
+                ).process()
+            record["items"] = len(filtered_transactions_wrapper.getAll())
+
+        # Categorize
+        with profiler.stage("categorize") as record:
+            filtered_transactions_wrapper=CategorizationProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=filtered_transactions_wrapper
+                ).process()
+            record["items"] = len(filtered_transactions_wrapper.getAll())
+
+        # Aggregate
+        with profiler.stage("aggregate") as record:
+            filtered_transactions_wrapper=AggregationProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=filtered_transactions_wrapper
+                ).process()
+            record["items"] = len(filtered_transactions_wrapper.getSummaries())
     
-    # Validate
-    valid_transactions_wrapper=ValidatorProcessor(
-        log=log,
-        configuration=configuration,
-        transactions_wrapper=filtered_transactions_wrapper
-        ).process()
+        # Validate
+        with profiler.stage("validate") as record:
+            valid_transactions_wrapper=ValidatorProcessor(
+                log=log,
+                configuration=configuration,
+                transactions_wrapper=filtered_transactions_wrapper
+                ).process()
+            record["items"] = len(valid_transactions_wrapper.getAll())
 
-    log.debug(f"{len(filtered_transactions_wrapper.getAll())} validated.")
+        log.debug(f"{len(filtered_transactions_wrapper.getAll())} validated.")
 
     # Export
-    exported_transactions_wrapper=ExportProcessor(
-        log=log,
-        configuration=configuration,
-        transactions_wrapper=valid_transactions_wrapper
-        ).process() 
+    with profiler.stage("export") as record:
+        exported_transactions_wrapper=ExportProcessor(
+            log=log,
+            configuration=configuration,
+            transactions_wrapper=valid_transactions_wrapper
+            ).process() 
+        record["items"] = len(exported_transactions_wrapper.getAll())
     
     log.debug(f"{len(valid_transactions_wrapper.getAll())} exported.")
+
+    if profiler.isEnabled():
+        profile_file = configuration.getOutputBase() + ".profile.json"
+        profiler.writeReport(profile_file)
+        if not configuration.isQuiet():
+            profiler.printSummary()
+        log.info(f"Profile written to {profile_file}")
     
     if log.error_count > 0:
         log.error("Program failed. This program produced {log.error_count} errors.")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+from code.model.log import Log
+from code.model.configuration import Configuration
+from code.model.search_index import SearchIndex
+
+def format_result(row:dict)->str:
+    value = f"{row['value']:.2f} {row.get('currency') or ''}".strip() if row.get("value") is not None else "-"
+    references = " ".join(str(row[key]) for key in ("invoice_id", "invoice_mandate_reference", "invoice_customer_reference") if row.get(key))
+    description = " ".join((row.get("description") or "").split())
+    return "  ".join([
+        f"{row['score']:8.3f}",
+        row["date"],
+        f"{row.get('owner_institute') or '':<12}",
+        f"{value:>16}",
+        f"{row.get('partner_name') or row.get('partner_id') or '':<30.30}",
+        f"{description[:60]}" + (f" [{references}]" if references else ""),
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search the descriptions, partners and references of all transactions indexed by main.py, best matches first."
+    )
+    parser.add_argument("query", type=str, nargs="+", help="Words which have to occur, e.g. 'invoice 2023-114'; 'rew*' matches prefixes.")
+    parser.add_argument("--cache-dir", type=str, default=".momo-cache", help="Cache directory of main.py which holds the index (default: .momo-cache).")
+    parser.add_argument("--from", dest="from_date", type=str, help="Only show transactions on or after this date (YYYY-MM-DD).")
+    parser.add_argument("--to", dest="to_date", type=str, help="Only show transactions on or before this date (YYYY-MM-DD).")
+    parser.add_argument("--institute", type=str, help="Only show transactions of this institute.")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="Number of results (default: 20).")
+    parser.add_argument("--json", action="store_true", default=False, help="Print the matching transactions as JSON.")
+    parser.add_argument("-q", "--quiet", action="store_true", default=False, help="Suppress all output but the results.")
+    parser.add_argument("-d", "--debug", action="store_true", default=False, help="Enable detailed debug output.")
+    args = parser.parse_args()
+
+    configuration = Configuration(
+        configuration_file=None,
+        input_paths=[],
+        output_base=None,
+        export_types=[],
+        create_dirs=False,
+        quiet=args.quiet,
+        debug=args.debug,
+        validate=False,
+        print_cmd=False,
+        recursive=False,
+        cache_dir=args.cache_dir
+        )
+    log = Log(configuration)
+
+    search_index = SearchIndex(configuration)
+    if not os.path.exists(search_index.path):
+        log.error(f"No search index in {args.cache_dir}. Run main.py with --index and this cache directory first.")
+        sys.exit(1)
+    results = search_index.search(" ".join(args.query), from_date=args.from_date, to_date=args.to_date,
+                                  institute=args.institute, limit=args.limit)
+    search_index.close()
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    for row in results:
+        print(format_result(row))
+    log.info(f"{len(results)} results.")
+
+if __name__ == "__main__":
+    main()
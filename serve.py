@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+from code.model.log import Log
+from code.model.configuration import Configuration
+from code.model.export_manifest import ExportManifest
+from code.processor.load import LoadProcessor
+from code.processor.filter import FilterProcessor
+from code.server.index import TransactionIndex
+from code.server.service import QueryServer
+
+def load_partitions(log:Log, configuration:Configuration, manifest_path:str)->[dict]:
+    """
+    Reads the JSON partitions of a partitioned export. Partitions outside
+    of --from/--to are not opened.
+    """
+    manifest = ExportManifest.load(os.path.dirname(os.path.abspath(manifest_path)))
+    if not manifest:
+        log.error(f"{manifest_path} is no export manifest.")
+        return []
+    from_date = configuration.getFromDatetime()
+    to_date = configuration.getToDatetime()
+    from_date = from_date.strftime("%Y-%m-%d") if from_date else None
+    to_date = to_date.strftime("%Y-%m-%d") if to_date else None
+    rows = []
+    for partition in manifest.partitions.values():
+        if (from_date and partition["last_date"] < from_date) or (to_date and partition["first_date"] > to_date):
+            continue
+        if "json" not in partition["files"]:
+            log.warning(f"Partition {partition['key']} has no JSON export.")
+            continue
+        with open(os.path.join(manifest.directory, partition["files"]["json"]), "r", encoding="utf-8") as f:
+            rows.extend(row for row in json.load(f)
+                        if (not from_date or row["date"] >= from_date) and (not to_date or row["date"] <= to_date))
+    return rows
+
+def load_rows(log:Log, configuration:Configuration)->[dict]:
+    """
+    Reads the rows of JSON exports and export manifests directly, all
+    other inputs are extracted by the LoadProcessor.
+    """
+    input_paths = configuration.getInputPaths()
+    if all(path.lower().endswith(".json") for path in input_paths):
+        rows = []
+        for path in input_paths:
+            if os.path.basename(path) == ExportManifest.FILE_NAME:
+                rows.extend(load_partitions(log, configuration, path))
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                rows.extend(json.load(f))
+        return rows
+    transactions_wrapper = LoadProcessor(log=log, configuration=configuration).process()
+    transactions_wrapper = FilterProcessor(log=log, configuration=configuration, transactions_wrapper=transactions_wrapper).process()
+    return [transaction.getDictionary() for transaction in transactions_wrapper.getAll()]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load transactions once and answer filtered, paginated JSON queries over HTTP."
+    )
+    parser.add_argument("input_paths", type=str, nargs="+", help="Paths to PDF/CSV files or directories, or to JSON exports or the manifest.json of a partitioned export of main.py.")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Recursively search for PDF files.")
+    parser.add_argument("--from", dest="from_date", type=str, help="Only load transactions on or after this date.")
+    parser.add_argument("--to", dest="to_date", type=str, help="Only load transactions on or before this date.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("-q", "--quiet", action="store_true", default=False, help="Suppress all output.")
+    parser.add_argument("-d", "--debug", action="store_true", default=False, help="Enable detailed debug output, including every request.")
+    parser.add_argument("-c", "--configuration-file", type=str, help="Path to a YAML config file with default values.")
+    args = parser.parse_args()
+
+    configuration = Configuration(
+        configuration_file=args.configuration_file,
+        input_paths=args.input_paths,
+        output_base=None,
+        export_types=[],
+        create_dirs=False,
+        quiet=args.quiet,
+        debug=args.debug,
+        validate=False,
+        print_cmd=False,
+        recursive=args.recursive
+        )
+    if args.from_date:
+        configuration.setFromDate(args.from_date)
+    if args.to_date:
+        configuration.setToDate(args.to_date)
+    log = Log(configuration)
+
+    index = TransactionIndex(load_rows(log, configuration))
+    server = QueryServer((args.host, args.port), index, log)
+    log.info(f"Serving {len(index.rows)} transactions on http://{args.host}:{server.server_address[1]}/transactions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Server stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
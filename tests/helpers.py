@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from code.model.account import OwnerAccount
+from code.model.configuration import Configuration
+from code.model.log import Log
+from code.model.transaction import Transaction
+
+def create_configuration(configuration_file:str=None, input_paths:[str]=None, output_base:str=None, export_types:[str]=None,
+                         **options)->Configuration:
+    """
+    Returns a quiet configuration together with its log. The options are
+    further keyword arguments of Configuration, e.g. validate=True.
+    """
+    arguments = {
+        "configuration_file":   configuration_file,
+        "input_paths":          input_paths or [],
+        "output_base":          output_base,
+        "export_types":         export_types or [],
+        "create_dirs":          False,
+        "quiet":                True,
+        "debug":                False,
+        "validate":             False,
+        "print_cmd":            False,
+        "recursive":            False,
+    }
+    arguments.update(options)
+    configuration = Configuration(**arguments)
+    Log(configuration)
+    return configuration
+
+def create_transaction(log:Log, day:str, value:str, source:str="statement.csv", owner_id:str=None, institute:str=None,
+                       partner:str=None, partner_id:str=None, description:str="", currency:str="EUR")->Transaction:
+    """Returns a booking of the owner account with its id set."""
+    transaction = Transaction(log, source, owner=OwnerAccount(log, id=owner_id, institute=institute))
+    transaction.setTransactionDate(day)
+    transaction.setValue(value)
+    transaction.currency = currency
+    transaction.partner.name = partner
+    transaction.partner.id = partner_id
+    transaction.description = description
+    transaction.setTransactionId()
+    return transaction
+
+class StatementsTestCase(unittest.TestCase):
+    """
+    Runs every test in a temporary directory with an empty statements
+    directory and a configuration file holding CONFIGURATION.
+    """
+    CONFIGURATION = "institutes: {}\n"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp_dir.name, "statements")
+        os.makedirs(self.input_dir)
+        self.configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(self.configuration_file, "w", encoding="utf-8") as f:
+            f.write(self.CONFIGURATION)
+        self.output_base = os.path.join(self.tmp_dir.name, "output", "transactions")
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name:str)->str:
+        """Returns the path of a statement in the statements directory."""
+        return os.path.join(self.input_dir, name)
+
+    def _configuration(self, **options)->Configuration:
+        """Returns the configuration of a run over the statements directory."""
+        options.setdefault("input_paths", [self.input_dir])
+        options.setdefault("output_base", self.output_base)
+        return create_configuration(self.configuration_file, **options)
@@ -0,0 +1,65 @@
+import os
+import unittest
+from code.benchmark.generator import StatementGenerator
+from code.model.configuration import Configuration
+from code.model.log import Log
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.aggregation import AggregationProcessor
+from code.processor.exporter import ExportProcessor
+from code.processor.load import LoadProcessor
+from tests.helpers import StatementsTestCase, create_transaction
+
+class TestAggregationProcessor(StatementsTestCase):
+    def setUp(self):
+        super().setUp()
+        generator = StatementGenerator(seed=6)
+        for month in (1, 2):
+            generator.writeDkbCsv(self.path(f"Umsaetze_2023-{month:02d}.dkb.csv"), 5, 2023, month)
+
+    def _configuration(self, aggregations:[[str]])->Configuration:
+        return super()._configuration(export_types=["csv"], create_dirs=True, cache_dir=self.cache_dir, aggregations=aggregations)
+
+    def _transaction(self, log:Log, day:str, value:str, partner:str, currency:str="EUR")->Transaction:
+        return create_transaction(log, day, value, institute="ING", partner=partner, currency=currency)
+
+    def test_group_by(self):
+        configuration = self._configuration([["month"], ["partner"]])
+        log = configuration.log
+        transactions_wrapper = TransactionsWrapper(log, [
+            self._transaction(log, "2023-01-03", "-10.50", "REWE"),
+            self._transaction(log, "2023-01-20", "2000.00", "Arbeitgeber"),
+            self._transaction(log, "2023-02-01", "-4.25", "REWE"),
+            self._transaction(log, "2023-02-02", "-3.00", "Shop", "USD"),
+        ])
+        months, partners = AggregationProcessor(log, configuration, transactions_wrapper).aggregate(configuration.getAggregations())
+        self.assertEqual(months.getRows(), [
+            {"month": "2023-01", "currency": "EUR", "count": 2, "sum": 1989.5, "min": -10.5, "max": 2000.0, "running_balance": 1989.5},
+            {"month": "2023-02", "currency": "EUR", "count": 1, "sum": -4.25, "min": -4.25, "max": -4.25, "running_balance": 1985.25},
+            {"month": "2023-02", "currency": "USD", "count": 1, "sum": -3.0, "min": -3.0, "max": -3.0, "running_balance": -3.0},
+        ])
+        rewe = next(row for row in partners.getRows() if row["partner"] == "REWE")
+        self.assertEqual((rewe["count"], rewe["sum"], rewe["min"], rewe["max"]), (2, -14.75, -10.5, -4.25))
+        self.assertNotIn("running_balance", rewe)
+
+    def test_summaries_are_cached_and_exported(self):
+        configuration = self._configuration([["institute", "month"]])
+        transactions_wrapper = LoadProcessor(configuration.log, configuration).process()
+        transactions_wrapper = AggregationProcessor(configuration.log, configuration, transactions_wrapper).process()
+        summary = transactions_wrapper.getSummaries()[0]
+        self.assertEqual([row["month"] for row in summary.getRows()], ["2023-01", "2023-02"])
+        self.assertEqual(sum(row["count"] for row in summary.getRows()), 10)
+
+        aggregation_processor = AggregationProcessor(configuration.log, configuration)
+        self.assertEqual(aggregation_processor.lookup(aggregation_processor.getInputKey())[0].getRows(), summary.getRows())
+        # A changed input file invalidates the cache
+        os.utime(os.path.join(self.input_dir, "Umsaetze_2023-02.dkb.csv"), (1, 1))
+        self.assertIsNone(aggregation_processor.lookup(aggregation_processor.getInputKey()))
+
+        ExportProcessor(configuration.log, configuration, transactions_wrapper).process()
+        self.assertTrue(os.path.exists(self.output_base + ".csv"))
+        self.assertTrue(os.path.exists(self.output_base + ".summary-institute-month.csv"))
+        self.assertEqual(configuration.log.error_count, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+from code.helper.aho_corasick import AhoCorasick
+from code.mapper.qif_mapper import build_qif_from_csv
+from code.model.category_rules import CategoryRules
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.categorization import CategorizationProcessor
+from tests.helpers import create_configuration, create_transaction
+from code.processor.exporter import ExportProcessor
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_overlapping_patterns(self):
+        automaton = AhoCorasick()
+        for value, pattern in enumerate(["he", "she", "his", "hers"]):
+            automaton.add(pattern, value)
+        automaton.build()
+        self.assertEqual(automaton.search("ushers"), {0, 1, 3})
+        self.assertEqual(automaton.search("xyz"), set())
+
+    def test_same_as_substring_search(self):
+        generator = random.Random(4)
+        patterns = ["".join(generator.choice("abc") for _ in range(generator.randint(1, 4))) for _ in range(40)]
+        automaton = AhoCorasick()
+        for value, pattern in enumerate(patterns):
+            automaton.add(pattern, value)
+        automaton.build()
+        for _ in range(200):
+            text = "".join(generator.choice("abcd") for _ in range(generator.randint(0, 12)))
+            self.assertEqual(automaton.search(text), {value for value, pattern in enumerate(patterns) if pattern in text})
+
+class TestCategorization(unittest.TestCase):
+    RULES = (
+        "categories:\n"
+        "  - category: Groceries\n"
+        "    partner: [rewe, EDEKA]\n"
+        "  - category: Rent\n"
+        "    description: Miete\n"
+        "    max: 0\n"
+        "  - category: Salary\n"
+        "    regex: '^gehalt \\d+'\n"
+        "    min: 0\n"
+        "    institute: ING\n"
+        "  - category: Refund\n"
+        "    min: 0.01\n"
+        "qif:\n"
+        "  categories:\n"
+        "    Groceries: Expenses:Groceries\n"
+    )
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write(self.RULES)
+        self.output_base = os.path.join(self.tmp_dir.name, "transactions")
+        self.configuration = create_configuration(configuration_file, output_base=self.output_base, export_types=["csv", "qif"])
+        self.log = self.configuration.log
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _transaction(self, value:str, partner:str, description:str="")->Transaction:
+        return create_transaction(self.log, "2023-01-05", value, institute="ING", partner=partner, description=description)
+
+    def test_rules(self):
+        category_rules = CategoryRules(self.configuration.getCategoryRules())
+        categorize = lambda *arguments: category_rules.categorize(self._transaction(*arguments))
+        self.assertEqual(categorize("-12.30", "REWE Markt GmbH"), "Groceries")
+        self.assertEqual(categorize("-900.00", "Vermieter", "Miete Januar"), "Rent")
+        # All conditions of a rule have to match
+        self.assertEqual(categorize("900.00", "Vermieter", "Miete zurück"), "Refund")
+        self.assertEqual(categorize("2500.00", "Arbeitgeber", "Gehalt 01/2023"), "Salary")
+        self.assertIsNone(categorize("-5.00", "Bäcker", "Brötchen"))
+        with self.assertRaises(ValueError):
+            CategoryRules([{"partner": "rewe"}])
+
+    def test_categories_feed_the_exports(self):
+        transactions_wrapper = TransactionsWrapper(self.log, [
+            self._transaction("-12.30", "REWE Markt GmbH", "Einkauf"),
+            self._transaction("-5.00", "Bäcker", "Brötchen"),
+        ])
+        transactions_wrapper = CategorizationProcessor(self.log, self.configuration, transactions_wrapper).process()
+        ExportProcessor(self.log, self.configuration, transactions_wrapper).process()
+        with open(self.output_base + ".qif", encoding="utf-8") as f:
+            self.assertIn("SExpenses:Groceries\n$12.30", f.read())
+
+        output_qif = os.path.join(self.tmp_dir.name, "groceries.qif")
+        build_qif_from_csv(self.output_base + ".csv", output_qif, "Assets:Bank:ING", "Income:Misc", "Expenses:Food",
+                           filter_category="Groceries")
+        with open(output_qif, encoding="utf-8") as f:
+            qif = f.read()
+        self.assertIn("T-12.30\nPREWE Markt GmbH\nMEinkauf", qif)
+        self.assertNotIn("Brötchen", qif)
+        self.assertEqual(self.log.error_count, 0)
+
+if __name__ == "__main__":
+    unittest.main()
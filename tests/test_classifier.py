@@ -0,0 +1,49 @@
+import os
+import unittest
+from code.benchmark.generator import StatementGenerator
+from code.factories.extractor import ExtractorFactory
+from code.model.catalog import Catalog
+from code.model.configuration import Configuration
+from code.processor.load import LoadProcessor
+from tests.helpers import StatementsTestCase
+
+class TestClassifier(StatementsTestCase):
+    def setUp(self):
+        super().setUp()
+        generator = StatementGenerator(seed=6)
+        generator.writeIngPdf(self.path("statement.ing.pdf"), 3, 2023, 1)
+        generator.writeDkbCsv(self.path("export.csv"), 3, 2023, 1)
+        generator.writePaypalCsv(self.path("download.csv"), 3, 2023, 1)
+        with open(self.path("fake.barclays.pdf"), "w", encoding="utf-8") as f:
+            f.write("not a pdf")
+        with open(self.path("statement.unknownbank.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4\n")
+
+    def _configuration(self, selected_institutes:[str]=None)->Configuration:
+        configuration = super()._configuration(selected_institutes=selected_institutes, cache_dir=self.cache_dir)
+        configuration.catalog = Catalog(configuration)
+        return configuration
+
+    def test_classify_by_suffix_and_magic_bytes(self):
+        configuration = self._configuration()
+        factory = ExtractorFactory(configuration.log, configuration)
+        self.assertEqual(factory.classify(self.path("statement.ing.pdf")), "ing")
+        self.assertEqual(factory.classify(self.path("export.csv")), "dkb")
+        self.assertEqual(factory.classify(self.path("download.csv")), "paypal")
+        self.assertIsNone(factory.classify(self.path("fake.barclays.pdf")))
+        self.assertIsNone(factory.classify(self.path("statement.unknownbank.pdf")))
+        self.assertEqual(configuration.catalog.lookup(self.path("export.csv"))["institute"], "dkb")
+
+    def test_unselected_files_are_never_opened(self):
+        configuration = self._configuration(["dkb", "paypal"])
+        load_processor = LoadProcessor(configuration.log, configuration)
+        opened = []
+        read_head = load_processor.extractor_factory._readHead
+        load_processor.extractor_factory._readHead = lambda file_path, size: opened.append(os.path.basename(file_path)) or read_head(file_path, size)
+        files = sorted(os.path.basename(file_path) for file_path in load_processor.discover())
+        self.assertEqual(files, ["download.csv", "export.csv"])
+        self.assertNotIn("statement.ing.pdf", opened)
+        self.assertNotIn("fake.barclays.pdf", opened)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from code.extractor.csv.dkb.extractor import DkbCSVExtractor
+from code.extractor.csv.paypal.extractor import PaypalCSVExtractor
+from tests.helpers import create_configuration
+
+class TestPaypalCSVExtractor(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes:\n  paypal:\n    owner:\n      id: max@example.com\n      name: Max Mustermann\n")
+        self.configuration = create_configuration(configuration_file)
+        self.log = self.configuration.log
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _extract(self, content:str)->list:
+        path = os.path.join(self.tmp_dir.name, "Download.paypal.csv")
+        with open(path, "w", encoding="utf-8-sig") as f:
+            f.write(content)
+        return PaypalCSVExtractor(path, self.log, self.configuration).extract_transactions()
+
+    def test_rows(self):
+        transactions = self._extract(
+            '"Datum","Uhrzeit","Zeitzone","Name","Währung","Netto","Absender E-Mail-Adresse","Transaktionscode","Beschreibung","Rechnungsnummer"\n'
+            '"03.01.2023","15:53:39","Europe/Berlin","Lidl","EUR","-1989,06","lidl@example.com","0001","Einkauf","INV-1"\n'
+            '"4.1.2023","08:05","UTC","Shop","USD","12.50","shop@example.com","0002","Abo",""\n')
+        self.assertEqual(len(transactions), 2)
+        first, second = transactions
+        self.assertEqual(first.date, datetime(2023, 1, 3, 15, 53, 39, tzinfo=ZoneInfo("Europe/Berlin")))
+        self.assertEqual(first.value, -198906)
+        self.assertEqual(first.id, "0001")
+        self.assertEqual(first.invoice.id, "INV-1")
+        self.assertEqual(first.partner.institute, "Paypal")
+        self.assertEqual((first.owner.id, first.owner.name), ("max@example.com", "Max Mustermann"))
+        # Irregular formats take the generic parsers
+        self.assertEqual(second.date, datetime(2023, 1, 4, 8, 5, tzinfo=ZoneInfo("UTC")))
+        self.assertEqual(second.value, 1250)
+        self.assertEqual(second.related_transaction_id, "")
+        self.assertEqual(self.log.error_count, 0)
+
+    def test_rows_without_owner_are_rejected(self):
+        with open(self.configuration.configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes:\n  paypal: {}\n")
+        self.configuration._loadConfigurationFile()
+        transactions = self._extract(
+            '"Datum","Uhrzeit","Zeitzone","Name","Währung","Netto","Absender E-Mail-Adresse","Transaktionscode"\n'
+            '"03.01.2023","15:53:39","Europe/Berlin","Lidl","EUR","-1989,06","lidl@example.com","0001"\n')
+        self.assertEqual(transactions, [])
+        self.assertGreater(self.log.warnings_count, 0)
+
+class TestDkbCSVExtractor(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.configuration = create_configuration(configuration_file)
+        self.log = self.configuration.log
+        self.path = os.path.join(self.tmp_dir.name, "Umsaetze.dkb.csv")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(
+                '"Girokonto";"DE86120300000175808468"\n'
+                '"Kontostand vom 31.01.2023:";"1.234,56 €"\n'
+                '\n'
+                '"Buchungsdatum";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"IBAN";"Betrag (€)"\n'
+                '"02.01.23";"Max Mustermann";"REWE";"Einkauf";"DE73100100109705237580";"-1.830,96"\n'
+                '"";"";"";"";"";""\n'
+                '"03.01.23";"Arbeitgeber";"Max Mustermann";"Gehalt";"DE11100100100000000001";"2.500,00"\n'
+                '"04.01.23";"Max Mustermann";"Bäcker";"Brötchen";"DE22100100100000000002";"-3,50"\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_rows(self):
+        transactions = DkbCSVExtractor(self.path, self.log, self.configuration).extract_transactions()
+        self.assertEqual([transaction.value for transaction in transactions], [-183096, 250000, -350])
+        self.assertEqual([transaction.partner.name for transaction in transactions], ["REWE", "Arbeitgeber", "Bäcker"])
+        self.assertTrue(all(transaction.owner.id == "DE86120300000175808468" for transaction in transactions))
+        self.assertEqual(transactions[0].date.isoformat(), "2023-01-02")
+        self.assertTrue(all(transaction.id for transaction in transactions))
+        # Rows of the same owner share one account
+        self.assertIs(transactions[0].owner, transactions[2].owner)
+
+    def test_rows_without_owner_are_rejected(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(
+                '"Girokonto";""\n'
+                '\n'
+                '"Buchungsdatum";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"IBAN";"Betrag (€)"\n'
+                '"02.01.23";"";"REWE";"Einkauf";"DE73100100109705237580";"-1.830,96"\n'
+                '"03.01.23";"Arbeitgeber";"Max Mustermann";"Gehalt";"DE11100100100000000001";"2.500,00"\n')
+        transactions = DkbCSVExtractor(self.path, self.log, self.configuration).extract_transactions()
+        # Only the row with a payee as owner name is kept
+        self.assertEqual([transaction.value for transaction in transactions], [250000])
+        self.assertGreater(self.log.warnings_count, 0)
+
+    def test_missing_header(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('"Girokonto";"DE86120300000175808468"\n')
+        self.assertEqual(DkbCSVExtractor(self.path, self.log, self.configuration).extract_transactions(), [])
+        self.assertEqual(self.log.error_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from code.benchmark.generator import StatementGenerator
+from code.processor.exporter import ExportProcessor
+from code.processor.load import LoadProcessor
+from tests.helpers import create_configuration
+
+class TestExport(unittest.TestCase):
+    EXPORT_TYPES = ["csv", "json", "yaml", "qif"]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        input_dir = os.path.join(self.tmp_dir.name, "statements")
+        os.makedirs(input_dir)
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes:\n  paypal:\n    owner:\n      id: max@example.com\n")
+        generator = StatementGenerator(seed=9)
+        generator.writeDkbCsv(os.path.join(input_dir, "Umsaetze.dkb.csv"), 30, 2023, 1)
+        self.dkb_bookings = generator.bookings
+        generator.writeDkbCsv(os.path.join(input_dir, "Tagesgeld.dkb.csv"), 5, 2023, 1)
+        self.savings_bookings = generator.bookings
+        generator.writePaypalCsv(os.path.join(input_dir, "Download.paypal.csv"), 20, 2023, 1)
+        self.paypal_bookings = generator.bookings
+        self.configuration = create_configuration(configuration_file, [input_dir], os.path.join(self.tmp_dir.name, "concurrent", "transactions"),
+                                                  self.EXPORT_TYPES, create_dirs=True)
+        self.log = self.configuration.log
+        self.transactions_wrapper = LoadProcessor(self.log, self.configuration).process()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _read(self, path:str)->bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_concurrent_exports_match_single_exports(self):
+        processor = ExportProcessor(self.log, self.configuration, self.transactions_wrapper)
+        processor.process()
+        for export_type in self.EXPORT_TYPES:
+            with self.subTest(export_type=export_type):
+                # Every exporter on its own, flattening and sorting the transactions itself
+                output_file = os.path.join(self.tmp_dir.name, f"single.{export_type}")
+                processor._getExporterClass(export_type)(self.transactions_wrapper, self.configuration, self.log, output_file).export()
+                self.assertEqual(self._read(f"{self.configuration.getOutputBase()}.{export_type}"), self._read(output_file))
+        self.assertEqual(self.log.error_count, 0)
+
+    def test_json_rows_are_flat(self):
+        ExportProcessor(self.log, self.configuration, self.transactions_wrapper).process()
+        with open(f"{self.configuration.getOutputBase()}.json", encoding="utf-8") as f:
+            rows = json.load(f)
+        self.assertEqual(len(rows), 55)
+        self.assertEqual([row["date"] for row in rows], sorted(row["date"] for row in rows))
+        # Partner, owner and invoice are prefixed columns instead of nested objects
+        self.assertFalse(any(isinstance(value, (dict, list)) for row in rows for value in row.values()))
+        self.assertTrue({"partner_name", "owner_id", "owner_institute", "invoice_id"} <= set(rows[0]))
+        self.assertNotIn("partner", rows[0])
+
+    def test_console_prints_every_transaction(self):
+        self.configuration.export_types = ["console"]
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            ExportProcessor(self.log, self.configuration, self.transactions_wrapper).process()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 55)
+        self.assertEqual(self.log.error_count, 0)
+        columns = lines[0].split("\t")
+        first = self.transactions_wrapper.getAll()[0]
+        self.assertEqual(columns[3], first.getSender().getIdentity())
+        self.assertEqual(columns[5], first.owner.institute)
+
+    def test_qif_has_a_register_per_owner_account(self):
+        self.configuration.export_types = ["qif"]
+        ExportProcessor(self.log, self.configuration, self.transactions_wrapper).process()
+        with open(f"{self.configuration.getOutputBase()}.qif", encoding="utf-8") as f:
+            blocks = f.read().split("!Account\n")[1:]
+        totals = {}
+        for block in blocks:
+            header, bookings = block.split("!Type:Bank\n")
+            totals[header.splitlines()[0][1:]] = sum(Decimal(line[1:]) for line in bookings.splitlines() if line.startswith("T"))
+        owners = {transaction.source: transaction.owner.id for transaction in self.transactions_wrapper.getAll()}
+        dkb_id = next(owner_id for source, owner_id in owners.items() if source.endswith("Umsaetze.dkb.csv"))
+        savings_id = next(owner_id for source, owner_id in owners.items() if source.endswith("Tagesgeld.dkb.csv"))
+        self.assertEqual(totals, {
+            f"Assets:Bank:DKB:{dkb_id}":     Decimal(sum(cents for _, cents in self.dkb_bookings)) / 100,
+            f"Assets:Bank:DKB:{savings_id}": Decimal(sum(cents for _, cents in self.savings_bookings)) / 100,
+            "Assets:Bank:Paypal":           Decimal(sum(cents for _, cents in self.paypal_bookings)) / 100,
+        })
+
+if __name__ == "__main__":
+    unittest.main()
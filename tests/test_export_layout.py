@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from code.benchmark.generator import StatementGenerator
+from code.model.export_manifest import ExportManifest
+from code.processor.exporter import ExportProcessor
+from code.processor.load import LoadProcessor
+from tests.helpers import create_configuration
+
+class TestPartitionedExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp_dir.name, "statements")
+        os.makedirs(self.input_dir)
+        self.configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(self.configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes:\n  paypal:\n    owner:\n      id: max@example.com\n")
+        self.output_base = os.path.join(self.tmp_dir.name, "output", "transactions")
+        self.generator = StatementGenerator(seed=5)
+        for month in (1, 2):
+            self.generator.writeDkbCsv(os.path.join(self.input_dir, f"Umsaetze_2023-{month:02d}.dkb.csv"), 4, 2023, month)
+        self.generator.writePaypalCsv(os.path.join(self.input_dir, "Download_2023-01.paypal.csv"), 3, 2023, 1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _export(self, layout:str="institute-month", export_types:[str]=None, errors:int=0)->ExportManifest:
+        configuration = create_configuration(self.configuration_file, [self.input_dir], self.output_base, export_types or ["csv", "json"],
+                                             create_dirs=True, export_layout=layout)
+        log = configuration.log
+        ExportProcessor(log, configuration, LoadProcessor(log, configuration).process()).process()
+        self.assertEqual(log.error_count, errors)
+        return ExportManifest.load(self.output_base)
+
+    def _mtimes(self)->dict:
+        return {path: os.stat(path).st_mtime_ns for path in self._export_files()}
+
+    def _export_files(self)->set:
+        return {os.path.join(directory, name) for directory, _, names in os.walk(self.output_base)
+                for name in names if name != ExportManifest.FILE_NAME}
+
+    def test_partitions_and_manifest(self):
+        manifest = self._export()
+        self.assertEqual(sorted(manifest.partitions), ["dkb/2023-01", "dkb/2023-02", "paypal/2023-01"])
+        partition = manifest.getPartition("dkb/2023-02")
+        self.assertEqual(partition["transactions"], 4)
+        self.assertEqual(partition["files"], {"csv": "dkb/2023-02.csv", "json": "dkb/2023-02.json"})
+        with open(os.path.join(self.output_base, "dkb", "2023-02.json"), encoding="utf-8") as f:
+            rows = json.load(f)
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row["date"].startswith("2023-02") for row in rows))
+        self.assertEqual(len(self._export_files()), 6)
+
+    def test_only_changed_partitions_are_rewritten(self):
+        self._export()
+        before = self._mtimes()
+        self._export()
+        self.assertEqual(self._mtimes(), before)
+
+        # A new statement touches a single partition
+        self.generator.writeDkbCsv(os.path.join(self.input_dir, "Umsaetze_2023-03.dkb.csv"), 2, 2023, 3)
+        self._export()
+        after = self._mtimes()
+        self.assertEqual({path for path in after if after[path] != before.get(path)},
+                         {os.path.join(self.output_base, "dkb", "2023-03.csv"), os.path.join(self.output_base, "dkb", "2023-03.json")})
+
+        # Removed statements and other layouts leave no stale files
+        os.remove(os.path.join(self.input_dir, "Download_2023-01.paypal.csv"))
+        manifest = self._export("institute-year", ["csv"])
+        self.assertEqual(sorted(manifest.partitions), ["dkb/2023"])
+        self.assertEqual(self._export_files(), {os.path.join(self.output_base, "dkb", "2023.csv")})
+
+    def test_failed_partitions_are_written_again(self):
+        failing_file = os.path.join(self.output_base, "dkb", "2023-02.json")
+        dump = json.dump
+
+        def failing_dump(data, f, **kwargs):
+            if f.name == failing_file:
+                f.write("[")
+                raise OSError("No space left on device")
+            dump(data, f, **kwargs)
+
+        # The exporter logs the error itself
+        with mock.patch("code.exporter.json.json.dump", failing_dump):
+            manifest = self._export(errors=1)
+        self.assertIsNone(manifest.getPartition("dkb/2023-02")["digest"])
+        self.assertIsNotNone(manifest.getPartition("dkb/2023-01")["digest"])
+
+        before = self._mtimes()
+        manifest = self._export()
+        after = self._mtimes()
+        self.assertIsNotNone(manifest.getPartition("dkb/2023-02")["digest"])
+        self.assertEqual({path for path in after if after[path] != before[path]},
+                         {failing_file, os.path.join(self.output_base, "dkb", "2023-02.csv")})
+        with open(failing_file, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+from code.helper.money import to_cents, parse_german_amount, cents_to_decimal, cents_to_float, format_cents
+from code.model.transaction import Transaction
+from code.validator.transaction import Validator
+from tests.helpers import create_configuration
+
+class TestMoney(unittest.TestCase):
+    def test_to_cents(self):
+        self.assertEqual(to_cents("-1234.56"), -123456)
+        self.assertEqual(to_cents("12.3"), 1230)
+        self.assertEqual(to_cents(0.1), 10)
+        self.assertEqual(to_cents(5), 500)
+        self.assertEqual(to_cents(Decimal("2.345")), 235)
+        with self.assertRaises(ValueError):
+            to_cents("abc")
+
+    def test_parse_german_amount(self):
+        self.assertEqual(parse_german_amount("1.234,56"), 123456)
+        self.assertEqual(parse_german_amount("1.234,56-"), -123456)
+        self.assertEqual(parse_german_amount("-8.063,23"), -806323)
+        self.assertEqual(parse_german_amount("20,45+"), 2045)
+        self.assertEqual(parse_german_amount("1.234,5 €"), 123450)
+        for invalid in ("", "-", "1,234", "12a,00"):
+            with self.assertRaises(ValueError):
+                parse_german_amount(invalid)
+
+    def test_output_edge(self):
+        self.assertEqual(cents_to_decimal(-123456), Decimal("-1234.56"))
+        self.assertEqual(cents_to_float(123456), 1234.56)
+        self.assertEqual(format_cents(-5), "-0.05")
+        self.assertEqual(format_cents(123456), "1234.56")
+
+class TestValidatorCents(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.log = create_configuration(configuration_file).log
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sum_is_exact(self):
+        transactions = []
+        for day in range(1, 11):
+            transaction = Transaction(self.log, "statement.csv")
+            transaction.setTransactionDate(f"2023-01-{day:02d}")
+            transaction.setValue("0.10")
+            transactions.append(transaction)
+        # Summed in cents, so no rounding is involved
+        validator = Validator(0.2, date(2023, 1, 1), 1.2, date(2023, 1, 31), 0, self.log)
+        self.assertTrue(validator.validate_transactions(transactions))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from code.model.partner_names import PartnerNames, get_tokens
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.partner import PartnerProcessor
+from tests.helpers import create_configuration
+
+class TestPartnerNames(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        self._writeConfiguration("partners:\n  Google: [Google Pay, GOOGLE *YouTube]\n  REWE: REWE Markt GmbH\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _writeConfiguration(self, content:str)->None:
+        with open(self.configuration_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.configuration = create_configuration(self.configuration_file, cache_dir=os.path.join(self.tmp_dir.name, "cache"))
+        self.log = self.configuration.log
+
+    def test_tokens(self):
+        self.assertEqual(get_tokens("GooglePay"), get_tokens("Google Pay"))
+        self.assertEqual(get_tokens("PayPal (Europe) S.à r.l. et Cie, S.C.A."), ["pay", "pal", "europe"])
+        self.assertEqual(get_tokens("Café Müller 0815"), get_tokens("CAFE MUELLER"))
+        self.assertEqual(get_tokens("Netflix.com"), ["netflix"])
+        self.assertEqual(get_tokens("GmbH"), ["gmbh"])
+
+    def test_resolve(self):
+        partner_names = PartnerNames(self.configuration)
+        resolve = partner_names.resolve
+        self.assertEqual(resolve("GooglePay"), "Google")
+        self.assertEqual(resolve("GOOGLE *YouTube"), "Google")
+        self.assertEqual(resolve("Rewe Markt GmbH 48125"), "REWE")
+        self.assertEqual(resolve("Stadtwerke München"), "Stadtwerke München")
+        self.assertEqual(resolve("STADTWERKE MUENCHEN"), "Stadtwerke München")
+        self.assertEqual(resolve("Deutsche Bank AG"), "Deutsche Bank AG")
+        self.assertEqual(resolve("Deutsche Bahn"), "Deutsche Bahn")
+
+    def test_similar_names_are_only_suggested(self):
+        partner_names = PartnerNames(self.configuration)
+        resolve = partner_names.resolve
+        self.assertEqual(resolve("Anna Mueller"), "Anna Mueller")
+        self.assertEqual(resolve("Hanna Mueller"), "Hanna Mueller")
+        self.assertEqual(resolve("Stadtwerke München"), "Stadtwerke München")
+        self.assertEqual(resolve("Stadtwerk Muenchen"), "Stadtwerk Muenchen")
+        self.assertEqual(partner_names.suggestions, [("Hanna Mueller", "Anna Mueller"), ("Stadtwerk Muenchen", "Stadtwerke München")])
+        # The result doesn't depend on the order of the names
+        for names in (["Amazon", "Amazon Prime", "Amazon Marketplace"], ["Amazon Prime", "Amazon Marketplace", "Amazon"]):
+            partner_names = PartnerNames(self.configuration)
+            self.assertEqual([partner_names.resolve(name) for name in sorted(names)], ["Amazon", "Amazon Marketplace", "Amazon Prime"])
+
+    def test_memo_is_persisted(self):
+        partner_names = PartnerNames(self.configuration)
+        partner_names.resolve("Stadtwerke München")
+        partner_names.resolve("STADTWERKE MUENCHEN")
+        partner_names.save()
+        self.assertEqual(PartnerNames(self.configuration).names["STADTWERKE MUENCHEN"], "Stadtwerke München")
+        # Another alias table drops the memo
+        self._writeConfiguration("partners:\n  SWM: [Stadtwerke München]\n")
+        partner_names = PartnerNames(self.configuration)
+        self.assertEqual(partner_names.names, {})
+        self.assertEqual(partner_names.resolve("STADTWERKE MUENCHEN"), "SWM")
+
+    def test_processor_keeps_the_original_names(self):
+        transactions = []
+        for name in ["REWE Markt GmbH", "Rewe Markt", "Rewe Markt", "Bäcker"]:
+            transaction = Transaction(self.log, "statement.csv")
+            transaction.partner.name = name
+            transactions.append(transaction)
+        transactions_wrapper = TransactionsWrapper(self.log, transactions)
+        # Processing twice, like watch mode does, resolves the original names again
+        for _ in range(2):
+            PartnerProcessor(self.log, self.configuration, transactions_wrapper).process()
+            self.assertEqual([transaction.partner.name for transaction in transactions], ["REWE", "REWE", "REWE", "Bäcker"])
+            self.assertEqual([transaction.partner.original_name for transaction in transactions],
+                             ["REWE Markt GmbH", "Rewe Markt", "Rewe Markt", None])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from code.benchmark.generator import StatementGenerator
+from code.converter.pdf import PDFConverter
+from code.extractor.pdf.ing.extractor import IngPDFExtractor
+from tests.helpers import create_configuration
+
+class StubConverter:
+    """Serves fixed page texts instead of a PDF file."""
+    def __init__(self, pages_text:[str]):
+        self.pages_text = pages_text
+
+    def getLazyPages(self)->[str]:
+        return self.pages_text
+
+    def getLazyPagesText(self)->[str]:
+        return self.pages_text
+
+    def getLazyFullText(self)->str:
+        return "\n".join(self.pages_text)
+
+    def getHeaderText(self)->str:
+        return self.pages_text[0]
+
+class TestPageParallelExtraction(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.configuration = create_configuration(configuration_file)
+        self.log = self.configuration.log
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_page_ranges(self):
+        path = os.path.join(self.tmp_dir.name, "Kontoauszug_2023-01.ing.pdf")
+        StatementGenerator(seed=1).writeIngPdf(path, 300, 2023, 1)
+        with PDFConverter(self.log, path, page_workers=1) as sequential, PDFConverter(self.log, path, page_workers=3) as parallel:
+            parallel.PARALLEL_MIN_PAGES = 2
+            page_count = len(sequential.getLazyPages())
+            self.assertEqual(sequential.getPageRanges(), [])
+            ranges = parallel.getPageRanges()
+            self.assertEqual(len(ranges), 3)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], page_count)
+            self.assertEqual(parallel.getLazyPagesText(), sequential.getLazyPagesText())
+
+    def test_pages_are_released(self):
+        path = os.path.join(self.tmp_dir.name, "Kontoauszug_2023-01.ing.pdf")
+        StatementGenerator(seed=1).writeIngPdf(path, 100, 2023, 1)
+        with PDFConverter(self.log, path, page_workers=1) as converter:
+            pages_text = converter.getLazyPagesText()
+            pages = converter.getLazyPages()
+            self.assertGreater(len(pages), 1)
+            # No page keeps its parsed layout objects
+            self.assertFalse(any("_objects" in page.__dict__ for page in pages))
+        self.assertIsNone(converter.pdf)
+        # The extracted text outlives the document
+        self.assertEqual(converter.getLazyPagesText(), pages_text)
+
+    def test_references_on_next_page_are_stitched(self):
+        pages_text = [
+            "IBAN DE12 5001 0517 0123 4567 89\n01.01.2023 Lastschrift REWE Markt -10,00\n01.01.2023 Einkauf",
+            "Kontoauszug Seite 2\nMandat: M123\nReferenz: R456\n02.01.2023 Gutschrift Arbeitgeber 5,00\n02.01.2023 Gehalt",
+        ]
+        extractor = IngPDFExtractor("statement.ing.pdf", self.log, self.configuration, StubConverter(pages_text))
+        transactions = extractor.extract_transactions()
+        self.assertEqual(len(transactions), 2)
+        self.assertEqual(transactions[0].invoice.mandate_reference, "M123")
+        self.assertEqual(transactions[0].invoice.customer_reference, "R456")
+        self.assertEqual(transactions[0].description, "Einkauf")
+        self.assertIsNone(transactions[1].invoice.mandate_reference)
+
+if __name__ == "__main__":
+    unittest.main()
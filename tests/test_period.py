@@ -0,0 +1,78 @@
+import os
+import unittest
+from datetime import date
+from code.benchmark.generator import StatementGenerator
+from code.helper.period import period_from_filename, period_from_header, overlaps
+from code.model.catalog import Catalog
+from code.model.configuration import Configuration
+from code.processor.load import LoadProcessor
+from tests.helpers import StatementsTestCase
+
+class TestPeriod(unittest.TestCase):
+    def test_period_from_filename(self):
+        self.assertEqual(period_from_filename("umsaetze_2023-01-01_2023-03-31.dkb.csv"), (date(2023, 1, 1), date(2023, 3, 31)))
+        # A single month or date is usually the creation date of the statement
+        self.assertIsNone(period_from_filename("/x/Kontoauszug_2023-02.ing.pdf"))
+        self.assertIsNone(period_from_filename("Kontoauszug_2023-02-03.ing.pdf"))
+        self.assertIsNone(period_from_filename("Girokonto_5419180021_Kontoauszug_20230103.pdf"))
+
+    def test_period_from_header(self):
+        self.assertEqual(period_from_header("Abrechnungszeitraum 01.03.2023 - 31.03.2023"), (date(2023, 3, 1), date(2023, 3, 31)))
+        self.assertEqual(period_from_header("Kontoauszug Dezember 2022\nDatum 02.01.2023"), (date(2022, 12, 1), date(2022, 12, 31)))
+        self.assertEqual(period_from_header("Datum 30.12.22", "consorsbank"), (date(2022, 1, 1), date(2022, 12, 31)))
+        self.assertIsNone(period_from_header("Datum 30.12.22", "ing"))
+
+    def test_overlaps(self):
+        period = (date(2023, 3, 1), date(2023, 3, 31))
+        self.assertTrue(overlaps(period, date(2023, 3, 31), None))
+        self.assertFalse(overlaps(period, date(2023, 4, 1), None))
+        self.assertFalse(overlaps(period, None, date(2023, 2, 28)))
+
+class TestDateRangePushdown(StatementsTestCase):
+    def setUp(self):
+        super().setUp()
+        generator = StatementGenerator(seed=4)
+        # No period in the names, so it has to be read from the headers
+        for month in (1, 2, 3):
+            generator.writeDkbCsv(self.path(f"umsaetze{month}.dkb.csv"), 5, 2023, month)
+
+    def _configuration(self)->Configuration:
+        configuration = super()._configuration(cache_dir=self.cache_dir)
+        configuration.catalog = Catalog(configuration)
+        return configuration
+
+    def test_skips_files_outside_of_the_range(self):
+        configuration = self._configuration()
+        configuration.setFromDate("2023-02-01")
+        configuration.setToDate("2023-02-28")
+        transactions = LoadProcessor(configuration.log, configuration).process().getAll()
+        self.assertEqual(len(transactions), 5)
+        self.assertTrue(all(transaction.getTransactionDate().month == 2 for transaction in transactions))
+
+        catalog = self._configuration().catalog
+        february = os.path.join(self.input_dir, "umsaetze2.dkb.csv")
+        january = os.path.join(self.input_dir, "umsaetze1.dkb.csv")
+        self.assertIn("period", catalog.lookup(february))
+        self.assertNotIn("period", catalog.lookup(january))
+        self.assertIn("header", catalog.lookup(january))
+
+    def test_month_in_the_name_is_not_the_period(self):
+        StatementGenerator(seed=6).writeDkbCsv(os.path.join(self.input_dir, "Umsaetze_2023-04.dkb.csv"), 5, 2023, 3)
+        configuration = self._configuration()
+        configuration.setFromDate("2023-03-01")
+        configuration.setToDate("2023-03-31")
+        transactions = LoadProcessor(configuration.log, configuration).process().getAll()
+        self.assertEqual(len(transactions), 10)
+        self.assertTrue(all(transaction.getTransactionDate().month == 3 for transaction in transactions))
+
+    def test_catalog_entry_is_dropped_when_file_changes(self):
+        catalog = self._configuration().catalog
+        file_path = os.path.join(self.input_dir, "umsaetze1.dkb.csv")
+        catalog.update(file_path, period=["2023-01-01", "2023-01-31"])
+        self.assertEqual(catalog.lookup(file_path)["period"], ["2023-01-01", "2023-01-31"])
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("\n")
+        self.assertEqual(catalog.lookup(file_path), {})
+
+if __name__ == "__main__":
+    unittest.main()
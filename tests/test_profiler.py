@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from code.model.configuration import Configuration
+from code.model.profiler import Profiler
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.configuration = Configuration(
+            configuration_file=configuration_file,
+            input_paths=[],
+            output_base=os.path.join(self.tmp_dir.name, "transactions"),
+            export_types=[],
+            create_dirs=False,
+            quiet=True,
+            debug=False,
+            validate=False,
+            print_cmd=False,
+            recursive=False,
+            profile=True
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stage_records_times_and_items(self):
+        profiler = Profiler(self.configuration)
+        self.assertIs(self.configuration.profiler, profiler)
+        with profiler.stage("load") as record:
+            record["items"] = 3
+        with profiler.stage("sort"):
+            pass
+        self.assertEqual([stage["stage"] for stage in profiler.stages], ["load", "sort"])
+        self.assertEqual(profiler.stages[0]["items"], 3)
+        self.assertIsNone(profiler.stages[1]["items"])
+        self.assertGreaterEqual(profiler.stages[0]["wall_seconds"], 0)
+        self.assertGreaterEqual(profiler.stages[0]["cpu_seconds"], 0)
+
+    def test_report_orders_files_by_cost(self):
+        profiler = Profiler(self.configuration)
+        profiler.addFile("fast.csv", "DkbCSVExtractor", 0.1, 0.0, 0.1, 0.2, 10)
+        profiler.addFile("slow.ing.pdf", "IngPDFExtractor", 0.2, 2.0, 0.5, 2.7, 80)
+        report_file = os.path.join(self.tmp_dir.name, "profile.json")
+        profiler.writeReport(report_file)
+        with open(report_file, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual([file["file"] for file in report["files"]], ["slow.ing.pdf", "fast.csv"])
+
+if __name__ == "__main__":
+    unittest.main()
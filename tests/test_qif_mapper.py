@@ -4,7 +4,7 @@ import os
 import tempfile
 import unittest
 from decimal import Decimal
-from code.mapper.qif_mapper import parse_amount_german, parse_date_to_qif, build_qif_from_csv
+from code.mapper.qif_mapper import parse_amount_german, parse_date_to_qif, build_qif_from_csv, build_qifs_from_csv
 
 class TestQifMapperNoVat(unittest.TestCase):
     def test_income_without_vat_accounts(self):
@@ -316,5 +316,114 @@ class TestQifMapperNoVat(unittest.TestCase):
         os.unlink(tmp_csv.name)
         os.unlink(tmp_qif.name)
 
+    def test_build_qifs_from_csv_routes_categories_in_one_pass(self):
+        # CSV with two categories which are routed into separate QIF files
+        csv_content = (
+            "id,date,brutto value,currency,sender,receiver,partner_name,description,category,netto value,Vat value\n"
+            "A,2023-01-01,100,EUR,Payee A,Payee A,,Desc A,Kat1,84,16\n"
+            "B,2023-01-02,-200,EUR,Payee B,Payee B,,Desc B,Kat2,168,32\n"
+            "C,2023-01-03,300,EUR,Payee C,Payee C,,Desc C,Kat3,252,48\n"
+        )
+        tmp_csv = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+        tmp_csv.write(csv_content.encode("utf-8"))
+        tmp_csv.close()
+
+        tmp_qif_1 = tempfile.NamedTemporaryFile(delete=False, suffix=".qif")
+        tmp_qif_1.close()
+        tmp_qif_2 = tempfile.NamedTemporaryFile(delete=False, suffix=".qif")
+        tmp_qif_2.close()
+
+        build_qifs_from_csv(
+            input_csv=tmp_csv.name,
+            targets=[
+                {
+                    "category": "Kat1",
+                    "output_qif": tmp_qif_1.name,
+                    "bank_account_name": "Assets:Bank:Consorsbank",
+                    "income_account_name": "Income:Sales",
+                    "expense_account_name": "Expenses:Misc",
+                },
+                {
+                    "category": "Kat2",
+                    "output_qif": tmp_qif_2.name,
+                    "bank_account_name": "Assets:Bank:ING",
+                    "income_account_name": "Income:Misc",
+                    "expense_account_name": "Expenses:Office Supplies",
+                    "vat_output_account_name": "Liabilities:VAT Output 19%",
+                    "vat_input_account_name": "Assets:VAT Input 19%",
+                },
+            ]
+        )
+
+        with open(tmp_qif_1.name, "r", encoding="utf-8") as f:
+            qif_lines_1 = [line.strip() for line in f if line.strip()]
+        with open(tmp_qif_2.name, "r", encoding="utf-8") as f:
+            qif_lines_2 = [line.strip() for line in f if line.strip()]
+
+        # Each file has its own account header
+        self.assertEqual(qif_lines_1[1], "NAssets:Bank:Consorsbank")
+        self.assertEqual(qif_lines_2[1], "NAssets:Bank:ING")
+
+        # Kat1 goes into the first file without VAT splits
+        self.assertIn("D01/01/2023", qif_lines_1)
+        self.assertNotIn("D01/02/2023", qif_lines_1)
+        self.assertIn("%Net (income, no VAT)", qif_lines_1)
+
+        # Kat2 goes into the second file with VAT splits
+        idx_expense = qif_lines_2.index("D01/02/2023")
+        self.assertEqual(qif_lines_2[idx_expense + 5], "SExpenses:Office Supplies")
+        self.assertEqual(qif_lines_2[idx_expense + 6], "$168.00")
+        self.assertEqual(qif_lines_2[idx_expense + 8], "SAssets:VAT Input 19%")
+        self.assertNotIn("D01/01/2023", qif_lines_2)
+
+        # Kat3 has no target
+        self.assertNotIn("D01/03/2023", qif_lines_1 + qif_lines_2)
+
+        os.unlink(tmp_csv.name)
+        os.unlink(tmp_qif_1.name)
+        os.unlink(tmp_qif_2.name)
+
+    def test_build_qifs_from_csv_keeps_the_files_on_error(self):
+        csv_content = (
+            "id,date,brutto value,currency,sender,receiver,partner_name,description,category,netto value,Vat value\n"
+            "A,2023-01-01,100,EUR,Payee A,Payee A,,Desc A,Kat1,84,16\n"
+            "B,2023-01-02,-200,EUR,Payee B,Payee B,,Desc B,Kat2,168,32\n"
+        )
+        tmp_dir = tempfile.TemporaryDirectory()
+        input_csv = os.path.join(tmp_dir.name, "transactions.csv")
+        with open(input_csv, "w", encoding="utf-8") as f:
+            f.write(csv_content)
+        qif_1 = os.path.join(tmp_dir.name, "kat1.qif")
+        qif_2 = os.path.join(tmp_dir.name, "kat2.qif")
+        for qif in (qif_1, qif_2):
+            with open(qif, "w", encoding="utf-8") as f:
+                f.write("previous export\n")
+
+        # The second target lacks its expense account, which fails in the middle of the rows
+        build_qifs_from_csv(
+            input_csv=input_csv,
+            targets=[
+                {
+                    "category": "Kat1",
+                    "output_qif": qif_1,
+                    "bank_account_name": "Assets:Bank:Consorsbank",
+                    "income_account_name": "Income:Sales",
+                    "expense_account_name": "Expenses:Misc",
+                },
+                {
+                    "category": "Kat2",
+                    "output_qif": qif_2,
+                    "bank_account_name": "Assets:Bank:ING",
+                    "income_account_name": "Income:Misc",
+                },
+            ]
+        )
+
+        for qif in (qif_1, qif_2):
+            with open(qif, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "previous export\n")
+        self.assertEqual(sorted(os.listdir(tmp_dir.name)), ["kat1.qif", "kat2.qif", "transactions.csv"])
+        tmp_dir.cleanup()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import os
+import unittest
+from code.benchmark.generator import StatementGenerator
+from code.model.configuration import Configuration
+from code.model.reconciliation import Reconciliation
+from code.processor.filter import FilterProcessor
+from code.processor.load import LoadProcessor
+from code.processor.validator import ValidatorProcessor
+from tests.helpers import StatementsTestCase
+
+class TestReconciliation(StatementsTestCase):
+    def setUp(self):
+        super().setUp()
+        generator = StatementGenerator(seed=8)
+        generator.writeIngPdf(self.path("Kontoauszug_2023-01.ing.pdf"), 12, 2023, 1)
+        generator.writeBarclaysPdf(self.path("Kontoauszug_2023-01.barclays.pdf"), 12, 2023, 1)
+        generator.writeConsorsbankPdf(self.path("Kontoauszug_2023-01.consorsbank.pdf"), 12, 2023, 1)
+        generator.writeDkbCsv(self.path("Umsaetze_2023-01.dkb.csv"), 12, 2023, 1)
+
+    def _configuration(self)->Configuration:
+        return super()._configuration(output_base=None, validate=True)
+
+    def test_statements_match_their_balances(self):
+        configuration = self._configuration()
+        transactions_wrapper = LoadProcessor(configuration.log, configuration).process()
+        # The reconciliations survive the later stages
+        transactions_wrapper = FilterProcessor(configuration.log, configuration, transactions_wrapper).process()
+        reconciliations = {os.path.basename(reconciliation.source): reconciliation
+                           for reconciliation in transactions_wrapper.getReconciliations()}
+        self.assertEqual(len(reconciliations), 4)
+        for name in ("Kontoauszug_2023-01.ing.pdf", "Kontoauszug_2023-01.barclays.pdf", "Kontoauszug_2023-01.consorsbank.pdf"):
+            self.assertTrue(reconciliations[name].isBalanced(), str(reconciliations[name]))
+            self.assertEqual(reconciliations[name].transactions, 12)
+        # DKB exports print only the closing balance
+        self.assertFalse(reconciliations["Umsaetze_2023-01.dkb.csv"].isChecked())
+
+        ValidatorProcessor(configuration.log, configuration, transactions_wrapper).process()
+        self.assertEqual(configuration.log.error_count, 0)
+
+    def test_missing_booking_is_reported(self):
+        configuration = self._configuration()
+        transactions_wrapper = LoadProcessor(configuration.log, configuration).process()
+        transactions_wrapper.addReconciliation(Reconciliation("broken.ing.pdf", 10000, 12500, 2000, 3))
+        ValidatorProcessor(configuration.log, configuration, transactions_wrapper).process()
+        self.assertEqual(configuration.log.error_count, 2)
+
+    def test_difference(self):
+        reconciliation = Reconciliation("statement.pdf", 10000, 12500, 2000, 3)
+        self.assertTrue(reconciliation.isChecked())
+        self.assertFalse(reconciliation.isBalanced())
+        self.assertEqual(reconciliation.getDifference(), -500)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from code.model.search_index import SearchIndex
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.search_index import SearchIndexProcessor
+from tests.helpers import create_configuration, create_transaction
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.configuration = create_configuration(cache_dir=os.path.join(self.tmp_dir.name, "cache"), index=True)
+        self.log = self.configuration.log
+        self.search_index = self.configuration.search_index = SearchIndex(self.configuration)
+        self.statements = [os.path.join(self.tmp_dir.name, f"statement{number}.csv") for number in range(2)]
+        for statement in self.statements:
+            with open(statement, "w", encoding="utf-8") as f:
+                f.write("statement")
+
+    def tearDown(self):
+        self.search_index.close()
+        self.tmp_dir.cleanup()
+
+    def _transaction(self, source:str, day:str, partner:str, description:str, invoice:str=None)->Transaction:
+        transaction = create_transaction(self.log, day, "-10.00", source=source, owner_id="DE89500105179687062585", institute="ING",
+                                         partner=partner, description=description)
+        transaction.invoice.id = invoice
+        transaction.setTransactionId()
+        return transaction
+
+    def _index(self, transactions:[Transaction])->None:
+        SearchIndexProcessor(self.log, self.configuration, TransactionsWrapper(self.log, transactions)).process()
+
+    def _descriptions(self, text:str, **filters)->[str]:
+        return [row["description"] for row in self.search_index.search(text, **filters)]
+
+    def test_ranked_search(self):
+        self._index([
+            self._transaction(self.statements[0], "2023-01-05", "Stadtwerke", "Abschlag Strom", "2023-114"),
+            self._transaction(self.statements[0], "2023-02-05", "Stadtwerke", "Rechnung 2023-114 Nachzahlung"),
+            self._transaction(self.statements[1], "2023-03-01", "REWE Markt", "Einkauf 2023 Nr 114"),
+            self._transaction(self.statements[1], "2023-03-02", "Café Müller", "Frühstück"),
+        ])
+        # Invoice numbers are phrases, and references weigh more than descriptions
+        self.assertEqual(self._descriptions("2023-114"), ["Abschlag Strom", "Rechnung 2023-114 Nachzahlung"])
+        self.assertEqual(self._descriptions("invoice rechnung 2023-114"), [])
+        self.assertEqual(self._descriptions("rew*"), ["Einkauf 2023 Nr 114"])
+        self.assertEqual(self._descriptions("cafe MULLER"), ["Frühstück"])
+        self.assertEqual(self._descriptions("stadtwerke", from_date="2023-02-01", institute="ing"), ["Rechnung 2023-114 Nachzahlung"])
+        self.assertEqual(self._descriptions('" -'), [])
+
+    def test_changed_files_are_indexed_again(self):
+        self._index([self._transaction(self.statements[0], "2023-01-05", "Stadtwerke", "Abschlag Strom"),
+                     self._transaction(self.statements[1], "2023-01-06", "REWE Markt", "Einkauf")])
+        self.assertEqual(len(self.search_index.getSources()), 2)
+
+        # Unchanged files aren't indexed again, even if their transactions differ
+        self._index([self._transaction(self.statements[0], "2023-01-05", "Stadtwerke", "Abschlag Gas")])
+        self.assertEqual(self._descriptions("abschlag"), ["Abschlag Strom"])
+
+        with open(self.statements[0], "a", encoding="utf-8") as f:
+            f.write(" changed")
+        os.remove(self.statements[1])
+        self._index([self._transaction(self.statements[0], "2023-01-05", "Stadtwerke", "Abschlag Gas")])
+        self.assertEqual(self._descriptions("abschlag"), ["Abschlag Gas"])
+        self.assertEqual(self._descriptions("rewe"), [])
+        self.assertEqual(list(self.search_index.getSources()), [self.statements[0]])
+
+    def test_index_is_opt_in(self):
+        self.configuration.index = False
+        self._index([self._transaction(self.statements[0], "2023-01-05", "Stadtwerke", "Abschlag Strom")])
+        self.assertFalse(os.path.exists(self.search_index.path))
+
+if __name__ == "__main__":
+    unittest.main()
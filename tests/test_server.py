@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from code.server.index import TransactionIndex
+from code.server.service import QueryServer
+from tests.helpers import create_configuration
+
+def row(id:str, date:str, value:float, institute:str, partner:str, description:str)->dict:
+    return {"id": id, "date": date, "value": value, "owner_institute": institute,
+            "partner_name": partner, "partner_id": None, "description": description}
+
+ROWS = [
+    row("T3", "2023-03-01", -50.0, "ING", "REWE Markt", "Einkauf"),
+    row("T1", "2023-01-15", 2000.0, "ING", "Arbeitgeber GmbH", "Gehalt Januar"),
+    row("T2", "2023-02-01", -800.0, "DKB", "Vermieter", "Miete Februar"),
+    row("T4", "2023-03-15", -20.0, "DKB", "REWE Markt", "Einkauf"),
+]
+
+class TestTransactionIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TransactionIndex(ROWS)
+
+    def ids(self, result:dict)->[str]:
+        return [row["id"] for row in result["transactions"]]
+
+    def test_date_range_and_institute(self):
+        self.assertEqual(self.ids(self.index.query(from_date="2023-02-01", to_date="2023-03-01")), ["T2", "T3"])
+        self.assertEqual(self.ids(self.index.query(institute="dkb", from_date="2023-03-01")), ["T4"])
+
+    def test_partner_amount_text_and_pagination(self):
+        self.assertEqual(self.ids(self.index.query(partner="rewe")), ["T3", "T4"])
+        self.assertEqual(self.ids(self.index.query(min_value=-100, max_value=0)), ["T3", "T4"])
+        self.assertEqual(self.ids(self.index.query(text="MIETE")), ["T2"])
+        result = self.index.query(offset=1, limit=2)
+        self.assertEqual(result["total"], 4)
+        self.assertEqual(self.ids(result), ["T2", "T3"])
+
+class TestQueryServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.server = QueryServer(("127.0.0.1", 0), TransactionIndex(ROWS), create_configuration(configuration_file).log)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def test_query_returns_json_page(self):
+        with urllib.request.urlopen(self.url + "/transactions?partner=rewe&limit=1") as response:
+            data = json.load(response)
+        self.assertEqual(data["total"], 2)
+        self.assertEqual([row["id"] for row in data["transactions"]], ["T3"])
+
+    def test_invalid_parameter_is_bad_request(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(self.url + "/transactions?from=01.01.2023")
+        self.assertEqual(context.exception.code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import unittest
+from code.benchmark.generator import StatementGenerator
+from code.benchmark.startup import HEAVY_MODULES, ROOT_DIR, STARTUP_BUDGET_SECONDS, loaded_heavy_modules, measure_startup
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        input_file = os.path.join(self.tmp_dir.name, "Umsaetze_2023-01.dkb.csv")
+        StatementGenerator(seed=0).writeDkbCsv(input_file, 20, 2023, 1)
+        self.arguments = [input_file, os.path.join(self.tmp_dir.name, "output", "transactions"),
+                          "--export-types", "csv", "--create-dirs", "-q", "-c", configuration_file]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_import_main_loads_no_heavy_modules(self):
+        script = f"import sys, main; print(','.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r}))))"
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR, check=True, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_csv_run_loads_no_heavy_modules(self):
+        self.assertEqual(loaded_heavy_modules(self.arguments), [])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, "output", "transactions.csv")))
+
+    # Wall clock budgets depend on the machine, see benchmark.py --startup
+    @unittest.skipUnless(os.environ.get("MOMO_TIMING_TESTS"), "set MOMO_TIMING_TESTS=1 to check the startup budget")
+    def test_csv_run_stays_within_budget(self):
+        timings = measure_startup(self.arguments, repeat=5)
+        self.assertLess(statistics.median(timings), STARTUP_BUDGET_SECONDS)
+
+if __name__ == "__main__":
+    unittest.main()
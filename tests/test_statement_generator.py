@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import yaml
+from code.benchmark.generator import StatementGenerator
+from code.model.configuration import Configuration
+from code.model.log import Log
+from code.extractor.csv.dkb.extractor import DkbCSVExtractor
+from code.extractor.csv.paypal.extractor import PaypalCSVExtractor
+from code.factories.extractor import ExtractorFactory
+
+class TestStatementGenerator(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"institutes": {"paypal": {"owner": {"id": "max@example.com", "name": "Max Mustermann"}}}}, f)
+        self.configuration = Configuration(
+            configuration_file=configuration_file,
+            input_paths=[self.tmp_dir.name],
+            output_base=os.path.join(self.tmp_dir.name, "transactions"),
+            export_types=[],
+            create_dirs=False,
+            quiet=True,
+            debug=False,
+            validate=False,
+            print_cmd=False,
+            recursive=True
+        )
+        self.log = Log(self.configuration)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_generate_writes_every_statement(self):
+        generated = StatementGenerator(seed=1).generate(self.tmp_dir.name, statements=2, transactions=5)
+        self.assertEqual(len(generated), 2 * len(StatementGenerator.INSTITUTES))
+        for path, institute, count in generated:
+            self.assertTrue(path.endswith(f".{institute}.pdf") or path.endswith(f".{institute}.csv"))
+            self.assertTrue(os.path.isfile(path))
+            self.assertEqual(count, 5)
+
+    def test_generator_is_deterministic(self):
+        first = os.path.join(self.tmp_dir.name, "first.dkb.csv")
+        second = os.path.join(self.tmp_dir.name, "second.dkb.csv")
+        StatementGenerator(seed=7).writeDkbCsv(first, 20, 2023, 3)
+        StatementGenerator(seed=7).writeDkbCsv(second, 20, 2023, 3)
+        with open(first, encoding="utf-8") as f_first, open(second, encoding="utf-8") as f_second:
+            self.assertEqual(f_first.read(), f_second.read())
+
+    def test_pdf_is_well_formed(self):
+        path = os.path.join(self.tmp_dir.name, "statement.ing.pdf")
+        StatementGenerator(seed=1).writeIngPdf(path, 150, 2023, 1)
+        with open(path, "rb") as f:
+            content = f.read()
+        self.assertTrue(content.startswith(b"%PDF-1.4"))
+        self.assertTrue(content.rstrip().endswith(b"%%EOF"))
+        # startxref has to point to the cross reference table
+        xref_offset = int(content.rsplit(b"startxref", 1)[1].split()[0])
+        self.assertTrue(content[xref_offset:].startswith(b"xref"))
+        # 150 transactions don't fit onto a single page
+        page_count = int(content.split(b"/Count ", 1)[1].split()[0])
+        self.assertGreater(page_count, 1)
+        self.assertEqual(content.count(b"/Type /Page "), page_count)
+
+    def test_pdfs_are_extracted(self):
+        generator = StatementGenerator(seed=8)
+        writers = {"ing": generator.writeIngPdf, "barclays": generator.writeBarclaysPdf, "consorsbank": generator.writeConsorsbankPdf}
+        for institute, write in writers.items():
+            with self.subTest(institute=institute):
+                path = os.path.join(self.tmp_dir.name, f"statement.{institute}.pdf")
+                write(path, 80, 2023, 3)
+                extractor = ExtractorFactory(self.log, self.configuration).create_extractor(path)
+                with extractor:
+                    transactions = extractor.extract_transactions()
+                    self.assertTrue(extractor.reconcile(transactions).isBalanced())
+                self.assertEqual(sorted((transaction.getTransactionDate(), transaction.value) for transaction in transactions),
+                                 sorted(generator.bookings))
+        self.assertEqual(self.log.error_count, 0)
+
+    def test_dkb_csv_is_extracted(self):
+        path = os.path.join(self.tmp_dir.name, "statement.dkb.csv")
+        StatementGenerator(seed=2).writeDkbCsv(path, 25, 2023, 5)
+        transactions = DkbCSVExtractor(path, self.log, self.configuration).extract_transactions()
+        self.assertEqual(len(transactions), 25)
+        for transaction in transactions:
+            self.assertEqual(transaction.date.month, 5)
+            self.assertEqual(transaction.owner.institute, "DKB")
+        self.assertEqual(self.log.error_count, 0)
+
+    def test_paypal_csv_is_extracted(self):
+        path = os.path.join(self.tmp_dir.name, "statement.paypal.csv")
+        StatementGenerator(seed=3).writePaypalCsv(path, 25, 2023, 12)
+        transactions = PaypalCSVExtractor(path, self.log, self.configuration).extract_transactions()
+        self.assertEqual(len(transactions), 25)
+        for transaction in transactions:
+            self.assertEqual(transaction.date.month, 12)
+            self.assertEqual(transaction.owner.id, "max@example.com")
+        self.assertEqual(self.log.error_count, 0)
+
+if __name__ == "__main__":
+    unittest.main()
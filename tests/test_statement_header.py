@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from code.benchmark.generator import StatementGenerator
+from code.extractor.header import StatementHeaderParser
+from code.factories.extractor import ExtractorFactory
+from code.model.catalog import Catalog
+from tests.helpers import create_configuration
+
+class TestStatementHeaderParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = StatementHeaderParser()
+
+    def test_ing(self):
+        header = self.parser.parse(
+            "ING-DiBa AG\nKontoauszug Januar 2023\nDatum 01.02.2023\nIBAN DE27 5001 0517 4566 0090 41\n"
+            "BIC INGDDEFFXXX\nAlter Saldo 618,23 Euro\nNeuer Saldo -8.063,23 Euro\n", "ing")
+        self.assertEqual(header.iban, "DE27500105174566009041")
+        self.assertEqual(header.getPeriod(), (date(2023, 1, 1), date(2023, 1, 31)))
+        self.assertEqual(header.statement_date, date(2023, 2, 1))
+        self.assertEqual(header.opening_balance, 61823)
+        self.assertEqual(header.closing_balance, -806323)
+
+    def test_barclays(self):
+        header = self.parser.parse(
+            "Kontoauszug\nIBAN: DE89 5001 0517 1443 6800 23\nAbrechnungszeitraum 01.01.2023 - 31.01.2023\n"
+            "Alter Saldo 3.144,96+\nNeuer Saldo 2.314,59-\n", "barclays")
+        self.assertEqual(header.iban, "DE89500105171443680023")
+        self.assertEqual(header.getPeriod(), (date(2023, 1, 1), date(2023, 1, 31)))
+        self.assertEqual(header.opening_balance, 314496)
+        self.assertEqual(header.closing_balance, -231459)
+
+    def test_consorsbank(self):
+        header = self.parser.parse(
+            "Consorsbank\nKontoinhaber MaxMustermann\nDatum 01.02.23\nIBAN DE30760300804736636597\n"
+            "Kontowährung EUR\n*** Kontostand zum 31.12.2022 4.125,41+\n", "consorsbank")
+        self.assertEqual(header.iban, "DE30760300804736636597")
+        self.assertEqual(header.holder, "Max Mustermann")
+        self.assertEqual(header.currency, "EUR")
+        self.assertEqual(header.getPeriod(), (date(2023, 1, 1), date(2023, 12, 31)))
+        self.assertEqual(header.opening_balance, 412541)
+        self.assertIsNone(header.closing_balance)
+
+    def test_dkb(self):
+        header = self.parser.parse(
+            '"Girokonto";"DE86120300000175808468"\n"Zeitraum:";"01.01.2023 - 31.01.2023"\n'
+            '"Kontostand vom 31.01.2023:";"1.234,56 €"\n', "dkb")
+        self.assertEqual(header.iban, "DE86120300000175808468")
+        self.assertEqual(header.getPeriod(), (date(2023, 1, 1), date(2023, 1, 31)))
+        self.assertEqual(header.closing_balance, 123456)
+
+    def test_empty(self):
+        self.assertIsNone(self.parser.parse("", "ing").getPeriod())
+
+class TestStatementHeaderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.configuration = create_configuration(configuration_file, output_base=os.path.join(self.tmp_dir.name, "output", "transactions"),
+                                                  cache_dir=os.path.join(self.tmp_dir.name, "cache"))
+        self.log = self.configuration.log
+        self.path = os.path.join(self.tmp_dir.name, "Kontoauszug_2023-03.barclays.pdf")
+        StatementGenerator(seed=3).writeBarclaysPdf(self.path, 5, 2023, 3)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_header_is_read_from_the_catalog(self):
+        self.configuration.catalog = Catalog(self.configuration)
+        extractor = ExtractorFactory(self.log, self.configuration).create_extractor(self.path)
+        header = extractor.getStatementHeader()
+        self.assertEqual(header.period_start, date(2023, 3, 1))
+        self.assertIsNone(extractor.pdf_converter.pages_text)
+        self.configuration.catalog.save()
+
+        # A new run reads the header without touching the PDF
+        self.configuration.catalog = Catalog(self.configuration)
+        extractor = ExtractorFactory(self.log, self.configuration).create_extractor(self.path)
+        self.assertEqual(extractor.getStatementHeader().getDictionary(), header.getDictionary())
+        self.assertIsNone(extractor.pdf_converter.pdf)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+from code.benchmark.generator import StatementGenerator
+from code.model.balance_timeline import AccountTimeline, BalanceTimeline, to_day
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.load import LoadProcessor
+from code.processor.timeline import TimelineProcessor
+from code.validator.transaction import TransactionValidator, Validator
+from tests.helpers import StatementsTestCase, create_configuration, create_transaction
+
+ING = "DE89500105179687062585"
+
+class TestAccountTimeline(unittest.TestCase):
+    def test_incremental_bookings(self):
+        generator = random.Random(3)
+        bookings = [(generator.randint(1, 60), generator.randint(-5000, 5000)) for _ in range(300)]
+        account = AccountTimeline("account")
+        # Later chunks contain earlier days as well
+        for start in range(0, len(bookings), 50):
+            account.addBookings(bookings[start:start + 50])
+        rebuilt = AccountTimeline("account")
+        rebuilt.addBookings(bookings)
+        self.assertEqual((account.days, account.sums), (rebuilt.days, rebuilt.sums))
+        for _ in range(50):
+            start, end = sorted(generator.randint(0, 62) for _ in range(2))
+            self.assertEqual(account.getTotal(start, end), sum(value for day, value in bookings if start <= day <= end))
+
+    def test_balances_from_anchors(self):
+        account = AccountTimeline("account")
+        account.addBookings([(10, 500), (12, -200), (20, 1000)])
+        self.assertIsNone(account.getBalance(12))
+        account.addAnchor(10, 10000, "statement")
+        # Balances are taken at the end of the day
+        self.assertEqual(account.getBalance(9), 10000)
+        self.assertEqual(account.getBalance(12), 10300)
+        # A later anchor wins over the bookings since the earlier one
+        account.addAnchor(15, 20000, "configuration")
+        self.assertEqual(account.getSeries(), [(10, 10500), (12, 10300), (20, 21000)])
+        account.removeAnchors("configuration")
+        self.assertEqual(account.getBalance(20), 11300)
+
+class TestTimelineProcessor(StatementsTestCase):
+    def setUp(self):
+        super().setUp()
+        generator = StatementGenerator(seed=5)
+        generator.writeIngPdf(self.path("Kontoauszug_2023-01.ing.pdf"), 15, 2023, 1)
+        generator.writeDkbCsv(self.path("Umsaetze_2023-01.dkb.csv"), 15, 2023, 1)
+
+    def _run(self, input_dir:str=None, **options)->BalanceTimeline:
+        configuration = self._configuration(input_paths=[input_dir or self.input_dir], output_base=None, validate=True,
+                                            cache_dir=self.cache_dir, **options)
+        configuration.timeline = BalanceTimeline(configuration)
+        transactions_wrapper = LoadProcessor(configuration.log, configuration).process()
+        TimelineProcessor(configuration.log, configuration, transactions_wrapper).process()
+        self.reconciliations = {reconciliation.source: reconciliation for reconciliation in transactions_wrapper.getReconciliations()}
+        return configuration.timeline
+
+    def test_statement_balances(self):
+        timeline = self._run()
+        self.assertEqual(len(timeline.accounts), 2)
+        ing = timeline.getAccounts("ing")[0]
+        reconciliation = next(reconciliation for reconciliation in self.reconciliations.values() if reconciliation.source.endswith(".ing.pdf"))
+        self.assertEqual(ing.getBalance(ing.days[-1]), reconciliation.closing_balance)
+        self.assertEqual(ing.getBalance(ing.days[0] - 1), reconciliation.opening_balance)
+        # DKB exports print no opening balance, so there is no anchor
+        self.assertIsNone(timeline.getAccounts("dkb")[0].getBalance(to_day("2023-01-31")))
+
+    def test_unchanged_files_are_skipped(self):
+        first = self._run()
+        with mock.patch.object(AccountTimeline, "addBookings") as add_bookings:
+            second = self._run()
+        add_bookings.assert_not_called()
+        self.assertEqual({account_id: account.getDictionary() for account_id, account in first.accounts.items()},
+                         {account_id: account.getDictionary() for account_id, account in second.accounts.items()})
+
+        # A changed statement rebuilds its account
+        dkb_file = os.path.join(self.input_dir, "Umsaetze_2023-01.dkb.csv")
+        StatementGenerator(seed=6).writeDkbCsv(dkb_file, 4, 2023, 1)
+        third = self._run()
+        self.assertEqual(len(third.getAccounts("dkb")), 1)
+        self.assertLessEqual(len(third.getAccounts("dkb")[0].days), 4)
+        self.assertEqual(len(third.getAccounts("ing")), 1)
+
+    def test_other_directories_are_not_counted(self):
+        first = self._run()
+        backup_dir = os.path.join(self.tmp_dir.name, "backup")
+        shutil.copytree(self.input_dir, backup_dir)
+        second = self._run(backup_dir)
+        # The copies replace the original files instead of being added to them
+        for account_id, account in first.accounts.items():
+            self.assertEqual((second.accounts[account_id].days, second.accounts[account_id].sums), (account.days, account.sums))
+            self.assertTrue(all(source.startswith(backup_dir) for source in second.accounts[account_id].sources))
+
+        # A subset only keeps the accounts of its files
+        os.remove(os.path.join(backup_dir, "Umsaetze_2023-01.dkb.csv"))
+        third = self._run(backup_dir)
+        self.assertEqual(len(third.getAccounts("dkb")), 0)
+        self.assertEqual(len(third.getAccounts("ing")), 1)
+
+    def test_timeline_is_only_kept_when_it_is_read(self):
+        configuration = self._configuration(output_base=None, export_types=["csv"], cache_dir=self.cache_dir)
+        TimelineProcessor(configuration.log, configuration, LoadProcessor(configuration.log, configuration).process()).process()
+        self.assertIsNone(configuration.timeline)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, BalanceTimeline.FILE_NAME)))
+        configuration.export_types = ["csv", "html"]
+        self.assertTrue(configuration.shouldKeepTimeline())
+
+    def test_files_which_are_not_loaded_are_kept(self):
+        first = {account_id: account.getDictionary() for account_id, account in self._run().accounts.items()}
+        second = self._run(selected_institutes=["ing"])
+        self.assertEqual({account_id: account.getDictionary() for account_id, account in second.accounts.items()}, first)
+
+        # A changed file is removed until it is loaded again
+        ing_file = os.path.join(self.input_dir, "Kontoauszug_2023-01.ing.pdf")
+        StatementGenerator(seed=5).writeIngPdf(ing_file, 3, 2023, 1)
+        third = self._run(selected_institutes=["dkb"])
+        self.assertEqual(third.getAccounts("ing"), [])
+        self.assertEqual(len(third.getAccounts("dkb")), 1)
+        ing = self._run().getAccounts("ing")[0]
+        self.assertEqual((len(ing.days), len(ing.anchors)), (len(set(ing.days)), 2))
+        self.assertLessEqual(len(ing.days), 3)
+
+    def test_removed_file_leaves_the_other_files(self):
+        account = AccountTimeline("account")
+        account.addSource("january.csv", [1, 1], [(10, 500), (12, -200)])
+        account.addSource("february.csv", [1, 1], [(12, 100), (40, 1000)])
+        account.addAnchor(41, 5000, "february.csv")
+        account.removeSource("february.csv")
+        self.assertEqual((account.days, account.sums, account.anchors), ([10, 12], [500, 300], []))
+        self.assertEqual(account.findSource([(12, -200), (10, 500)]), "january.csv")
+
+class TestTimelineValidation(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes:\n"
+                    "  ing:\n"
+                    "    validate:\n"
+                    "      - {date: 2023-01-01, value: 1000.00}\n"
+                    "      - {date: 2023-01-31, value: 1150.50}\n")
+        self.configuration = create_configuration(configuration_file, validate=True)
+        self.log = self.configuration.log
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _transaction(self, day:str, value:str, owner_id:str=ING)->Transaction:
+        return create_transaction(self.log, day, value, owner_id=owner_id, institute="ING")
+
+    def test_validator_reads_the_timeline(self):
+        transactions = [self._transaction("2023-01-05", "200.00"), self._transaction("2023-01-20", "-49.50")]
+        TimelineProcessor(self.log, self.configuration, TransactionsWrapper(self.log, transactions)).process()
+        self.assertEqual(self.configuration.timeline.accounts[ING].getBalance(to_day(date(2023, 1, 31))), 115050)
+        # The sum between the checkpoints comes from the timeline
+        with mock.patch.object(Validator, "validate_transactions") as validate_transactions:
+            TransactionValidator(self.configuration, self.log).validate(transactions)
+        validate_transactions.assert_not_called()
+        self.assertEqual(self.log.error_count, 0)
+
+    def test_validator_adds_up_what_the_timeline_lacks(self):
+        # The timeline has no account for a booking without owner id
+        transactions = [self._transaction("2023-01-05", "200.00"), self._transaction("2023-01-20", "-49.50", owner_id="")]
+        TimelineProcessor(self.log, self.configuration, TransactionsWrapper(self.log, transactions)).process()
+        TransactionValidator(self.configuration, self.log).validate(transactions)
+        self.assertEqual(self.log.error_count, 0)
+
+        # Nor does it stand for filtered transactions
+        transactions[1].owner.id = ING
+        self.configuration.timeline = None
+        TimelineProcessor(self.log, self.configuration, TransactionsWrapper(self.log, transactions)).process()
+        self.assertTrue(self.configuration.timeline.holds("ing", transactions))
+        self.assertFalse(self.configuration.timeline.holds("ing", transactions[:1]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from code.extractor.pdf.tokenizer import LineTokenizer, TransactionAssembler
+from code.extractor.pdf.ing.booking_line_parser import BookingLineParser
+from code.extractor.pdf.ing.valuta_line_parser import ValutaLineParser
+from code.extractor.pdf.ing.additional_info_parser import AdditionalInfoParser
+from code.extractor.pdf.barclays.additional_info_parser import BarclaysAdditionalInfoParser
+
+class TestLineTokenizer(unittest.TestCase):
+    def setUp(self):
+        self.booking_parser = BookingLineParser()
+        self.valuta_parser = ValutaLineParser()
+        self.additional_parser = AdditionalInfoParser()
+        self.tokenizer = LineTokenizer(
+            [("booking", BookingLineParser.booking_line_pattern), ("valuta", ValutaLineParser.valuta_line_pattern)]
+            + AdditionalInfoParser.patterns
+        )
+
+    def test_first_matching_pattern_wins(self):
+        kind, groups = self.tokenizer.tokenize("01.02.2023 Lastschrift VISA REWE Markt -1.234,56")
+        self.assertEqual(kind, "booking")
+        self.assertEqual(self.booking_parser.parse_groups(groups), self.booking_parser.parse("01.02.2023 Lastschrift VISA REWE Markt -1.234,56"))
+        self.assertEqual(self.tokenizer.tokenize("01.02.2023 Einkauf 7")[0], "valuta")
+        self.assertEqual(self.tokenizer.tokenize("Mandat: M123")[0], "mandate")
+        self.assertEqual(self.tokenizer.tokenize("Referenz: R456")[0], "reference")
+        self.assertEqual(self.tokenizer.tokenize("Gehalt Januar"), ("text", ("Gehalt Januar",)))
+
+    def test_id_lines(self):
+        line = "NR12345678GooglePay Einkauf 7"
+        kind, groups = self.tokenizer.tokenize(line)
+        self.assertEqual(kind, "id")
+        self.assertEqual(self.additional_parser.parse_token(kind, groups, line),
+                         {"id": "NR12345678", "partner_institute": "Google Pay", "description": "Einkauf 7"})
+        self.assertEqual(self.additional_parser.parse("ARNABCDEF"), {"id": "ARNABCDEF"})
+        # Too short for an id
+        self.assertEqual(self.additional_parser.parse("NR123"), {"description": "NR123"})
+
+    def test_barclays_infos(self):
+        parser = BarclaysAdditionalInfoParser()
+        self.assertEqual(parser.parse("P123456"), {"mandate_reference": "P123456"})
+        self.assertEqual(parser.parse("DE98ZZZ09999999999"), {"creditor_id": "DE98ZZZ09999999999"})
+        self.assertEqual(parser.parse(""), {})
+
+class TestTransactionAssembler(unittest.TestCase):
+    def setUp(self):
+        booking_parser = BookingLineParser()
+        valuta_parser = ValutaLineParser()
+        additional_parser = AdditionalInfoParser()
+        tokenizer = LineTokenizer(
+            [("booking", booking_parser.booking_line_pattern), ("valuta", valuta_parser.valuta_line_pattern)]
+            + additional_parser.patterns
+        )
+        self.assembler = TransactionAssembler(tokenizer, booking_parser.parse_groups, additional_parser.parse_token,
+                                              valuta_kind="valuta", parse_valuta=valuta_parser.parse_groups,
+                                              stitched_kinds={"id", "mandate", "reference"})
+
+    def test_assembles_bookings_valuta_and_infos(self):
+        pages = [
+            "Kontoauszug\n01.02.2023 Lastschrift REWE -10,00\n01.02.2023 Einkauf\nMandat: M1",
+            "Seite 2\nReferenz: R2\n04.02.2023 Gutschrift Arbeitgeber 5,00\nGehalt\n05.02.2023 stray valuta\nignored",
+            "Seite 3\nReferenz: R3\n06.02.2023 Gutschrift Arbeitgeber 1,00",
+        ]
+        assembled = self.assembler.assemble(pages)
+        self.assertEqual(len(assembled), 3)
+        self.assertEqual(assembled[0]["valuta"]["leftover_text"], "Einkauf")
+        self.assertEqual(assembled[0]["infos"], [{"mandate_reference": "M1"}, {"customer_reference": "R2"}])
+        self.assertIsNone(assembled[1]["valuta"])
+        # The stray valuta line closed the booking, so nothing is continued
+        self.assertEqual(assembled[1]["infos"], [{"description": "Gehalt"}])
+        self.assertEqual(assembled[2]["infos"], [])
+
+    def test_page_header_is_not_continued(self):
+        pages = [
+            "01.02.2023 Lastschrift REWE -10,00\n01.02.2023 Einkauf\nMandat: M1",
+            # Only the reference below the column header continues the booking
+            "ING-DiBa AG · Theodor-Heuss-Allee 2 · 60486 Frankfurt am Main\n"
+            "NR12345678 Kundennummer\n"
+            "Referenz: Kontoauszug 2/2023\n"
+            "Girokonto Nummer 5419180021\n"
+            "Kontoauszug Februar 2023 Seite 2 von 2\n"
+            "Buchung Buchung / Verwendungszweck Betrag (EUR)\n"
+            "Valuta\n"
+            "Referenz: R1\n"
+            "04.02.2023 Gutschrift Arbeitgeber 5,00",
+        ]
+        assembled = self.assembler.assemble(pages)
+        self.assertEqual(assembled[0]["infos"], [{"mandate_reference": "M1"}, {"customer_reference": "R1"}])
+        self.assertEqual(assembled[1]["infos"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from code.model.transaction import Transaction
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.transfer import TransferProcessor
+from tests.helpers import create_configuration, create_transaction
+
+ING = "DE89500105179687062585"
+DKB = "DE86120300000175808468"
+OTHER = "DE11100100100000000001"
+
+class TestTransferProcessor(unittest.TestCase):
+    def setUp(self):
+        self.configuration = create_configuration(match_transfers=True, transfer_window=3)
+        self.log = self.configuration.log
+
+    def _transaction(self, owner:str, day:str, value:str, partner:str=None)->Transaction:
+        return create_transaction(self.log, day, value, owner_id=owner, institute="Bank", partner_id=partner)
+
+    def test_transfers_are_linked(self):
+        # Partner IBANs are compared without spaces
+        outgoing = self._transaction(ING, "2023-01-02", "-500.00", "DE86 1203 0000 0175 8084 68")
+        # Only the partner of one side needs to be known
+        incoming = self._transaction(DKB, "2023-01-03", "500.00")
+        decoy = self._transaction(DKB, "2023-01-02", "500.00", OTHER)
+        late = self._transaction(DKB, "2023-01-20", "250.00", ING)
+        late_outgoing = self._transaction(ING, "2023-01-02", "-250.00", DKB)
+        same_account = self._transaction(ING, "2023-01-04", "500.00", DKB)
+        transactions = [outgoing, incoming, decoy, late, late_outgoing, same_account]
+        TransferProcessor(self.log, self.configuration, TransactionsWrapper(self.log, transactions)).process()
+        self.assertTrue(outgoing.transfer_id.startswith("TRF"))
+        self.assertEqual(incoming.transfer_id, outgoing.transfer_id)
+        for transaction in (decoy, late, late_outgoing, same_account):
+            self.assertIsNone(transaction.transfer_id)
+        # Source provided links are kept
+        self.assertIsNone(outgoing.related_transaction_id)
+
+    def test_transfer_id_is_stable(self):
+        transfer_ids = []
+        for _ in range(2):
+            pair = [self._transaction(ING, "2023-01-02", "-500.00", DKB), self._transaction(DKB, "2023-01-02", "500.00")]
+            TransferProcessor(self.log, self.configuration, TransactionsWrapper(self.log, pair)).process()
+            transfer_ids.append(pair[0].transfer_id)
+        self.assertEqual(transfer_ids[0], transfer_ids[1])
+        self.assertIsNotNone(transfer_ids[0])
+
+    def test_closest_booking_wins(self):
+        outgoing = [self._transaction(ING, f"2023-01-{day:02d}", "-100.00", DKB) for day in (5, 6)]
+        incoming = [self._transaction(DKB, f"2023-01-{day:02d}", "100.00", ING) for day in (4, 6)]
+        pairs = TransferProcessor(self.log, self.configuration, TransactionsWrapper(self.log, outgoing + incoming)).match()
+        self.assertEqual(pairs, [(outgoing[0], incoming[0]), (outgoing[1], incoming[1])])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+from code.benchmark.generator import StatementGenerator
+from code.model.configuration import Configuration
+from code.model.log import Log
+from code.model.transactions_wrapper import TransactionsWrapper
+from code.processor.watch import WatchProcessor
+
+class TestWatchProcessor(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp_dir.name, "statements")
+        os.makedirs(self.input_dir)
+        configuration_file = os.path.join(self.tmp_dir.name, "configuration.yml")
+        with open(configuration_file, "w", encoding="utf-8") as f:
+            f.write("institutes: {}\n")
+        self.output_base = os.path.join(self.tmp_dir.name, "output", "transactions")
+        self.configuration = Configuration(
+            configuration_file=configuration_file,
+            input_paths=[self.input_dir],
+            output_base=self.output_base,
+            export_types=["csv"],
+            create_dirs=True,
+            quiet=True,
+            debug=False,
+            validate=False,
+            print_cmd=False,
+            recursive=False,
+            watch=True,
+            watch_interval=60
+        )
+        self.log = Log(self.configuration)
+        self.generator = StatementGenerator(seed=3)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_statement(self, month:int, transactions:int, settled:bool=True)->str:
+        path = os.path.join(self.input_dir, f"Umsaetze_2023-{month:02d}.dkb.csv")
+        self.generator.writeDkbCsv(path, transactions, 2023, month)
+        if settled:
+            past = time.time() - 3600
+            os.utime(path, (past, past))
+        return path
+
+    def _exported_rows(self)->int:
+        with open(self.output_base + ".csv", encoding="utf-8") as f:
+            return len(list(csv.DictReader(f)))
+
+    def test_ingests_only_new_changed_and_removed_files(self):
+        watch_processor = WatchProcessor(self.log, self.configuration)
+        first = self._write_statement(1, 5)
+        watch_processor.process(max_polls=1)
+        self.assertEqual(self._exported_rows(), 5)
+        self.assertFalse(watch_processor.poll())
+
+        self._write_statement(2, 7)
+        self.assertTrue(watch_processor.poll())
+        watch_processor.export()
+        self.assertEqual(self._exported_rows(), 12)
+
+        os.remove(first)
+        self.assertTrue(watch_processor.poll())
+        watch_processor.export()
+        self.assertEqual(self._exported_rows(), 7)
+
+    def _write_transfer(self, name:str, iban:str, partner_iban:str, amount:str)->str:
+        path = os.path.join(self.input_dir, name)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter=";", quoting=csv.QUOTE_ALL)
+            writer.writerow(["Girokonto", iban])
+            writer.writerow([])
+            writer.writerow(["Buchungsdatum", "Wertstellung", "Status", "Zahlungspflichtige*r", "Zahlungsempfänger*in",
+                             "Verwendungszweck", "Umsatztyp", "IBAN", "Betrag (€)"])
+            writer.writerow(["02.01.23", "02.01.23", "Gebucht", "Max Mustermann", "Max Mustermann", "Umbuchung", "Umbuchung", partner_iban, amount])
+        past = time.time() - 3600
+        os.utime(path, (past, past))
+        return path
+
+    def _exported_transfer_ids(self)->[str]:
+        with open(self.output_base + ".csv", encoding="utf-8") as f:
+            return [row["transfer_id"] for row in csv.DictReader(f)]
+
+    def test_transfer_links_follow_removed_files(self):
+        self.configuration.match_transfers = True
+        watch_processor = WatchProcessor(self.log, self.configuration)
+        self._write_transfer("Umsaetze_2023-01.dkb.csv", "DE89500105179687062585", "DE86120300000175808468", "-500,00")
+        savings = self._write_transfer("Tagesgeld_2023-01.dkb.csv", "DE86120300000175808468", "DE89500105179687062585", "500,00")
+        watch_processor.process(max_polls=1)
+        transfer_ids = self._exported_transfer_ids()
+        self.assertEqual(len(transfer_ids), 2)
+        self.assertTrue(transfer_ids[0])
+        self.assertEqual(transfer_ids[0], transfer_ids[1])
+
+        os.remove(savings)
+        self.assertTrue(watch_processor.poll())
+        watch_processor.export()
+        self.assertEqual(self._exported_transfer_ids(), [""])
+
+    def test_waits_until_fresh_file_is_settled(self):
+        watch_processor = WatchProcessor(self.log, self.configuration)
+        self._write_statement(3, 4, settled=False)
+        self.assertFalse(watch_processor.poll())
+        self.assertTrue(watch_processor.poll())
+        self.assertEqual(len(watch_processor.file_transactions), 1)
+
+    def test_wrappers_do_not_share_default_list(self):
+        TransactionsWrapper(self.log).getAll().append("transaction")
+        self.assertEqual(TransactionsWrapper(self.log).getAll(), [])
+
+if __name__ == "__main__":
+    unittest.main()